@@ -0,0 +1,136 @@
+# --- ALMACÉN LOCAL COMPARTIDO ---
+# SQLite en modo WAL que comparten los workers de un mismo host (servidor.py):
+#   hojas    -> última foto de cada hoja y su versión (cada escritura la sube y descarta la foto)
+#   reportes -> PDFs ya generados, con la huella de los datos que leyeron (programador.Precalculados)
+#   cambios  -> registro de escrituras; cada proceso lo releva al pubsub de sus propias sesiones
+#   corridas -> tareas programadas ya tomadas por algún worker (programador.py)
+# Se activa con ALMACEN_DB=ruta (servidor.py lo define solo); sin eso todo queda en memoria como siempre,
+# salvo los reportes precalculados, que van siempre a ruta() para que cli.py y la app los compartan.
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger("hockeyapp.almacen")
+
+# Las ediciones hechas a mano en Google Sheets no pasan por acá: una foto vive a lo sumo TTL segundos
+TTL_FOTO = float(os.environ.get("ALMACEN_TTL", 120))
+RETENCION_CAMBIOS = 600
+RECORTE_CADA = 100  # cambios relevados entre limpiezas de la tabla
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS hojas (titulo TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0, filas TEXT, leida REAL);
+CREATE TABLE IF NOT EXISTS reportes (clave TEXT PRIMARY KEY, versiones TEXT NOT NULL, url TEXT NOT NULL, creado REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS cambios (id INTEGER PRIMARY KEY AUTOINCREMENT, pid INTEGER NOT NULL, datos TEXT NOT NULL, creado REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS corridas (clave TEXT PRIMARY KEY, pid INTEGER NOT NULL, creado REAL NOT NULL);
+"""
+
+
+class Almacen:
+    def __init__(self, ruta, ttl=TTL_FOTO):
+        self.ruta = ruta; self.ttl = ttl; self._local = threading.local(); self._relevo = None
+        carpeta = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(carpeta, exist_ok=True)
+        self._con().executescript(ESQUEMA)
+
+    def _con(self):
+        # Una conexión por hebra (sqlite3 no comparte conexiones entre hebras)
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.ruta, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL"); con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    # --- FOTOS DE HOJAS ---
+    def versiones(self, titulos):
+        titulos = list(titulos)
+        if not titulos: return {}
+        q = f"SELECT titulo, version FROM hojas WHERE titulo IN ({','.join('?' * len(titulos))})"
+        res = dict.fromkeys(titulos, 0); res.update(self._con().execute(q, titulos).fetchall())
+        return res
+
+    def foto(self, titulo):
+        fila = self._con().execute("SELECT filas, leida FROM hojas WHERE titulo = ?", (titulo,)).fetchone()
+        if not fila or fila[0] is None or time.time() - fila[1] > self.ttl: return None
+        return json.loads(fila[0])
+
+    def guardar_foto(self, titulo, filas, version):
+        # Solo si nadie escribió la hoja desde que se empezó a leer (si no, la foto ya nace vieja)
+        con = self._con()
+        with con:
+            con.execute("INSERT OR IGNORE INTO hojas (titulo, version) VALUES (?, 0)", (titulo,))
+            con.execute("UPDATE hojas SET filas = ?, leida = ? WHERE titulo = ? AND version = ?",
+                        (json.dumps(filas, ensure_ascii=False), time.time(), titulo, version))
+
+    def invalidar(self, titulo):
+        con = self._con()
+        with con:
+            con.execute("INSERT INTO hojas (titulo, version) VALUES (?, 1) "
+                        "ON CONFLICT(titulo) DO UPDATE SET version = version + 1, filas = NULL", (titulo,))
+
+    # --- REPORTES ---
+    def leer_reporte(self, clave):
+        fila = self._con().execute("SELECT versiones, url FROM reportes WHERE clave = ?", (clave,)).fetchone()
+        return (json.loads(fila[0]), fila[1]) if fila else None
+
+    def guardar_reporte(self, clave, versiones, url):
+        con = self._con()
+        with con:
+            con.execute("INSERT OR REPLACE INTO reportes (clave, versiones, url, creado) VALUES (?, ?, ?, ?)",
+                        (clave, json.dumps(versiones, sort_keys=True), url, time.time()))
+
+    def reclamar(self, clave):
+        # True solo para el primer proceso que la pide
+        con = self._con()
+        with con:
+            cur = con.execute("INSERT OR IGNORE INTO corridas (clave, pid, creado) VALUES (?, ?, ?)", (clave, os.getpid(), time.time()))
+        return cur.rowcount == 1
+
+    # --- CAMBIOS ENTRE PROCESOS ---
+    def registrar_cambio(self, cambio):
+        con = self._con()
+        with con:
+            con.execute("INSERT INTO cambios (pid, datos, creado) VALUES (?, ?, ?)",
+                        (os.getpid(), json.dumps(list(cambio), ensure_ascii=False), time.time()))
+
+    def relevar(self, pubsub, topico, al_recibir=None, intervalo=0.5):
+        # Una hebra por proceso: los cambios de los otros workers salen por el pubsub local como si fueran propios
+        if self._relevo is not None: return
+        from cambios import Cambio
+        ultimo = self._con().execute("SELECT COALESCE(MAX(id), 0) FROM cambios").fetchone()[0]
+        recorte = ultimo + RECORTE_CADA
+
+        def bucle():
+            nonlocal ultimo, recorte
+            while True:
+                time.sleep(intervalo)
+                try:
+                    con = self._con()
+                    filas = con.execute("SELECT id, pid, datos FROM cambios WHERE id > ? ORDER BY id", (ultimo,)).fetchall()
+                    for id_, pid, datos in filas:
+                        ultimo = id_
+                        if pid == os.getpid(): continue
+                        cambio = Cambio(*json.loads(datos))
+                        if al_recibir: al_recibir(cambio)
+                        pubsub.send_all_on_topic(topico, cambio)
+                    # cada RECORTE_CADA ids vistos (un lote puede saltar cualquier múltiplo)
+                    if ultimo >= recorte:
+                        with con: con.execute("DELETE FROM cambios WHERE creado < ?", (time.time() - RETENCION_CAMBIOS,))
+                        recorte = ultimo + RECORTE_CADA
+                except Exception as ex: log.warning("relevo de cambios: %s", ex)
+
+        self._relevo = threading.Thread(target=bucle, name="almacen-relevo", daemon=True)
+        self._relevo.start()
+
+
+RUTA_POR_DEFECTO = os.path.join(".cache", "hockeyapp.db")  # la misma que define servidor.py (RUTA_ALMACEN)
+
+
+def ruta():
+    return os.environ.get("ALMACEN_DB") or RUTA_POR_DEFECTO
+
+
+ALMACEN = Almacen(os.environ["ALMACEN_DB"]) if os.environ.get("ALMACEN_DB") else None
@@ -0,0 +1,60 @@
+# --- LECTURA ANTICIPADA ---
+# La navegación es previsible: de asistencia se pasa a estadísticas, de partidos al fixture o al resumen.
+# Mientras la usuaria está quieta en una vista, una hebra aparte deja listas (hojas.Lectura.anticipar) las hojas
+# de las vistas a las que se suele ir desde ahí, y la navegación siguiente se arma desde memoria.
+# Las llamadas que hace esta hebra salen de un presupuesto por proceso (la cuota de Sheets es por proyecto):
+# si se agotó, no se anticipa y la vista siguiente lee como siempre.
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger("hockeyapp.anticipar")
+
+ESPERA = float(os.environ.get("ANTICIPAR_ESPERA", 1.5))  # segundos quieta en la vista antes de anticipar
+LLAMADAS_POR_MINUTO = int(os.environ.get("ANTICIPAR_LLAMADAS", 20))  # presupuesto del proceso; 0 lo desactiva
+
+
+class Presupuesto:
+    # Balde de fichas: 'llamadas' por 'periodo' segundos, repuestas de a poco
+    def __init__(self, llamadas=LLAMADAS_POR_MINUTO, periodo=60.0):
+        self.llamadas = llamadas; self.periodo = periodo; self._fichas = float(llamadas)
+        self._t = time.monotonic(); self._lock = threading.Lock()
+
+    @property
+    def activo(self): return self.llamadas > 0
+
+    def tomar(self):
+        if not self.activo: return False
+        with self._lock:
+            ahora = time.monotonic()
+            self._fichas = min(self.llamadas, self._fichas + (ahora - self._t) * self.llamadas / self.periodo); self._t = ahora
+            if self._fichas < 1: return False
+            self._fichas -= 1; return True
+
+
+PRESUPUESTO = Presupuesto()
+
+
+class Anticipador:
+    # Uno por sesión. hojas_de(vista) -> títulos que lee; siguientes[vista] -> vistas probables después
+    def __init__(self, lectura, hojas_de, siguientes, espera=ESPERA, presupuesto=PRESUPUESTO):
+        self.lectura = lectura; self.hojas_de = hojas_de; self.siguientes = siguientes
+        self.espera = espera; self.presupuesto = presupuesto; self._timer = None
+
+    def programar(self, vista):
+        # Después de armar 'vista': si no se navega antes de 'espera', se anticipan sus siguientes
+        self.cancelar()
+        titulos = list(dict.fromkeys(t for v in self.siguientes.get(vista, ()) for t in self.hojas_de(v)))
+        if not titulos or not self.presupuesto.activo: return
+        self._timer = threading.Timer(self.espera, self._correr, (vista, titulos)); self._timer.daemon = True
+        self._timer.start()
+
+    def cancelar(self):
+        if self._timer is not None: self._timer.cancel(); self._timer = None
+
+    def _correr(self, vista, titulos):
+        t0 = time.perf_counter()
+        try: listas = self.lectura.anticipar(titulos, self.presupuesto)
+        except Exception as ex: log.warning("no se pudo anticipar desde %s: %s", vista, ex); return
+        log.debug("desde %s: %s listas de %s (%.0f ms)", vista, listas, titulos, (time.perf_counter() - t0) * 1000)
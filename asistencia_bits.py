@@ -0,0 +1,151 @@
+# --- ASISTENCIA EN BITS ---
+# La hoja 'asistencia' es una fila de texto por jugadora y día. Acá cada temporada (año) numera sus sesiones
+# realizadas en orden de fecha y cada jugadora guarda dos enteros usados como bitset sobre esa numeración:
+#   presentes -> bit i prendido si dio el presente en la sesión i
+#   ausentes  -> bit i prendido si quedó marcada "NO"
+# Las máscaras de la temporada (partidos, entrenamientos, cada mes) se combinan con & y se cuentan con bit_count.
+# Los días suspendidos no son sesiones: cortan para todas igual, van aparte y no rompen rachas.
+# Una temporada de ~150 sesiones ocupa unos pocos cientos de bytes por jugadora.
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+
+ALERTA_AUSENCIAS = 3  # faltas seguidas a partir de las cuales se avisa
+_CACHE = OrderedDict(); _CACHE_MAX = 8; _LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _fecha(f):
+    # "dd/mm/aaaa" (también "5/3/2024", como main.parse_fecha) -> (anio, mes, dia) o None.
+    # Se repite una vez por jugadora y día: cada texto se parsea una sola vez
+    try: d = datetime.strptime(f.strip(), "%d/%m/%Y")
+    except ValueError: return None
+    return d.year, d.month, d.day
+
+
+def _corrida_max(x):
+    # Largo de la corrida de unos más larga: cada vuelta acorta todas las corridas en uno
+    n = 0
+    while x: x &= x >> 1; n += 1
+    return n
+
+
+class Temporada:
+    __slots__ = ("anio", "fechas", "total", "partidos", "entrenamientos", "meses", "suspendidas", "presentes", "ausentes")
+
+    def __init__(self, anio, dias):
+        # dias: {(mes, dia): filas de ese día}. Un día se guarda entero de una vez: todas sus filas comparten tipo
+        self.anio = anio; self.fechas = []; self.suspendidas = []
+        self.partidos = self.entrenamientos = 0; self.meses = [0] * 13
+        self.presentes = pres = {}; self.ausentes = aus = {}
+        for md in sorted(dias):
+            filas = dias[md]; tipo = filas[-1][3] if len(filas[-1]) > 3 else ""
+            if "Suspendido" in tipo or filas[0][2] == "-": self.suspendidas.append(md); continue
+            bit = 1 << len(self.fechas); self.fechas.append(md); self.meses[md[0]] |= bit
+            if "Partido" in tipo: self.partidos |= bit
+            elif "Entrenamiento" in tipo: self.entrenamientos |= bit
+            for r in filas:
+                if r[2] == "SI": pres[r[1]] = pres.get(r[1], 0) | bit
+                elif r[2] == "NO": aus[r[1]] = aus.get(r[1], 0) | bit
+        self.total = len(self.fechas)
+
+    def mascara(self, tipo=None, mes=None):
+        m = (1 << self.total) - 1 if mes is None else self.meses[mes]
+        if tipo == "Partido": m &= self.partidos
+        elif tipo == "Entrenamiento": m &= self.entrenamientos
+        return m
+
+    def presencias(self, dni, mascara=None):
+        p = self.presentes.get(dni, 0)
+        return (p if mascara is None else p & mascara).bit_count()
+
+    def ausencias(self, dni, mascara=None):
+        a = self.ausentes.get(dni, 0)
+        return (a if mascara is None else a & mascara).bit_count()
+
+    def porcentaje(self, dni, mascara=None):
+        # Presentes sobre sesiones con marca (SI o NO); None si no tiene ninguna
+        p = self.presencias(dni, mascara); a = self.ausencias(dni, mascara)
+        return round(100 * p / (p + a)) if p + a else None
+
+    def por_mes(self, dni, tipo=None):
+        # [(presentes, ausentes)] de enero (índice 1) a diciembre; índice 0 sin uso
+        p = self.presentes.get(dni, 0); a = self.ausentes.get(dni, 0); res = [(0, 0)] * 13
+        for mes in range(1, 13):
+            m = self.meses[mes]
+            if not m: continue
+            if tipo: m &= self.mascara(tipo)
+            res[mes] = ((p & m).bit_count(), (a & m).bit_count())
+        return res
+
+    def _desde_primera(self, dni):
+        # Sesiones desde la primera en que figura la jugadora (las anteriores no cuentan como faltas)
+        marcadas = self.presentes.get(dni, 0) | self.ausentes.get(dni, 0)
+        if not marcadas: return 0
+        return ((1 << self.total) - 1) & ~((marcadas & -marcadas) - 1)
+
+    def faltas(self, dni):
+        # Sesiones realizadas sin presente: "NO" explícito o sin marcar (guardar() no escribe a las no marcadas)
+        return self._desde_primera(dni) & ~self.presentes.get(dni, 0)
+
+    def racha_presencias(self, dni):
+        return _corrida_max(self.presentes.get(dni, 0))
+
+    def racha_faltas(self, dni):
+        return _corrida_max(self.faltas(dni))
+
+    def faltas_seguidas(self, dni):
+        # Faltas consecutivas hasta la última sesión de la temporada
+        f = self.faltas(dni)
+        if not f: return 0
+        cortes = ~f & self._desde_primera(dni)
+        return self.total - cortes.bit_length() if cortes else f.bit_count()
+
+    def alertas(self, n=ALERTA_AUSENCIAS):
+        # {dni: faltas seguidas} de las que llegan a n
+        res = {}
+        for dni in set(self.presentes) | set(self.ausentes):
+            k = self.faltas_seguidas(dni)
+            if k >= n: res[dni] = k
+        return res
+
+
+class AsistenciaBits:
+    def __init__(self, filas):
+        # Primero se agrupa por fecha (texto): cada fecha se interpreta una sola vez y no una por jugadora
+        por_fecha = {}
+        for r in filas[1:]:
+            if len(r) < 3 or not r[1]: continue
+            grupo = por_fecha.get(r[0])
+            if grupo is None: por_fecha[r[0]] = [r]
+            else: grupo.append(r)
+        dias = {}
+        for f_str, grupo in por_fecha.items():
+            f = _fecha(f_str)
+            # "5/3/2024" y "05/03/2024" son el mismo día
+            if f is not None: dias.setdefault(f[0], {}).setdefault(f[1:], []).extend(grupo)
+        self.temporadas = {a: Temporada(a, d) for a, d in dias.items()}
+
+    def temporada(self, anio):
+        t = self.temporadas.get(anio)
+        return t if t is not None else Temporada(anio, {})
+
+    def total(self, dni, tipo=None):
+        # Presencias de todas las temporadas
+        return sum(t.presencias(dni, t.mascara(tipo)) for t in self.temporadas.values())
+
+
+def de_filas(filas):
+    # Un índice por lista de filas: el memo de lectura (hojas.Lectura) reemplaza la lista en cada cambio,
+    # así que la misma lista siempre da el mismo índice. Se guardan los últimos (una lista por sesión).
+    clave = id(filas)
+    with _LOCK:
+        hit = _CACHE.get(clave)
+        if hit is not None and hit[0] is filas:
+            _CACHE.move_to_end(clave); return hit[1]
+    idx = AsistenciaBits(filas)
+    with _LOCK:
+        _CACHE[clave] = (filas, idx)
+        while len(_CACHE) > _CACHE_MAX: _CACHE.popitem(last=False)
+    return idx
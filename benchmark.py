@@ -0,0 +1,145 @@
+# --- BENCHMARK ---
+# Mide el armado de cada vista_* y cada generar_pdf_* contra un libro en memoria (hoja_falsa.py).
+# Uso: python benchmark.py --jugadoras 40 --temporadas 3 --latencia 0.05
+# Cada corrida se agrega a bench_historial.jsonl para seguir la evolución en el tiempo.
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import statistics
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+import formacion
+import hoja_falsa
+import main as app_main
+from plantel import PLANTEL
+from programador import PRECALCULADOS
+from tendencias import TENDENCIAS
+
+
+class BusFalso:
+    # Hub de pubsub en proceso: las PaginaFalsa que lo comparten se avisan entre sí como sesiones de un mismo ft.app
+    def __init__(self):
+        self.suscriptos = {}; self.lock = threading.Lock()
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="pubsub")
+
+
+class PubSubFalso:
+    # Lo que main() usa de page.pubsub; como Flet, entrega en hebras del executor y no en la que publica
+    def __init__(self, bus): self.bus = bus
+
+    def subscribe_topic(self, topico, fn):
+        with self.bus.lock: self.bus.suscriptos.setdefault(topico, {})[id(self)] = fn
+
+    def send_others_on_topic(self, topico, mensaje):
+        with self.bus.lock: destinos = [fn for k, fn in self.bus.suscriptos.get(topico, {}).items() if k != id(self)]
+        for fn in destinos: self.bus.executor.submit(fn, topico, mensaje)
+
+    def send_all_on_topic(self, topico, mensaje):
+        with self.bus.lock: destinos = list(self.bus.suscriptos.get(topico, {}).values())
+        for fn in destinos: self.bus.executor.submit(fn, topico, mensaje)
+
+
+class PaginaFalsa:
+    # Lo mínimo de ft.Page que usa main(); los controles nunca quedan montados.
+    def __init__(self, bus=None):
+        self.overlay = []; self.controls = []; self.updates = 0; self.pubsub = PubSubFalso(bus or BusFalso())
+
+    def update(self, *controles): self.updates += 1
+    def add(self, *controles): self.controls.extend(controles)
+
+
+def abrir_sesion(libro, pagina=None):
+    # main() se conecta a Sheets vía conectar_google_sheets(): lo reemplazamos por el libro falso
+    app_main.conectar_google_sheets = lambda: libro
+    return app_main.main(pagina or PaginaFalsa())
+
+
+def _cronometrar(fn, libro, repeticiones):
+    tiempos = []; llamadas = 0
+    for _ in range(repeticiones):
+        antes = libro.total_llamadas(); t0 = time.perf_counter()
+        res = fn()
+        tiempos.append(time.perf_counter() - t0); llamadas = libro.total_llamadas() - antes
+        if isinstance(res, tuple) and not res[0]: raise RuntimeError(res[1])
+    return {"mediana_ms": round(statistics.median(tiempos) * 1000, 3), "min_ms": round(min(tiempos) * 1000, 3), "api": llamadas}
+
+
+def casos_reporte(app, libro):
+    jugs = [f for f in libro.worksheet("jugadoras")._filas[1:]]
+    nombres = [f"{f[1]} {f[2]}" for f in jugs]
+    puestos = ["Arquera (1)", "Libero (2)", "Stopper (6)", "Half Der. (4)", "Half Izq. (3)", "Volante Central (5)",
+               "Volante Der. (8)", "Volante Izq. (10)", "Delantera Centro (9)", "Wing Der. (7)", "Wing Izq. (11)"]
+    titulares = dict(zip(puestos, nombres))
+    ausentes = [{"nombre": n, "motivo": "Lesión"} for n in nombres[11:13]]
+    jug = dict(zip(["id", "nombre", "apellido", "dni", "nacimiento", "posicion", "telefono", "activo", "camiseta"], jugs[0]))
+    anio = datetime.now().year
+    r = app.reportes
+    return {
+        "generar_pdf_formacion": lambda: r["formacion"]("Club vs Rival (Local)", "Doble 5", titulares, ausentes, nombres[13:], "Primera"),
+        "generar_pdf_individual": lambda: r["ficha"](jug, {}),
+        "generar_pdf_mensual_grafico": lambda: r["mensual"](6, anio, "Primera"),
+        "generar_pdf_temporada": lambda: r["temporada"](anio, "Primera"),
+        "sugerir_formacion": lambda: formacion.sugerir(PLANTEL.actual(), "Doble 5", libro.worksheet("habilidades").get_all_values(),
+                                                       libro.worksheet("asistencia").get_all_values()),
+    }
+
+
+def correr(args):
+    libro = hoja_falsa.generar_libro(args.jugadoras, args.temporadas, latencia=args.latencia, semilla=args.semilla)
+    previos = set(glob.glob(os.path.join("assets", "*.pdf")))
+    PLANTEL.reiniciar(); TENDENCIAS.reiniciar()
+    PRECALCULADOS.activo = False  # se mide la generación, no el PDF ya hecho
+    app = abrir_sesion(libro)
+    resultados = {}
+    for nombre, vista in app.vistas.items():
+        resultados[f"vista_{nombre}"] = _cronometrar(vista, libro, args.repeticiones)
+    for nombre, fn in casos_reporte(app, libro).items():
+        resultados[nombre] = _cronometrar(fn, libro, args.repeticiones)
+    # Los PDFs del benchmark no se quedan en assets
+    for ruta in set(glob.glob(os.path.join("assets", "*.pdf"))) - previos: os.remove(ruta)
+    return resultados
+
+
+def _commit():
+    try: return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except Exception: return ""
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de vistas y reportes de HockeyApp")
+    ap.add_argument("--jugadoras", type=int, default=40)
+    ap.add_argument("--temporadas", type=int, default=1)
+    ap.add_argument("--latencia", type=float, default=0.0, help="segundos simulados por llamada a la API")
+    ap.add_argument("--repeticiones", type=int, default=5)
+    ap.add_argument("--semilla", type=int, default=0)
+    ap.add_argument("--historial", default="bench_historial.jsonl")
+    args = ap.parse_args()
+
+    resultados = correr(args)
+    params = {"jugadoras": args.jugadoras, "temporadas": args.temporadas, "latencia": args.latencia}
+    anterior = None
+    if os.path.exists(args.historial):
+        with open(args.historial, encoding="utf-8") as f:
+            for linea in f:
+                reg = json.loads(linea)
+                if reg.get("params") == params: anterior = reg["resultados"]
+
+    print(f"{'caso':40} {'mediana ms':>12} {'min ms':>10} {'api':>5} {'vs anterior':>12}")
+    for caso, r in resultados.items():
+        delta = ""
+        if anterior and caso in anterior and anterior[caso]["mediana_ms"]:
+            delta = f"{(r['mediana_ms'] / anterior[caso]['mediana_ms'] - 1) * 100:+.1f}%"
+        print(f"{caso:40} {r['mediana_ms']:>12.2f} {r['min_ms']:>10.2f} {r['api']:>5} {delta:>12}")
+
+    with open(args.historial, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"fecha": datetime.now().isoformat(timespec="seconds"), "commit": _commit(),
+                            "params": params, "resultados": resultados}, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
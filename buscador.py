@@ -0,0 +1,45 @@
+# --- BUSCADOR DE JUGADORAS ---
+# Índice por prefijo sobre nombre, apellido, DNI y camiseta, sin distinguir acentos ni mayúsculas.
+# Se arma una vez por versión del plantel (ver Plantel.indice) y responde con bisect, sin recorrer todo el plantel.
+import unicodedata
+from bisect import bisect_left
+
+LIMITE_OPCIONES = 50  # tope de opciones por desplegable: no se manda el plantel entero al navegador
+
+
+def normalizar(txt):
+    txt = unicodedata.normalize("NFKD", str(txt or ""))
+    return "".join(c for c in txt if not unicodedata.combining(c)).lower().replace("#", " ")
+
+
+class IndiceJugadoras:
+    def __init__(self, jugadoras):
+        self.jugadoras = tuple(jugadoras)
+        entradas = []
+        for i, j in enumerate(self.jugadoras):
+            for campo in (j['nombre'], j['apellido'], j['dni'], j['camiseta']):
+                for token in normalizar(campo).split(): entradas.append((token, i))
+        entradas.sort()
+        self._tokens = [t for t, _ in entradas]; self._ids = [i for _, i in entradas]
+        # Orden de presentación: apellido, nombre (sin acentos)
+        self._orden = {i: k for k, i in enumerate(sorted(range(len(self.jugadoras)),
+                       key=lambda i: (normalizar(self.jugadoras[i]['apellido']), normalizar(self.jugadoras[i]['nombre']))))}
+
+    def _prefijo(self, p):
+        lo = bisect_left(self._tokens, p); hi = bisect_left(self._tokens, p + "\uffff")
+        return set(self._ids[lo:hi])
+
+    def buscar(self, consulta, limite=LIMITE_OPCIONES):
+        # Cada palabra de la consulta tiene que ser prefijo de algún campo: "mar gon" -> Martina González
+        palabras = normalizar(consulta).split()
+        if palabras:
+            ids = None
+            for p in sorted(palabras, key=len, reverse=True):
+                ids = self._prefijo(p) if ids is None else ids & self._prefijo(p)
+                if not ids: return []
+        else: ids = range(len(self.jugadoras))
+        orden = sorted(ids, key=self._orden.__getitem__)
+        return [self.jugadoras[i] for i in (orden[:limite] if limite else orden)]
+
+    def cuenta(self, consulta):
+        return len(self.buscar(consulta, limite=None))
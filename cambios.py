@@ -0,0 +1,44 @@
+# --- CAMBIOS ENTRE SESIONES ---
+# Cada escritura publica qué cambió (hoja, operación, filas) por el pubsub de Flet. Las demás sesiones
+# lo aplican a su memo de lectura (hojas.Lectura) y a los controles abiertos, sin volver a bajar la hoja.
+import logging
+from collections import namedtuple
+
+TOPICO = "hojas"
+log = logging.getLogger("hockeyapp.cambios")
+
+# op: "agregar"    -> filas al final
+#     "actualizar" -> la fila nº 'fila' (1 = primera de la hoja) toma filas[0], desde la columna 'col' (0 si es None)
+#     "borrar"     -> se elimina la fila nº 'fila'
+#     "reemplazar" -> se eliminan las filas con fila[col] == valor y se agregan 'filas' al final
+Cambio = namedtuple("Cambio", "hoja op fila filas col valor", defaults=(None, (), None, None))
+
+
+def aplicar(filas, cambio, primera=1):
+    # Devuelve una lista nueva (otra hebra puede estar recorriendo la vieja). primera = nº de hoja de filas[0]
+    op = cambio.op
+    if op == "agregar": return filas + [list(f) for f in cambio.filas]
+    nuevas = list(filas)
+    if op == "actualizar":
+        i = cambio.fila - primera; col = cambio.col or 0
+        if 0 <= i < len(nuevas):
+            fila = list(nuevas[i]); fin = col + len(cambio.filas[0])
+            if len(fila) < fin: fila += [""] * (fin - len(fila))
+            fila[col:fin] = cambio.filas[0]; nuevas[i] = fila
+    elif op == "borrar":
+        i = cambio.fila - primera
+        if 0 <= i < len(nuevas): del nuevas[i]
+    elif op == "reemplazar":
+        nuevas = [f for f in nuevas if not (len(f) > cambio.col and f[cambio.col] == cambio.valor)]
+        nuevas += [list(f) for f in cambio.filas]
+    return nuevas
+
+
+def publicar(page, cambio, almacen=None):
+    # Solo a las otras sesiones: la que escribió ya tiene sus controles al día.
+    # Con almacén compartido también queda registrado para las sesiones de los otros workers.
+    try: page.pubsub.send_others_on_topic(TOPICO, cambio)
+    except Exception as ex: log.warning("no se pudo publicar %s/%s: %s", cambio.hoja, cambio.op, ex)
+    if almacen is not None:
+        try: almacen.registrar_cambio(cambio)
+        except Exception as ex: log.warning("no se pudo registrar %s/%s: %s", cambio.hoja, cambio.op, ex)
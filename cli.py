@@ -0,0 +1,49 @@
+# --- LÍNEA DE COMANDOS ---
+# Reportes sin abrir la app (sesión sin pantalla de programador.py); imprime la ruta del PDF generado.
+#   python cli.py mensual 6 2026 [--categoria Primera]
+#   python cli.py temporada 2026
+#   python cli.py ficha 40123456
+#   python cli.py precalcular [--fecha 2026-06-01]   -> lo mismo que corre el programador ese día (cron)
+# Lo generado queda en el almacén de reportes (almacen_local.ruta()): si la app corre con otro ALMACEN_DB,
+# el cron tiene que usar el mismo.
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+import programador
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Reportes de HockeyApp desde la terminal")
+    comun = argparse.ArgumentParser(add_help=False)
+    comun.add_argument("--categoria", help="categoría del encabezado (por defecto la guardada)")
+    sub = ap.add_subparsers(dest="reporte", required=True)
+    p = sub.add_parser("mensual", parents=[comun], help="planilla de asistencia de un mes"); p.add_argument("mes", type=int); p.add_argument("anio", type=int)
+    p = sub.add_parser("temporada", parents=[comun], help="planillas del año + resumen"); p.add_argument("anio", type=int)
+    p = sub.add_parser("ficha", parents=[comun], help="ficha individual"); p.add_argument("dni")
+    p = sub.add_parser("precalcular", help="tareas del programador para una fecha")
+    p.add_argument("--fecha", type=lambda t: datetime.strptime(t, "%Y-%m-%d"), default=None)
+    args = ap.parse_args()
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(asctime)s %(name)s %(message)s")
+
+    if args.reporte == "precalcular":
+        res = programador.Programador().correr(args.fecha)
+        for tipo, params, ok, url in res: print(f"{'OK ' if ok else 'ERR'} {tipo} {' '.join(map(str, params))}: {url}")
+        return 0 if all(r[2] for r in res) else 1
+
+    app = programador.abrir_sesion()
+    if args.categoria: app.categoria[0] = args.categoria
+    if args.reporte == "mensual": params = (args.mes, args.anio)
+    elif args.reporte == "temporada": params = (args.anio,)
+    else: params = (args.dni,)
+    ok, msg, url = programador.generar(app, args.reporte, *params)
+    if not ok:
+        print(f"Error: {msg}", file=sys.stderr); return 1
+    print(os.path.join("assets", url.lstrip("/")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+# --- 1. CONEXIÓN ---
+# Separada de main.py para que las herramientas de línea de comandos no carguen la UI.
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+import metricas
+
+
+def conectar_google_sheets():
+    scope = ["https://spreadsheets.google.com/feeds", 'https://www.googleapis.com/auth/spreadsheets',
+             "https://www.googleapis.com/auth/drive.file", "https://www.googleapis.com/auth/drive"]
+    creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
+    client = gspread.authorize(creds)
+    # Todas las llamadas a la API pasan por el medidor (ver metricas.py)
+    return metricas.LibroMedido(client.open("HockeyApp_DB"))
@@ -0,0 +1,143 @@
+# --- COORDINACIÓN DE ESCRITURAS ---
+# Todas las sesiones escriben desde el mismo proceso. Por hoja hay un cerrojo lectores-escritor:
+#   compartido -> agregar filas o actualizar una fila por clave (pueden ir en paralelo entre sí),
+#   exclusivo  -> operaciones que mueven filas (clear + reescritura, delete_rows).
+# Dentro del modo compartido, un lock por (hoja, clave) serializa a quienes tocan el mismo registro.
+# Antes de tocar una fila por número se verifica que siga siendo la que vio la sesión (ubicar_fila).
+# Con varios workers (servidor.py) los mismos cerrojos se toman además entre procesos, con flock sobre
+# archivos en la carpeta del almacén compartido: uno por hoja (compartido/exclusivo) y uno por (hoja, clave).
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin cerrojos entre procesos, servidor.py corre un solo worker
+    fcntl = None
+
+
+class FilaDesactualizada(Exception):
+    pass
+
+
+class CerrojoLE:
+    # Lectores-escritor con preferencia al escritor (un delete no espera para siempre detrás de los appends)
+    def __init__(self):
+        self._cond = threading.Condition(); self._compartidos = 0; self._exclusivo = False; self._esperando = 0
+
+    def tomar_compartido(self):
+        with self._cond:
+            while self._exclusivo or self._esperando: self._cond.wait()
+            self._compartidos += 1
+
+    def soltar_compartido(self):
+        with self._cond:
+            self._compartidos -= 1
+            if not self._compartidos: self._cond.notify_all()
+
+    def tomar_exclusivo(self):
+        with self._cond:
+            self._esperando += 1
+            while self._exclusivo or self._compartidos: self._cond.wait()
+            self._esperando -= 1; self._exclusivo = True
+
+    def soltar_exclusivo(self):
+        with self._cond: self._exclusivo = False; self._cond.notify_all()
+
+
+@contextmanager
+def _flock(ruta, modo):
+    # Cada toma abre su propio descriptor: flock excluye también entre hebras del mismo proceso
+    with open(ruta, "a") as f:
+        fcntl.flock(f, modo)
+        try: yield
+        finally: fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class Coordinador:
+    def __init__(self, carpeta=None):
+        self._lock = threading.Lock(); self._hojas = {}; self._claves = {}
+        # carpeta: cerrojos entre procesos (None = un solo proceso, solo los de memoria)
+        self.carpeta = carpeta if fcntl is not None else None
+        if self.carpeta: os.makedirs(self.carpeta, exist_ok=True)
+
+    def _archivo(self, titulo, clave=None):
+        nombre = titulo if clave is None else f"{titulo}.{hashlib.sha1(repr(clave).encode()).hexdigest()[:16]}"
+        return os.path.join(self.carpeta, nombre + ".lock")
+
+    @contextmanager
+    def _entre_procesos(self, titulo, modo, clave=None):
+        if not self.carpeta: yield; return
+        with _flock(self._archivo(titulo), modo):
+            if clave is None: yield
+            else:
+                with _flock(self._archivo(titulo, clave), fcntl.LOCK_EX): yield
+
+    def _hoja(self, titulo):
+        with self._lock:
+            c = self._hojas.get(titulo)
+            if c is None: c = self._hojas[titulo] = CerrojoLE()
+            return c
+
+    def _clave(self, titulo, clave):
+        with self._lock:
+            c = self._claves.get((titulo, clave))
+            if c is None: c = self._claves[(titulo, clave)] = threading.Lock()
+            return c
+
+    @contextmanager
+    def compartida(self, titulo, clave=None):
+        hoja = self._hoja(titulo); hoja.tomar_compartido()
+        try:
+            if clave is None:
+                with self._entre_procesos(titulo, fcntl and fcntl.LOCK_SH): yield
+            else:
+                with self._clave(titulo, clave), self._entre_procesos(titulo, fcntl and fcntl.LOCK_SH, clave): yield
+        finally: hoja.soltar_compartido()
+
+    @contextmanager
+    def exclusiva(self, titulo):
+        hoja = self._hoja(titulo); hoja.tomar_exclusivo()
+        try:
+            with self._entre_procesos(titulo, fcntl and fcntl.LOCK_EX): yield
+        finally: hoja.soltar_exclusivo()
+
+
+def _recortar(fila):
+    fila = [str(v) for v in fila]
+    while fila and fila[-1] == "": fila.pop()
+    return fila
+
+
+def _coincide(a, b, columnas):
+    a, b = _recortar(a), _recortar(b)
+    if columnas is None: return a == b
+    return all((a[c] if c < len(a) else "") == (b[c] if c < len(b) else "") for c in columnas)
+
+
+def ubicar_fila(ws, fila, esperada, columnas=None):
+    """Devuelve el número de fila donde está hoy 'esperada' (comparando 'columnas', o toda la fila).
+
+    Primero mira la fila que vio la sesión (una lectura chica); si otra sesión la movió, la busca en una
+    lectura fresca. Si ya no está o aparece más de una vez, levanta FilaDesactualizada.
+    """
+    if _coincide(ws.row_values(fila), esperada, columnas): return fila
+    leer = getattr(ws, "releer", ws.get_all_values)
+    encontradas = [i + 1 for i, f in enumerate(leer()) if _coincide(f, esperada, columnas)]
+    if len(encontradas) == 1: return encontradas[0]
+    raise FilaDesactualizada("La planilla cambió desde otra sesión: recargá y volvé a intentar")
+
+
+def buscar_fila(ws, clave):
+    # Número de la fila (lectura fresca) que empieza con 'clave', o None. Con el cerrojo de esa clave tomado:
+    # si otra sesión agregó el registro después de que esta leyó la hoja, se actualiza en vez de duplicarlo.
+    leer = getattr(ws, "releer", ws.get_all_values)
+    return next((i + 1 for i, f in enumerate(leer()) if _coincide(f, clave, range(len(clave)))), None)
+
+
+# Uno por proceso, como el plantel: lo comparten todas las sesiones. Con ALMACEN_DB (multi-worker) los
+# cerrojos de archivo van junto a la base, así todos los workers del host usan los mismos
+CERROJOS_ENTRE_PROCESOS = fcntl is not None
+COORDINADOR = Coordinador(os.path.join(os.path.dirname(os.path.abspath(os.environ["ALMACEN_DB"])), "cerrojos")
+                          if os.environ.get("ALMACEN_DB") else None)
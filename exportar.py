@@ -0,0 +1,150 @@
+# --- EXPORTACIÓN MASIVA ---
+# Vuelca jugadoras, asistencia, habilidades, partidos y fixture a CSV, XLSX o Parquet.
+# Por defecto cada hoja se lee por bloques de filas y los escritores consumen generadores fila a fila:
+# la memoria no crece con el historial, pero NO es una foto consistente del libro (una escritura entre dos
+# bloques puede correr filas: alguna puede salir repetida o faltar). Con --bloque 0 todas las hojas bajan
+# juntas en una sola llamada: foto consistente, todo en memoria.
+# Uso: python exportar.py --formato csv --destino exportacion/
+#      python exportar.py --formato parquet --bloque 0      (foto consistente en una llamada)
+import argparse
+import csv
+import logging
+import os
+from datetime import datetime
+
+from hojas import HOJAS, leer_hojas, leer_rangos, rango_hoja
+
+# 'partidos' no tiene fila de cabecera en la planilla
+COLUMNAS_PARTIDOS = ["Fecha", "Rival", "Condicion", "GF", "GC", "CornersF", "CornersC", "Goleadoras", "Eventos"]
+LOTE_PARQUET = 5000
+BLOQUE = 5000  # filas por lectura por defecto
+log = logging.getLogger("hockeyapp.exportar")
+
+
+def snapshot(sh, titulos=HOJAS, bloque=BLOQUE):
+    """Devuelve {hoja: generador de filas}.
+
+    bloque=N: cada hoja se lee en ventanas de N filas y solo una ventana vive en memoria a la vez
+    (cada ventana es consistente, el conjunto no).
+    bloque=0: una sola llamada values_batch_get con todas las hojas (foto consistente, todo en memoria).
+    """
+    if not bloque:
+        datos = leer_hojas(sh, titulos)
+        return {t: iter(datos[t]) for t in titulos}
+    # Hasta dónde leer cada hoja: el alto de su grilla (una llamada de metadatos para todas)
+    altos = {ws.title: ws.row_count for ws in sh.worksheets()}
+    return {t: _por_bloques(sh, t, bloque, altos.get(t, 0)) for t in titulos}
+
+
+def _por_bloques(sh, titulo, bloque, alto):
+    # Una ventana vacía no corta: puede haber datos después de un tramo en blanco
+    for fila in range(1, alto + 1, bloque):
+        yield from leer_rangos(sh, [rango_hoja(titulo, fila, min(fila + bloque - 1, alto))])[0]
+
+
+def con_cabecera(titulo, filas, muestra=BLOQUE):
+    # Primera fila = nombres de columna; todas las filas con el ancho de la cabecera. El ancho se fija antes
+    # de emitirla con las primeras 'muestra' filas; lo que después se pase de ese ancho se recorta (con aviso)
+    filas = iter(filas)
+    if titulo == "partidos": cab = list(COLUMNAS_PARTIDOS)
+    else:
+        cab = next(filas, None)
+        if cab is None: return
+        cab = [c or f"col_{i+1}" for i, c in enumerate(cab)]
+    primeras = [f for _, f in zip(range(muestra), filas)]
+    ancho = max([len(cab)] + [len(_sin_vacias(f)) for f in primeras])
+    cab.extend(f"col_{i+1}" for i in range(len(cab), ancho))
+    yield cab
+    recortadas = 0
+    for lote in (primeras, filas):
+        for f in lote:
+            if not any(f): continue
+            if len(f) > ancho:
+                if any(f[ancho:]): recortadas += 1
+                f = f[:ancho]
+            yield f + [""] * (ancho - len(f))
+    if recortadas: log.warning("%s: %s filas con celdas después de la columna %s (no exportadas)", titulo, recortadas, ancho)
+
+
+def _sin_vacias(f):
+    f = list(f)
+    while f and f[-1] == "": f.pop()
+    return f
+
+
+# =========================================================
+# ESCRITORES
+# =========================================================
+def escribir_csv(destino, titulo, filas):
+    ruta = os.path.join(destino, f"{titulo}.csv"); n = 0
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        for fila in filas: w.writerow(fila); n += 1
+    return ruta, max(n - 1, 0)
+
+
+def escribir_parquet(destino, titulo, filas):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Falta pyarrow: pip install pyarrow")
+    ruta = os.path.join(destino, f"{titulo}.parquet"); n = 0
+    filas = iter(filas); cab = next(filas, None)
+    if cab is None: return ruta, 0
+    ancho = len(cab); schema = pa.schema([(c, pa.string()) for c in cab])
+    with pq.ParquetWriter(ruta, schema) as w:
+        lote = []
+        for f in filas:
+            lote.append(f[:ancho]); n += 1
+            if len(lote) >= LOTE_PARQUET:
+                w.write_table(pa.Table.from_pylist([dict(zip(cab, x)) for x in lote], schema=schema)); lote = []
+        if lote: w.write_table(pa.Table.from_pylist([dict(zip(cab, x)) for x in lote], schema=schema))
+    return ruta, n
+
+
+def escribir_xlsx(destino, por_hoja):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise SystemExit("Falta openpyxl: pip install openpyxl")
+    # write_only: openpyxl vuelca cada fila a disco en vez de armar el libro en memoria
+    ruta = os.path.join(destino, "hockeyapp.xlsx"); wb = Workbook(write_only=True); cuentas = {}
+    for titulo, filas in por_hoja.items():
+        ws = wb.create_sheet(titulo); n = 0
+        for f in filas: ws.append(f); n += 1
+        cuentas[titulo] = max(n - 1, 0)
+    wb.save(ruta)
+    return ruta, cuentas
+
+
+def exportar(sh, formato, destino, titulos=HOJAS, bloque=BLOQUE):
+    os.makedirs(destino, exist_ok=True)
+    fuentes = snapshot(sh, titulos, bloque)
+    por_hoja = {t: con_cabecera(t, fuentes[t]) for t in titulos}
+    if formato == "xlsx":
+        ruta, cuentas = escribir_xlsx(destino, por_hoja)
+        return {t: (ruta, n) for t, n in cuentas.items()}
+    escribir = escribir_csv if formato == "csv" else escribir_parquet
+    return {t: escribir(destino, t, filas) for t, filas in por_hoja.items()}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Exporta el libro HockeyApp_DB a CSV/XLSX/Parquet")
+    ap.add_argument("--formato", choices=["csv", "xlsx", "parquet"], default="csv")
+    ap.add_argument("--destino", default=os.path.join("exportacion", datetime.now().strftime("%Y%m%d_%H%M")))
+    ap.add_argument("--hojas", default=",".join(HOJAS), help="hojas separadas por coma")
+    ap.add_argument("--bloque", type=int, default=BLOQUE,
+                    help="filas por lectura; por bloques no es una foto consistente si alguien escribe mientras tanto "
+                         "(0 = todas las hojas en una llamada: consistente, todo en memoria)")
+    args = ap.parse_args()
+
+    from conexion import conectar_google_sheets
+    sh = conectar_google_sheets()
+    titulos = [t.strip() for t in args.hojas.split(",") if t.strip()]
+    for titulo, (ruta, n) in exportar(sh, args.formato, args.destino, titulos, args.bloque).items():
+        print(f"{titulo:12} {n:>8} filas -> {ruta}")
+
+
+if __name__ == "__main__":
+    main()
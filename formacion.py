@@ -0,0 +1,197 @@
+# --- FORMACIÓN ---
+# Modelo de disponibilidad del armado de equipo: quién está libre, en qué puesto o ausente.
+# Cada cambio actualiza la lista de libres en el lugar (sin recorrer ni reordenar el plantel) y
+# las opciones de cada desplegable se comparan con las últimas enviadas para tocar solo las que cambiaron.
+from bisect import bisect_left
+
+
+class Disponibilidad:
+    def __init__(self, nombres):
+        self.recargar(nombres)
+
+    def recargar(self, nombres, asignadas=None, ausentes=()):
+        # Plantel nuevo (ACTUALIZAR LISTAS): conserva asignaciones y ausencias que sigan existiendo
+        self.nombres = sorted(set(nombres)); self._rango = {n: i for i, n in enumerate(self.nombres)}
+        self.asignadas = {p: n for p, n in (asignadas or {}).items() if n in self._rango}
+        self.ausentes = {n for n in ausentes if n in self._rango}
+        ocupadas = set(self.asignadas.values()) | self.ausentes
+        self._libres = [i for i, n in enumerate(self.nombres) if n not in ocupadas]  # rangos, siempre ordenados
+
+    def _liberar(self, nombre):
+        i = self._rango.get(nombre)
+        if i is None: return
+        k = bisect_left(self._libres, i)
+        if k == len(self._libres) or self._libres[k] != i: self._libres.insert(k, i)
+
+    def _ocupar(self, nombre):
+        i = self._rango.get(nombre)
+        if i is None: return
+        k = bisect_left(self._libres, i)
+        if k < len(self._libres) and self._libres[k] == i: del self._libres[k]
+
+    def _sacar_de_puestos(self, nombre):
+        vaciados = [p for p, n in self.asignadas.items() if n == nombre]
+        for p in vaciados: del self.asignadas[p]
+        return vaciados
+
+    def libres(self):
+        return [self.nombres[i] for i in self._libres]
+
+    def asignar(self, puesto, nombre):
+        # Devuelve los otros puestos que quedaron vacíos (la jugadora ya estaba ubicada en otro)
+        anterior = self.asignadas.pop(puesto, None)
+        if anterior and anterior not in self.ausentes: self._liberar(anterior)
+        if not nombre: return []
+        vaciados = self._sacar_de_puestos(nombre)
+        self.asignadas[puesto] = nombre; self._ocupar(nombre)
+        return vaciados
+
+    def marcar_ausente(self, nombre):
+        vaciados = self._sacar_de_puestos(nombre)
+        self.ausentes.add(nombre); self._ocupar(nombre)
+        return vaciados
+
+    def quitar_ausente(self, nombre):
+        self.ausentes.discard(nombre)
+        if nombre not in self.asignadas.values(): self._liberar(nombre)
+
+    def opciones(self, filtro=None, limite=None, valor=None):
+        # Libres que matchean el filtro (hasta 'limite') más el valor elegido, en orden alfabético
+        cand = []
+        for i in self._libres:
+            n = self.nombres[i]
+            if filtro is None or n in filtro:
+                cand.append(n)
+                if limite and len(cand) >= limite: break
+        if valor and valor not in cand:
+            r = self._rango.get(valor, len(self.nombres))
+            cand.insert(bisect_left([self._rango[n] for n in cand], r), valor)
+        return tuple(cand)
+
+
+# =========================================================
+# SUGERENCIA DE FORMACIÓN
+# =========================================================
+# Matriz jugadora x puesto armada con las últimas evaluaciones, la asistencia reciente y la posición
+# cargada en el plantel; se resuelve como asignación óptima (método húngaro; usa scipy si está instalado).
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+LINEAS = {
+    "ARCO": ["Arquera (1)"], "DEFENSA": ["Libero (2)", "Stopper (6)", "Half Der. (4)", "Half Izq. (3)"],
+    "MEDIO": ["Volante Central (5)", "Volante Der. (8)", "Volante Izq. (10)"], "ATAQUE": ["Delantera Centro (9)", "Wing Der. (7)", "Wing Izq. (11)"]
+}
+ESQUEMAS = ["Doble 5", "3-3-1-3", "4-3-3"]
+# Puestos que cambian de línea según el esquema (en Doble 5 la 2 se para al lado de la 5)
+CAMBIOS_ESQUEMA = {
+    "Doble 5": {"Libero (2)": "MEDIO"},
+    "3-3-1-3": {"Libero (2)": "MEDIO", "Volante Central (5)": "ENLACE"},
+    "4-3-3": {},
+}
+LINEA_POSICION = {"Arquera": "ARCO", "Defensora": "DEFENSA", "Volante": "MEDIO", "Delantera": "ATAQUE"}
+ORDEN_LINEAS = ["ARCO", "DEFENSA", "MEDIO", "ATAQUE"]
+# Peso de cada habilidad (Push, Dribbling, Flick, Pegada, Barrida, Físico, Quites) por línea
+PESOS_SKILLS = {
+    "ARCO": (0, 0, 0, 1, 1, 2, 2),
+    "DEFENSA": (2, 0, 0, 2, 3, 2, 3),
+    "MEDIO": (3, 2, 2, 1, 1, 2, 1),
+    "ATAQUE": (1, 3, 2, 3, 0, 1, 0),
+}
+PESOS_SKILLS["ENLACE"] = tuple(a + b for a, b in zip(PESOS_SKILLS["MEDIO"], PESOS_SKILLS["ATAQUE"]))
+EVALUACIONES_RECIENTES = 3; SESIONES_RECIENTES = 12
+
+
+def linea_de(puesto, esquema):
+    linea = CAMBIOS_ESQUEMA.get(esquema, {}).get(puesto)
+    if linea: return linea
+    return next(l for l, ps in LINEAS.items() if puesto in ps)
+
+
+def _clave_fecha(f):
+    # "dd/mm/aaaa" -> "aaaammdd" (ordena igual que la fecha, sin strptime)
+    return f[6:10] + f[3:5] + f[0:2] if len(f) == 10 else ""
+
+
+def _afinidad(posicion, linea):
+    propia = LINEA_POSICION.get(posicion)
+    if propia is None: return 0.5
+    if propia == "ARCO" or linea == "ARCO": return 1.0 if propia == linea else -2.0  # el arco no se improvisa
+    if linea == "ENLACE": return 1.0 if propia in ("MEDIO", "ATAQUE") else 0.3
+    d = abs(ORDEN_LINEAS.index(propia) - ORDEN_LINEAS.index(linea))
+    return (1.0, 0.5, 0.1)[min(d, 2)]
+
+
+def perfiles(raw_hab, raw_asist, n_skills):
+    # dni -> (promedio de cada habilidad en las últimas evaluaciones, % de presencia en las últimas sesiones)
+    evals = {}
+    for r in raw_hab[1:]:
+        if len(r) < 2 + n_skills or not r[1]: continue
+        try: notas = [float(r[2 + i]) for i in range(n_skills)]
+        except ValueError: continue
+        evals.setdefault(str(r[1]), []).append((_clave_fecha(r[0]), notas))
+    sesiones = {}
+    for r in raw_asist[1:]:
+        if len(r) > 2 and r[2] in ("SI", "NO"): sesiones.setdefault(str(r[1]), []).append((_clave_fecha(r[0]), r[2] == "SI"))
+    res = {}
+    for dni in set(evals) | set(sesiones):
+        ultimas = sorted(evals.get(dni, []), key=lambda x: x[0])[-EVALUACIONES_RECIENTES:]
+        prom = [sum(n[i] for _, n in ultimas) / len(ultimas) for i in range(n_skills)] if ultimas else None
+        ses = sorted(sesiones.get(dni, []), key=lambda x: x[0])[-SESIONES_RECIENTES:]
+        res[dni] = (prom, sum(p for _, p in ses) / len(ses) if ses else None)
+    return res
+
+
+def aptitud(jugadora, perfil, linea):
+    # 0..1 aprox: 55% habilidades de la línea, 25% asistencia, 20% posición habitual
+    prom, asist = perfil or (None, None)
+    pesos = PESOS_SKILLS[linea]
+    habil = sum(p * v for p, v in zip(pesos, prom)) / (10 * sum(pesos)) if prom else 0.5
+    return 0.55 * habil + 0.25 * (0.5 if asist is None else asist) + 0.20 * _afinidad(jugadora['posicion'], linea)
+
+
+def _hungaro(costo):
+    # Asignación de costo mínimo, filas <= columnas (Kuhn-Munkres con potenciales, O(n^2 m))
+    n, m = len(costo), len(costo[0]); INF = float("inf")
+    u = [0.0] * (n + 1); v = [0.0] * (m + 1); p = [0] * (m + 1); camino = [0] * (m + 1)
+    for i in range(1, n + 1):
+        p[0] = i; j0 = 0; minv = [INF] * (m + 1); usado = [False] * (m + 1)
+        while True:
+            usado[j0] = True; i0 = p[j0]; delta = INF; j1 = 0
+            fila = costo[i0 - 1]; ui0 = u[i0]
+            for j in range(1, m + 1):
+                if not usado[j]:
+                    cur = fila[j - 1] - ui0 - v[j]
+                    if cur < minv[j]: minv[j] = cur; camino[j] = j0
+                    if minv[j] < delta: delta = minv[j]; j1 = j
+            for j in range(m + 1):
+                if usado[j]: u[p[j]] += delta; v[j] -= delta
+                else: minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0: break
+        while j0:
+            j1 = camino[j0]; p[j0] = p[j1]; j0 = j1
+    return [(p[j] - 1, j - 1) for j in range(1, m + 1) if p[j]]
+
+
+def asignar_optimo(puntaje):
+    # Máximo puntaje total; devuelve pares (fila, columna). Sirve con más filas o más columnas.
+    if not puntaje or not puntaje[0]: return []
+    if linear_sum_assignment is not None:
+        filas, cols = linear_sum_assignment(puntaje, maximize=True)
+        return list(zip(filas.tolist(), cols.tolist()))
+    if len(puntaje) <= len(puntaje[0]): return _hungaro([[-x for x in fila] for fila in puntaje])
+    traspuesta = [[-puntaje[i][j] for i in range(len(puntaje))] for j in range(len(puntaje[0]))]
+    return [(i, j) for j, i in _hungaro(traspuesta)]
+
+
+def sugerir(jugadoras, esquema, raw_hab, raw_asist, excluir=(), n_skills=7):
+    """Devuelve {puesto: "Nombre Apellido"} con la mejor formación para el esquema, salteando las de 'excluir'."""
+    candidatas = [j for j in jugadoras if j['activo'] != "NO" and f"{j['nombre']} {j['apellido']}" not in excluir]
+    if not candidatas: return {}
+    puestos = [p for ps in LINEAS.values() for p in ps]
+    lineas = [linea_de(p, esquema) for p in puestos]
+    datos = perfiles(raw_hab, raw_asist, n_skills)
+    puntaje = [[aptitud(j, datos.get(str(j['dni'])), l) for l in lineas] for j in candidatas]
+    return {puestos[c]: f"{candidatas[f]['nombre']} {candidatas[f]['apellido']}" for f, c in asignar_optimo(puntaje)}
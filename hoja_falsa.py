@@ -0,0 +1,213 @@
+# --- GSPREAD EN MEMORIA ---
+# Libro/Hoja falsos con los métodos de gspread que usa main.py, latencia simulada
+# y un generador de datos sintéticos (N jugadoras x M temporadas). Para benchmark.py y prueba_carga.py.
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from gspread.exceptions import WorksheetNotFound
+
+CABECERAS = {
+    "jugadoras": ["ID", "Nombre", "Apellido", "DNI", "Nacimiento", "Posicion", "Telefono", "Activo", "Camiseta"],
+    "asistencia": ["Fecha", "DNI", "Presente", "Tipo", "Observaciones"],
+    "habilidades": ["Fecha", "DNI", "Push", "Dribbling", "Flick", "Pegada", "Barrida", "Físico", "Quites", "Obs"],
+    "fixture": ["Fecha", "Rival", "Condicion", "Maps"],
+    "partidos": None,  # la hoja de partidos no tiene cabecera
+}
+
+
+def _col_a_indice(letras):
+    n = 0
+    for c in letras: n = n * 26 + (ord(c.upper()) - 64)
+    return n - 1
+
+
+def _rango(a1):
+    # "A5:I5" -> (fila0, col0, fila1, col1) base 0; "C3" -> celda única
+    a1 = a1.split("!")[-1]
+    partes = [re.match(r"([A-Za-z]+)(\d+)", p).groups() for p in a1.split(":")]
+    (c0, f0), (c1, f1) = partes[0], partes[-1]
+    return int(f0) - 1, _col_a_indice(c0), int(f1) - 1, _col_a_indice(c1)
+
+
+class HojaFalsa:
+    def __init__(self, libro, titulo, filas=None):
+        self._libro = libro; self.title = titulo; self.id = abs(hash(titulo)) % 10**9
+        self._filas = [list(map(str, f)) for f in (filas or [])]
+        self._lock = threading.RLock(); self._alto = 1000
+
+    @property
+    def row_count(self):
+        # Alto de la grilla: como en Sheets, 1000 filas de entrada (o las que tenga, si son más)
+        with self._lock: return max(len(self._filas), self._alto)
+
+    def add_rows(self, n):
+        self._libro._llamada(self.title, "add_rows")
+        with self._lock: self._alto = self.row_count + n
+
+    # -- lecturas --
+    def get_all_values(self):
+        self._libro._llamada(self.title, "get_all_values")
+        with self._lock:
+            ancho = max((len(f) for f in self._filas), default=0)
+            return [f + [""] * (ancho - len(f)) for f in self._filas]
+
+    def row_values(self, fila):
+        self._libro._llamada(self.title, "row_values")
+        with self._lock:
+            return list(self._filas[fila - 1]) if 0 < fila <= len(self._filas) else []
+
+    # -- escrituras --
+    def append_row(self, valores, **kwargs):
+        self._libro._llamada(self.title, "append_row")
+        with self._lock: self._filas.append([str(v) for v in valores])
+
+    def append_rows(self, filas, **kwargs):
+        self._libro._llamada(self.title, "append_rows")
+        with self._lock: self._filas.extend([str(v) for v in f] for f in filas)
+
+    def insert_row(self, valores, index=1, **kwargs):
+        self._libro._llamada(self.title, "insert_row")
+        with self._lock: self._filas.insert(index - 1, [str(v) for v in valores])
+
+    def delete_rows(self, inicio, fin=None):
+        self._libro._llamada(self.title, "delete_rows")
+        with self._lock: del self._filas[inicio - 1:(fin or inicio)]
+
+    def clear(self):
+        self._libro._llamada(self.title, "clear")
+        with self._lock: self._filas = []
+
+    def update(self, rango, valores=None, **kwargs):
+        self._libro._llamada(self.title, "update")
+        if valores is None: rango, valores = "A1", rango
+        with self._lock: self._escribir(rango, valores)
+
+    def batch_update(self, datos, **kwargs):
+        self._libro._llamada(self.title, "batch_update")
+        with self._lock:
+            for d in datos: self._escribir(d["range"], d["values"])
+
+    def _escribir(self, rango, valores):
+        f0, c0, _, _ = _rango(rango)
+        for i, fila in enumerate(valores):
+            while len(self._filas) <= f0 + i: self._filas.append([])
+            destino = self._filas[f0 + i]
+            if len(destino) < c0 + len(fila): destino.extend([""] * (c0 + len(fila) - len(destino)))
+            for j, v in enumerate(fila): destino[c0 + j] = "" if v is None else str(v)
+
+
+class LibroFalso:
+    def __init__(self, hojas=None, latencia=0.0, jitter=0.0, semilla=None):
+        self.latencia = latencia; self.jitter = jitter
+        self.llamadas = Counter(); self.por_hilo = Counter(); self._lock = threading.Lock()
+        self._rnd = random.Random(semilla)
+        self._hojas = {t: HojaFalsa(self, t, f) for t, f in (hojas or {}).items()}
+
+    def _llamada(self, hoja, op):
+        with self._lock:
+            self.llamadas[(hoja, op)] += 1; self.por_hilo[threading.get_ident()] += 1
+            espera = self.latencia + (self._rnd.uniform(0, self.jitter) if self.jitter else 0)
+        if espera > 0: time.sleep(espera)
+
+    def total_llamadas(self):
+        with self._lock: return sum(self.llamadas.values())
+
+    def worksheet(self, titulo):
+        if titulo not in self._hojas: raise WorksheetNotFound(titulo)
+        return self._hojas[titulo]
+
+    def worksheets(self):
+        self._llamada("*", "fetch_sheet_metadata")
+        return list(self._hojas.values())
+
+    def values_batch_get(self, ranges, params=None):
+        # Como la API: una sola llamada, celdas/filas vacías del final recortadas
+        self._llamada("*", "values_batch_get")
+        rangos = []
+        for r in ranges:
+            titulo = r.split("!")[0].strip("'")
+            hoja = self._hojas[titulo]
+            with hoja._lock: filas = [list(f) for f in hoja._filas]
+            if "!" in r:
+                f0, c0, f1, c1 = _rango(r)
+                filas = [f[c0:c1 + 1] for f in filas[f0:f1 + 1]]
+            for f in filas:
+                while f and f[-1] == "": f.pop()
+            while filas and not filas[-1]: filas.pop()
+            rangos.append({"range": r, "majorDimension": "ROWS", "values": filas})
+        return {"spreadsheetId": "falso", "valueRanges": rangos}
+
+    def values_batch_update(self, body=None):
+        # Una sola llamada para todos los rangos (de cualquier hoja)
+        self._llamada("*", "values_batch_update")
+        for d in (body or {}).get("data", []):
+            titulo, rango = d["range"].split("!")
+            hoja = self._hojas[titulo.strip("'")]
+            with hoja._lock: hoja._escribir(rango, d["values"])
+        return {"spreadsheetId": "falso", "totalUpdatedRanges": len((body or {}).get("data", []))}
+
+    def batch_update(self, body):
+        # Solo lo que usa la app: deleteDimension de filas (índices base 0, fin exclusivo)
+        self._llamada("*", "batch_update")
+        por_id = {h.id: h for h in self._hojas.values()}
+        for pedido in body.get("requests", []):
+            r = pedido["deleteDimension"]["range"]; hoja = por_id[r["sheetId"]]
+            with hoja._lock: del hoja._filas[r["startIndex"]:r["endIndex"]]
+        return {"spreadsheetId": "falso", "replies": [{} for _ in body.get("requests", [])]}
+
+
+# =========================================================
+# DATOS SINTÉTICOS
+# =========================================================
+NOMBRES = ["Sofía", "Valentina", "Martina", "Lucía", "Catalina", "Julieta", "Camila", "Agustina", "Milagros", "Florencia",
+           "Abril", "Delfina", "Micaela", "Rocío", "Ailén", "Josefina", "Antonella", "Brenda", "Candela", "Paula"]
+APELLIDOS = ["González", "Rodríguez", "Fernández", "López", "Martínez", "Pérez", "Gómez", "Díaz", "Sánchez", "Romero",
+             "Sosa", "Álvarez", "Torres", "Ruiz", "Ramírez", "Flores", "Acosta", "Benítez", "Medina", "Núñez"]
+RIVALES = ["Lomas", "San Martín", "Banco Nación", "Ciudad", "Quilmes", "GEBA", "Belgrano", "Vélez", "Arquitectura", "Olivos"]
+POSICIONES = ["Arquera", "Defensora", "Volante", "Delantera"]
+
+
+def generar_datos(n_jugadoras=40, temporadas=1, anio_final=None, semilla=0):
+    """Devuelve {hoja: filas} con N jugadoras y M temporadas (marzo-noviembre) de asistencia, evaluaciones y partidos."""
+    rnd = random.Random(semilla)
+    anio_final = anio_final or date.today().year
+    jugadoras = [CABECERAS["jugadoras"]]
+    for i in range(n_jugadoras):
+        pos = "Arquera" if i % 16 == 0 else rnd.choice(POSICIONES[1:])
+        nac = date(anio_final - rnd.randint(15, 30), rnd.randint(1, 12), rnd.randint(1, 28))
+        jugadoras.append([str(i + 1), rnd.choice(NOMBRES), f"{rnd.choice(APELLIDOS)}{'' if i < len(APELLIDOS) else i}",
+                          str(30000000 + i * 7919), nac.strftime("%d/%m/%Y"), pos, f"11{rnd.randint(10**7, 10**8 - 1)}", "SI", str(i + 1)])
+    dnis = [f[3] for f in jugadoras[1:]]
+    nombres = [f"{f[1]} {f[2]}" for f in jugadoras[1:]]
+    asistencia = [CABECERAS["asistencia"]]; habilidades = [CABECERAS["habilidades"]]
+    partidos = []; fixture = [CABECERAS["fixture"]]
+    for anio in range(anio_final - temporadas + 1, anio_final + 1):
+        d = date(anio, 3, 1)
+        while d <= date(anio, 11, 30):
+            f_str = d.strftime("%d/%m/%Y")
+            if d.weekday() in (1, 3):  # martes y jueves: entrenamiento
+                if rnd.random() < 0.05:
+                    asistencia.extend([f_str, dni, "-", "Suspendido", "Lluvia" if k == 0 else ""] for k, dni in enumerate(dnis))
+                else:
+                    asistencia.extend([f_str, dni, "SI" if rnd.random() < 0.8 else "NO", "Entrenamiento", ""] for dni in dnis)
+            elif d.weekday() == 5:  # sábado: partido
+                rival = rnd.choice(RIVALES); cond = rnd.choice(["Local", "Visitante"])
+                fixture.append([f_str, rival, cond, ""])
+                asistencia.extend([f_str, dni, "SI" if rnd.random() < 0.9 else "NO", "Partido", ""] for dni in dnis)
+                gf = rnd.randint(0, 5)
+                goles = Counter(rnd.choice(nombres) for _ in range(gf))
+                partidos.append([f_str, rival, cond, str(gf), str(rnd.randint(0, 4)), str(rnd.randint(0, 8)), str(rnd.randint(0, 8)),
+                                 ", ".join(f"{n} ({c})" for n, c in goles.items())])
+            d += timedelta(days=1)
+        for mes in range(3, 12):
+            f_str = date(anio, mes, 1).strftime("%d/%m/%Y")
+            habilidades.extend([f_str, dni] + [str(rnd.randint(3, 10)) for _ in range(7)] + ["Obs"] for dni in dnis)
+    return {"jugadoras": jugadoras, "asistencia": asistencia, "habilidades": habilidades, "partidos": partidos, "fixture": fixture}
+
+
+def generar_libro(n_jugadoras=40, temporadas=1, latencia=0.0, jitter=0.0, semilla=0, anio_final=None):
+    return LibroFalso(generar_datos(n_jugadoras, temporadas, anio_final, semilla), latencia=latencia, jitter=jitter, semilla=semilla)
@@ -0,0 +1,170 @@
+# --- LECTURA EN LOTE DE HOJAS ---
+# Varias hojas (o rangos) en una sola llamada a la API con values_batch_get.
+import hashlib
+import threading
+import time
+
+from cambios import aplicar
+
+HOJAS = ("jugadoras", "asistencia", "habilidades", "partidos", "fixture")
+
+
+def huella(*partes):
+    # Estable entre procesos (repr de listas de textos), a diferencia de hash(): clave de los reportes precalculados
+    return hashlib.blake2b(repr(partes).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def rango_hoja(titulo, fila_ini=None, fila_fin=None, col_fin="Z"):
+    if fila_ini is None: return f"'{titulo}'"
+    return f"'{titulo}'!A{fila_ini}:{col_fin}{fila_fin}"
+
+
+def leer_rangos(sh, rangos):
+    # La API recorta las celdas vacías del final: rellenamos como get_all_values (filas rectangulares)
+    resp = sh.values_batch_get(list(rangos))
+    salida = []
+    for vr in resp.get("valueRanges", []):
+        filas = vr.get("values", [])
+        ancho = max((len(f) for f in filas), default=0)
+        # FORMATTED_VALUE (lo default) ya viene como texto: solo se completan las filas cortas
+        salida.append([f + [""] * (ancho - len(f)) if len(f) < ancho else f for f in filas])
+    return salida
+
+
+def leer_hojas(sh, titulos):
+    return dict(zip(titulos, leer_rangos(sh, [rango_hoja(t) for t in titulos])))
+
+
+# =========================================================
+# LECTURA POR NAVEGACIÓN
+# =========================================================
+VIGENCIA_ANTICIPADA = 60  # segundos que una hoja bajada de antemano (anticipar.py) sirve para la vista siguiente
+ESCRITURAS = {"append_row", "append_rows", "insert_row", "insert_rows", "delete_rows", "update", "batch_update", "clear", "batch_clear"}
+
+
+class Lectura:
+    """Memo de lecturas de una navegación.
+
+    Al entrar a una vista, las hojas que declara bajan juntas en un solo values_batch_get; las lecturas
+    siguientes de esas hojas (al armar la vista o desde sus botones) salen de memoria hasta la próxima
+    navegación. Cualquier escritura por HojaLeida descarta la copia de esa hoja.
+    Con un almacén compartido (almacen_local.py) las fotos vigentes de otros workers se usan sin ir a la API.
+    Las hojas anticipadas (anticipar.py, bajadas en segundo plano mientras la vista está quieta) entran
+    a la navegación siguiente sin llamada si tienen menos de VIGENCIA_ANTICIPADA segundos.
+    """
+
+    def __init__(self, sh, almacen=None):
+        self.sh = sh; self.almacen = almacen; self._datos = {}; self._cargadas = {}
+        # titulo -> (momento de la lectura, filas). 'generacion' descarta lo que bajó mientras alguien escribía
+        self._anticipadas = {}; self._generacion = {}; self._lock = threading.Lock()
+        self._huellas = {}  # titulo -> (filas, huella): se recalcula solo cuando cambia la lista
+
+    def nueva(self, titulos=()):
+        ahora = time.monotonic()
+        with self._lock:
+            listas = {t: v for t, v in self._anticipadas.items() if t in titulos and ahora - v[0] < VIGENCIA_ANTICIPADA}
+            self._anticipadas = {}
+        self._datos = {t: f for t, (_, f) in listas.items()}; self._cargadas = {t: c for t, (c, _) in listas.items()}
+        self.precargar(titulos)
+
+    def _bajar(self, titulos):
+        # {titulo: filas}: primero las fotos del almacén compartido, el resto en un values_batch_get
+        res = {}; pendientes = list(titulos)
+        if self.almacen is None: return leer_hojas(self.sh, pendientes)
+        for t in list(pendientes):
+            filas = self.almacen.foto(t)
+            if filas is not None: res[t] = filas; pendientes.remove(t)
+        if not pendientes: return res
+        versiones = self.almacen.versiones(pendientes)
+        for t, filas in leer_hojas(self.sh, pendientes).items():
+            res[t] = filas; self.almacen.guardar_foto(t, filas, versiones[t])
+        return res
+
+    def precargar(self, titulos):
+        pendientes = [t for t in dict.fromkeys(titulos) if t not in self._datos]
+        if not pendientes: return
+        ahora = time.monotonic()
+        for t, filas in self._bajar(pendientes).items(): self._datos[t] = filas; self._cargadas[t] = ahora
+
+    def anticipar(self, titulos, presupuesto=None):
+        """Deja listas para la próxima navegación las hojas 'titulos' (desde una hebra aparte).
+
+        Las que esta navegación ya tiene frescas se pasan tal cual; las demás bajan juntas en una sola
+        llamada si 'presupuesto' (anticipar.Presupuesto) la permite. Devuelve los títulos que quedaron listos.
+        """
+        ahora = time.monotonic(); listas = {}; faltan = []
+        with self._lock:
+            generacion = dict(self._generacion)
+            hechas = {t for t, (c, _) in self._anticipadas.items() if ahora - c < VIGENCIA_ANTICIPADA}
+        for t in dict.fromkeys(titulos):
+            if t in hechas: continue
+            datos = self._datos.get(t); cargada = self._cargadas.get(t, 0)
+            if datos is not None and ahora - cargada < VIGENCIA_ANTICIPADA: listas[t] = (cargada, datos)
+            else: faltan.append(t)
+        if faltan and (presupuesto is None or presupuesto.tomar()):
+            listas.update((t, (ahora, f)) for t, f in self._bajar(faltan).items())
+        with self._lock:
+            for t, v in listas.items():
+                if self._generacion.get(t, 0) == generacion.get(t, 0): self._anticipadas[t] = v
+            return [t for t in listas if t in self._anticipadas]
+
+    def filas(self, ws):
+        if ws.title not in self._datos: self.precargar([ws.title])
+        return self._datos[ws.title]
+
+    def huella(self, ws):
+        # Cada carga, relectura o cambio aplicado reemplaza la lista entera (nunca se modifica en el lugar):
+        # mientras sea la misma, su huella también. Así un reporte ya hecho no recorre la hoja en cada pedido.
+        filas = self.filas(ws); previa = self._huellas.get(ws.title)
+        if previa is None or previa[0] is not filas: previa = self._huellas[ws.title] = (filas, huella(filas))
+        return previa[1]
+
+    def guardar(self, titulo, filas): self._datos[titulo] = filas; self._cargadas[titulo] = time.monotonic()
+
+    def invalidar(self, titulo):
+        self._datos.pop(titulo, None)
+        with self._lock:
+            self._anticipadas.pop(titulo, None); self._generacion[titulo] = self._generacion.get(titulo, 0) + 1
+        if self.almacen is not None: self.almacen.invalidar(titulo)
+
+    def aplicar(self, cambio):
+        # Cambio publicado por otra sesión: se aplica a la copia en memoria en vez de volver a leer
+        datos = self._datos.get(cambio.hoja)
+        if datos is not None: self._datos[cambio.hoja] = aplicar(datos, cambio)
+        with self._lock:
+            previa = self._anticipadas.get(cambio.hoja)
+            if previa is not None: self._anticipadas[cambio.hoja] = (previa[0], aplicar(previa[1], cambio))
+            # una bajada en curso puede haber leído antes del cambio: se descarta
+            self._generacion[cambio.hoja] = self._generacion.get(cambio.hoja, 0) + 1
+
+    def hoja(self, ws): return HojaLeida(ws, self)
+
+
+class HojaLeida:
+    """Envuelve una hoja (gspread o HojaMedida): get_all_values sale del memo de la navegación."""
+
+    def __init__(self, ws, lectura):
+        self._ws = ws; self._lectura = lectura
+
+    def get_all_values(self):
+        return self._lectura.filas(self._ws)
+
+    def huella(self):
+        return self._lectura.huella(self._ws)
+
+    def releer(self):
+        # Lectura fresca (para leer-modificar-escribir): no confía en la copia de la navegación
+        filas = self._ws.get_all_values(); self._lectura.guardar(self._ws.title, filas)
+        return filas
+
+    def __getattr__(self, nombre):
+        attr = getattr(self._ws, nombre)
+        if nombre in ESCRITURAS and callable(attr):
+            def escribir(*a, **k):
+                # Antes (nadie de esta navegación usa la copia vieja) y después: una lectura de otro worker
+                # entre las dos pudo guardar en el almacén la foto previa con la versión ya subida
+                self._lectura.invalidar(self._ws.title)
+                try: return attr(*a, **k)
+                finally: self._lectura.invalidar(self._ws.title)
+            return escribir
+        return attr
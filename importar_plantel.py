@@ -0,0 +1,176 @@
+# --- IMPORTACIÓN DE PLANTEL ---
+# Alta/edición masiva de jugadoras desde un CSV o XLSX (la primera fila son los encabezados).
+# Se lee y valida todo de una pasada (DNI único, fecha de nacimiento, posición, camiseta, activo) y lo que
+# queda se escribe con un solo batch_update: las que ya estaban (mismo DNI) se pisan en su fila, las nuevas
+# van a continuación. El plantel compartido toma el resultado en una versión nueva, sin volver a leer la hoja.
+# En una edición, las celdas vacías del archivo (o las columnas que no trae) conservan lo que ya había.
+import csv
+import re
+from datetime import date, datetime
+
+from buscador import normalizar
+from cambios import Cambio
+from escrituras import COORDINADOR
+from plantel import CAMPOS, PLANTEL, POSICIONES, Jugadora
+
+EXTENSIONES = ("csv", "xlsx")
+COL_DNI = CAMPOS.index("dni") + 1
+
+# encabezado (sin acentos, mayúsculas ni signos) -> campo de la hoja
+ALIAS = {"id": "id", "nombre": "nombre", "nombres": "nombre", "apellido": "apellido", "apellidos": "apellido",
+         "dni": "dni", "documento": "dni", "nacimiento": "nacimiento", "fecha de nacimiento": "nacimiento",
+         "fecha nacimiento": "nacimiento", "posicion": "posicion", "puesto": "posicion", "telefono": "telefono",
+         "celular": "telefono", "activo": "activo", "activa": "activo", "camiseta": "camiseta", "n camiseta": "camiseta",
+         "nro camiseta": "camiseta", "numero": "camiseta"}
+SI = {"si", "s", "x", "1", "true", "activa", "activo"}; NO = {"no", "n", "0", "false", "inactiva", "inactivo", "baja"}
+
+
+def _celda(v):
+    # XLSX trae números y fechas con tipo: 30123456.0 -> "30123456", datetime -> "dd/mm/aaaa"
+    if v is None: return ""
+    if isinstance(v, (datetime, date)): return v.strftime("%d/%m/%Y")
+    if isinstance(v, float) and v.is_integer(): return str(int(v))
+    return str(v).strip()
+
+
+def leer_archivo(ruta):
+    ext = ruta.rsplit(".", 1)[-1].lower()
+    if ext == "xlsx":
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("Para importar XLSX falta openpyxl (pip install openpyxl); probá con CSV")
+        wb = load_workbook(ruta, read_only=True, data_only=True)
+        try: return [[_celda(v) for v in f] for f in wb.worksheets[0].iter_rows(values_only=True)]
+        finally: wb.close()
+    if ext != "csv": raise ValueError(f"Formato no soportado: .{ext} (usá {' o '.join(EXTENSIONES)})")
+    with open(ruta, newline="", encoding="utf-8-sig") as f:
+        muestra = f.read(4096); f.seek(0)
+        try: dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error: dialecto = csv.excel
+        return [[_celda(v) for v in f] for f in csv.reader(f, dialecto)]
+
+
+def _columnas(encabezados):
+    # {índice de columna del archivo: campo}
+    res = {}
+    for i, h in enumerate(encabezados):
+        campo = ALIAS.get(" ".join(re.sub(r"[^a-z0-9 ]", " ", normalizar(h).replace(".", "")).split()))
+        if campo and campo not in res.values(): res[i] = campo
+    return res
+
+
+def _fecha(txt):
+    # dd/mm/aaaa, dd-mm-aaaa o aaaa-mm-dd -> "dd/mm/aaaa"; None si no es una fecha válida
+    m = re.fullmatch(r"(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})", txt)
+    if m: d, mes, a = m.groups()
+    else:
+        m = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T].*)?", txt)
+        if not m: return None
+        a, mes, d = m.groups()
+    try: f = date(int(a), int(mes), int(d))
+    except ValueError: return None
+    return f.strftime("%d/%m/%Y") if 1900 <= f.year <= date.today().year else None
+
+
+def _posicion(txt):
+    n = normalizar(txt)
+    # "defensor", "Volante", "DELANTERA" -> la opción del formulario
+    return next((p for p in POSICIONES if n.startswith(normalizar(p)[:-1])), None)
+
+
+def validar(filas):
+    """Valida las filas del archivo (filas[0] = encabezados) de una pasada.
+
+    Devuelve (registros, errores): registros = [(línea, {campo: valor})] listos para escribir,
+    errores = [(línea, motivo)]. Un DNI repetido en el archivo descarta todas sus filas.
+    """
+    if not filas: return [], [(1, "El archivo está vacío")]
+    cols = _columnas(filas[0])
+    if "dni" not in cols.values(): return [], [(1, "Falta la columna DNI")]
+    registros = []; errores = []; lineas_dni = {}
+    for n, fila in enumerate(filas[1:], start=2):
+        if not any(fila): continue
+        reg = {campo: fila[i] if i < len(fila) else "" for i, campo in cols.items()}
+        malos = []
+        dni = reg["dni"].replace(".", "").replace(" ", "")
+        if not dni.isdigit(): malos.append(f"DNI inválido '{reg['dni']}'")
+        reg["dni"] = dni
+        if reg.get("nacimiento"):
+            f = _fecha(reg["nacimiento"])
+            if f is None: malos.append(f"nacimiento '{reg['nacimiento']}' no es DD/MM/AAAA")
+            reg["nacimiento"] = f
+        if reg.get("posicion"):
+            p = _posicion(reg["posicion"])
+            if p is None: malos.append(f"posición '{reg['posicion']}' no es {'/'.join(POSICIONES)}")
+            reg["posicion"] = p
+        if reg.get("camiseta") and not reg["camiseta"].isdigit(): malos.append(f"camiseta '{reg['camiseta']}' no es un número")
+        if reg.get("activo"):
+            a = normalizar(reg["activo"]).strip()
+            if a in SI: reg["activo"] = "SI"
+            elif a in NO: reg["activo"] = "NO"
+            else: malos.append(f"activo '{reg['activo']}' no es SI/NO")
+        if malos: errores.append((n, "; ".join(malos))); continue
+        lineas_dni.setdefault(dni, []).append(n); registros.append((n, reg))
+    repetidos = {d: ls for d, ls in lineas_dni.items() if len(ls) > 1}
+    for d, ls in repetidos.items(): errores.append((ls[0], f"DNI {d} repetido en las líneas {', '.join(map(str, ls))}"))
+    registros = [(n, r) for n, r in registros if r["dni"] not in repetidos]
+    return registros, sorted(errores)
+
+
+def planificar(registros, jugadoras):
+    """Cruza los registros con el plantel actual por DNI: ([(jugadora anterior, fila nueva)], [filas de alta], errores)."""
+    por_dni = {str(j.dni): j for j in jugadoras}
+    ediciones = []; altas = []; errores = []
+    for n, reg in registros:
+        previa = por_dni.get(reg["dni"])
+        if previa is not None:
+            fila = [reg.get(c) or previa[c] for c in CAMPOS]; fila[CAMPOS.index("id")] = previa.id
+            if fila != list(previa): ediciones.append((previa, fila))
+            continue
+        if not reg.get("nombre") or not reg.get("apellido"): errores.append((n, "Falta nombre o apellido")); continue
+        fila = [reg.get(c) or "" for c in CAMPOS]; fila[CAMPOS.index("id")] = ""
+        fila[CAMPOS.index("activo")] = reg.get("activo") or "SI"
+        altas.append(fila)
+    return ediciones, altas, errores
+
+
+def escribir(ws, ediciones, altas):
+    """Un solo batch_update con las ediciones (en su fila) y las altas (a continuación). Devuelve los Cambio a publicar.
+
+    Las filas se ubican con una lectura fresca de la hoja, tomada en exclusiva: entre esa lectura y la
+    escritura ninguna otra sesión agrega ni mueve filas. Es la hoja entera y no la columna DNI porque la API
+    recorta las celdas vacías del final: una fila de abajo sin DNI quedaría pisada por las altas.
+    El plan se armó con el plantel de antes del cerrojo: un alta cuyo DNI ya está en la hoja (otra sesión la
+    cargó mientras tanto) pasa a ser una edición de esa fila.
+    """
+    if not ediciones and not altas: return []
+    col_fin = chr(ord("A") + len(CAMPOS) - 1)
+    with COORDINADOR.exclusiva("jugadoras"):
+        filas = getattr(ws, "releer", ws.get_all_values)()
+        fila_de = {str(f[COL_DNI - 1]): i + 1 for i, f in enumerate(filas) if len(f) >= COL_DNI and f[COL_DNI - 1]}
+        ediciones = list(ediciones); nuevas = []
+        for fila in altas:
+            i = fila_de.get(str(fila[COL_DNI - 1]))
+            if i is None: nuevas.append(fila); continue
+            previa = Jugadora.desde_fila(filas[i - 1])
+            fila = [v or p for v, p in zip(fila, previa)]; fila[CAMPOS.index("id")] = previa.id
+            ediciones.append((previa, fila))
+        altas = list(nuevas); datos = []; cambios = []; reescritas = []
+        for previa, fila in ediciones:
+            i = fila_de.get(str(previa.dni))
+            if i is None: reescritas.append((previa, fila)); nuevas.append(fila); continue  # la borraron a mano en Sheets
+            datos.append({"range": f"A{i}:{col_fin}{i}", "values": [fila]})
+            cambios.append(Cambio("jugadoras", "actualizar", fila=i, filas=[fila], valor=str(previa.dni)))
+        if nuevas:
+            desde = len(filas) + 1; hasta = desde + len(nuevas) - 1
+            datos.append({"range": f"A{desde}:{col_fin}{hasta}", "values": nuevas})
+            if altas: cambios.append(Cambio("jugadoras", "agregar", filas=altas))
+            # Las que se reescriben al final siguen en las copias de las demás sesiones: se reemplazan por DNI
+            cambios += [Cambio("jugadoras", "reemplazar", filas=[f], col=COL_DNI - 1, valor=str(p.dni)) for p, f in reescritas]
+            # La API no escribe fuera de la grilla: si no entran, se agregan filas antes (una llamada más)
+            tope = getattr(ws, "row_count", None)
+            if tope and hasta > tope: ws.add_rows(hasta - tope)
+        ws.batch_update(datos)
+        PLANTEL.importar({str(p.dni): Jugadora.desde_fila(f) for p, f in ediciones}, [Jugadora.desde_fila(f) for f in altas])
+    return cambios
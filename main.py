@@ -1,14 +1,35 @@
 import flet as ft
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from datetime import datetime
 import os
 import calendar
 import re
 import platform
 import base64
+import io
+from types import SimpleNamespace
+from functools import lru_cache
 import time
+import asyncio
 import tracemalloc
+import logging
+import metricas
+import pdf_motor
+from hojas import Lectura, huella
+import cambios
+from cambios import Cambio
+from escrituras import COORDINADOR, buscar_fila, ubicar_fila
+from almacen_local import ALMACEN
+from plantel import PLANTEL, POSICIONES, Jugadora
+from buscador import LIMITE_OPCIONES
+import formacion
+import asistencia_bits
+import importar_plantel
+import partido_vivo
+import tendencias
+from tendencias import TENDENCIAS
+from anticipar import Anticipador
+from programador import PRECALCULADOS, Programador
+from formacion import Disponibilidad
 
 # --- INICIO DE RASTREO DE MEMORIA ---
 tracemalloc.start()
@@ -19,6 +40,9 @@ try:
     TIENE_PDF = True
 except ImportError:
     TIENE_PDF = False
+# Con una TTF Unicode disponible (assets/fuentes o del sistema) los PDFs la usan como "Arial".
+# PDF_UNICODE=0 vuelve a la Arial core (PDFs más chicos y rápidos, pero solo latin-1)
+UNICODE_PDF = TIENE_PDF and os.environ.get("PDF_UNICODE", "1") != "0" and pdf_motor.FUENTE.activa()
 
 # --- COLORES ---
 C_AZUL = "#2196F3"
@@ -34,15 +58,21 @@ C_TEXTO = "#212121"
 C_GRIS_TXT = "#757575"
 C_ROSITA = "#FFC0CB"
 
-# --- 1. CONEXIÓN ---
-def conectar_google_sheets():
-    scope = ["https://spreadsheets.google.com/feeds", 'https://www.googleapis.com/auth/spreadsheets',
-             "https://www.googleapis.com/auth/drive.file", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-    client = gspread.authorize(creds)
-    return client.open("HockeyApp_DB") 
+# --- BÚSQUEDA ---
+LIMITE_LISTA = 100  # tarjetas de "Mi Plantel" dibujadas como máximo
+# En modo web los archivos a importar suben acá antes de leerse (ft.app(upload_dir=...), requiere FLET_SECRET_KEY)
+DIR_SUBIDAS = "subidas"
 
-def main(page: ft.Page):
+# --- 1. CONEXIÓN (conexion.py) ---
+from conexion import conectar_google_sheets
+
+@lru_cache(maxsize=4096)
+def parse_fecha(txt):
+    # Las fechas se repiten una vez por jugadora en 'asistencia': parsear cada una una sola vez
+    return datetime.strptime(txt, "%d/%m/%Y")
+
+def main(page: ft.Page, pantalla=True):
+    # pantalla=False (programador.py / cli.py): solo la sesión y sus reportes, sin armar la interfaz
     # --- CONFIGURACIÓN DE ASSETS ---
     page.assets_dir = "assets"
     # Aseguramos que la carpeta exista (por si el truco de git falla)
@@ -94,20 +124,34 @@ def main(page: ft.Page):
     # --- CARGA DE DATOS ---
     try:
         sh = conectar_google_sheets()
-        ws_jugadoras = sh.worksheet("jugadoras")
-        ws_habilidades = sh.worksheet("habilidades")
-        ws_asistencia = sh.worksheet("asistencia")
-        ws_partidos = sh.worksheet("partidos")
-        try: ws_fixture = sh.worksheet("fixture")
+        # Las lecturas pasan por el memo de la navegación (hojas.Lectura); las escrituras lo invalidan
+        lectura = Lectura(sh, ALMACEN)
+        ws_jugadoras = lectura.hoja(sh.worksheet("jugadoras"))
+        ws_habilidades = lectura.hoja(sh.worksheet("habilidades"))
+        ws_asistencia = lectura.hoja(sh.worksheet("asistencia"))
+        ws_partidos = lectura.hoja(sh.worksheet("partidos"))
+        try: ws_fixture = lectura.hoja(sh.worksheet("fixture"))
         except: ws_fixture = None
         
-        raw_data = ws_jugadoras.get_all_values()
-        lista_jugadoras_raw = []
-        if len(raw_data) > 1:
-            for row in raw_data[1:]:
-                row += [""] * (9 - len(row))
-                jug = {"id": row[0], "nombre": row[1], "apellido": row[2], "dni": row[3], "nacimiento": row[4], "posicion": row[5], "telefono": row[6], "activo": row[7], "camiseta": row[8]}
-                if jug["dni"]: lista_jugadoras_raw.append(jug)
+        # El plantel se descarga una vez por proceso y lo comparten todas las sesiones (plantel.py)
+        PLANTEL.asegurar_cargado(ws_jugadoras)
+
+        # --- SINCRONIZACIÓN ENTRE SESIONES (cambios.py) ---
+        oyentes = {}  # hoja -> función de la vista abierta que aplica el cambio a sus controles
+        def al_cambiar(topico, cambio):
+            lectura.aplicar(cambio)
+            fn = oyentes.get(cambio.hoja)
+            if fn:
+                try: fn(cambio)
+                except Exception as ex: logging.getLogger("hockeyapp.cambios").warning("vista no aplicó %s: %s", cambio.hoja, ex)
+        try: page.pubsub.subscribe_topic(cambios.TOPICO, al_cambiar)
+        except Exception: pass
+        # Multi-worker: los cambios de otros procesos llegan por el almacén (una hebra por proceso);
+        # el plantel compartido del proceso se actualiza una sola vez antes de avisar a las sesiones
+        if ALMACEN is not None:
+            try: ALMACEN.relevar(page.pubsub, cambios.TOPICO, lambda c: PLANTEL.aplicar(c) if c.hoja == "jugadoras" else None)
+            except Exception: pass
+        def avisar(cambio): cambios.publicar(page, cambio, ALMACEN)
 
         txt_estado.value = "🟢 Sistema Listo"
     except Exception as e:
@@ -118,7 +162,7 @@ def main(page: ft.Page):
     # --- HELPERS ---
     MAPA_MESES = {"Enero":1,"Febrero":2,"Marzo":3,"Abril":4,"Mayo":5,"Junio":6,"Julio":7,"Agosto":8,"Septiembre":9,"Octubre":10,"Noviembre":11,"Diciembre":12}
     LISTA_MESES = list(MAPA_MESES.keys())
-    TITULOS_SKILLS = ["Push", "Dribbling", "Flick", "Pegada", "Barrida", "Físico", "Quites"]
+    TITULOS_SKILLS = list(tendencias.HABILIDADES)
     DIAS_ESP = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
     LETRAS_DIAS = ["L", "M", "M", "J", "V", "S", "D"]
 
@@ -137,9 +181,18 @@ def main(page: ft.Page):
 
     def clean_latin(t):
         if not t: return ""
+        if UNICODE_PDF: return str(t)  # con la TTF embebida no hace falta recodificar
         try: return str(t).encode('latin-1', 'replace').decode('latin-1')
         except: return str(t)
 
+    def titulo_tendencia(nombre):
+        # Mismo título en la vista y en la ficha: comparten el PNG del caché (tendencias.grafico)
+        return f"{nombre} · media móvil de {tendencias.VENTANA} meses"
+
+    def nuevo_pdf(*args):
+        # FPDF con la TTF Unicode registrada como "Arial" (pdf_motor.FUENTE); sin TTF queda la Arial core
+        return pdf_motor.FUENTE.documento(*args) if UNICODE_PDF else FPDF(*args)
+
     # =========================================================
     # NAVEGACIÓN OPTIMIZADA (AQUÍ ESTÁ EL TRUCO)
     # =========================================================
@@ -169,28 +222,24 @@ def main(page: ft.Page):
         # Pequeña pausa para asegurar que el renderizado visual ocurra antes del bloqueo
         time.sleep(0.05)
 
-        # 2. AHORA SÍ, CARGAMOS LA VISTA PESADA
+        # 2. AHORA SÍ, CARGAMOS LA VISTA PESADA (medimos el tiempo de armado)
         columna_contenido.controls.clear()
         
-        if destino == "asis": columna_contenido.controls.append(vista_asistencia())
-        elif destino == "stats": columna_contenido.controls.append(vista_estadisticas_asistencia()) 
-        elif destino == "eval": columna_contenido.controls.append(vista_evaluacion())
-        elif destino == "part": columna_contenido.controls.append(vista_partidos())
-        elif destino == "resumen_partidos": columna_contenido.controls.append(vista_resumen_partidos())
-        elif destino == "plantel": columna_contenido.controls.append(vista_plantel())
-        elif destino == "ficha": columna_contenido.controls.append(vista_reporte_completo())
-        elif destino == "fixture_full": columna_contenido.controls.append(vista_gestion_fixture())
-        elif destino == "formacion": columna_contenido.controls.append(vista_formacion()) 
+        if destino in VISTAS:
+            anticipador.cancelar()
+            with metricas.medir("vista", destino): columna_contenido.controls.append(VISTAS[destino]())
+            anticipador.programar(destino)  # mientras mira esta vista se bajan las hojas de las siguientes
         
         page.update()
 
     # =========================================================
     # PDF FORMACIÓN
     # =========================================================
+    @metricas.medir_reporte("formacion")
     def generar_pdf_formacion(partido_str, esquema_str, titulares_dict, ausentes_list, suplentes_list, categoria):
         if not TIENE_PDF: return False, "Falta fpdf", None
         try:
-            pdf = FPDF('L', 'mm', 'A4')
+            pdf = nuevo_pdf('L', 'mm', 'A4')
             pdf.set_auto_page_break(auto=False)
             pdf.add_page()
             
@@ -207,33 +256,9 @@ def main(page: ft.Page):
             pdf.set_font("Arial", 'I', 8); pdf.set_text_color(150)
             pdf.cell(0, 10, f"Planilla generada el: {datetime.now().strftime('%d/%m/%Y %H:%M')}", 0, 0, 'R')
 
-            # CANCHA
-            x_c, y_c, w_c, h_c = 15, 30, 267, 130 
-            pdf.set_fill_color(255, 152, 0); pdf.rect(x_c + (w_c * 0.55), y_c - 8, 30, 6, 'F') 
-            pdf.set_fill_color(33, 150, 243); pdf.rect(x_c + (w_c * 0.35), y_c - 8, 30, 6, 'F') 
-            pdf.set_fill_color(67, 160, 71); pdf.rect(x_c, y_c, w_c, h_c, 'F') 
-            pdf.set_draw_color(255, 255, 255); pdf.set_line_width(0.6); pdf.rect(x_c, y_c, w_c, h_c) 
-            pdf.line(x_c + w_c/2, y_c, x_c + w_c/2, y_c + h_c) 
-            pdf.line(x_c + (w_c * 0.25), y_c, x_c + (w_c * 0.25), y_c + h_c) 
-            pdf.line(x_c + (w_c * 0.75), y_c, x_c + (w_c * 0.75), y_c + h_c) 
-            pdf.set_fill_color(255, 255, 255); pdf.ellipse(x_c + w_c/2 - 1.5, y_c + h_c/2 - 1.5, 3, 3, 'F')
-
-            # Areas
-            r_solid = 45; r_dash = 60 
-            pdf.set_draw_color(255, 255, 255); pdf.set_line_width(0.7)
-            pdf.ellipse(x_c - r_solid/2, y_c + h_c/2 - r_solid/2, r_solid, r_solid, 'D')
-            pdf.ellipse(x_c + w_c - r_solid/2, y_c + h_c/2 - r_solid/2, r_solid, r_solid, 'D')
-            pdf.set_line_width(0.8)
-            for ang in range(-90, 91, 8):
-                pdf.ellipse(x_c - r_dash/2, y_c + h_c/2 - r_dash/2, r_dash, r_dash, 'D')
-                pdf.ellipse(x_c + w_c - r_dash/2, y_c + h_c/2 - r_dash/2, r_dash, r_dash, 'D')
-            pdf.set_fill_color(255, 255, 255); pdf.set_draw_color(255, 255, 255)
-            pdf.rect(0, y_c, x_c-0.1, h_c, 'F'); pdf.rect(x_c + w_c + 0.1, y_c, 30, h_c, 'F')
-            pdf.set_draw_color(255, 255, 255); pdf.set_line_width(0.6); pdf.rect(x_c, y_c, w_c, h_c, 'D')
-            pdf.set_fill_color(130, 130, 130)
-            pdf.rect(x_c - 3, y_c + h_c/2 - 6, 3, 12, 'F'); pdf.rect(x_c + w_c, y_c + h_c/2 - 6, 3, 12, 'F') 
-            pdf.set_draw_color(255, 182, 193); pdf.set_line_width(1.5)
-            pdf.rect(x_c - 0.5, y_c - 0.5, w_c + 1, h_c + 1, 'D')
+            # CANCHA (plantilla: se dibuja una vez por proceso y se reinserta, ver pdf_motor.py)
+            x_c, y_c, w_c, h_c = pdf_motor.CANCHA_X, pdf_motor.CANCHA_Y, pdf_motor.CANCHA_W, pdf_motor.CANCHA_H
+            pdf_motor.CANCHA.aplicar(pdf)
 
             coords = {
                 "Arquera (1)": (0.05, 0.5), "Libero (2)": (0.15, 0.5), "Stopper (6)": (0.22, 0.5),
@@ -264,11 +289,11 @@ def main(page: ft.Page):
             pdf.set_xy(x_c, y_inf); pdf.set_font("Arial", 'B', 10); pdf.set_text_color(0); pdf.cell(0, 5, "SUPLENTES:", ln=1)
             pdf.set_font("Arial", '', 9)
             txt_s = [f"{i+1}. {clean_latin(s)}" for i, s in enumerate(suplentes_list)]
-            pdf.multi_cell(w_c, 4, "   |   ".join(txt_s) if txt_s else "-")
+            for linea in pdf_motor.renglones(pdf, txt_s, w_c): pdf.cell(w_c, 4, linea, ln=1)
             
             pdf.ln(1); pdf.set_font("Arial", 'B', 10); pdf.set_text_color(200, 0, 0); pdf.cell(0, 5, "AUSENTES:", ln=1)
             pdf.set_font("Arial", '', 9); txt_a = [f"{clean_latin(a['nombre'])} ({clean_latin(a['motivo'])})" if a['motivo'] else clean_latin(a['nombre']) for a in ausentes_list]
-            pdf.multi_cell(w_c, 4, "   |   ".join(txt_a) if txt_a else "-")
+            for linea in pdf_motor.renglones(pdf, txt_a, w_c): pdf.cell(w_c, 4, linea, ln=1)
             
             # --- GUARDADO EN ASSETS ---
             ts = int(time.time())
@@ -289,65 +314,102 @@ def main(page: ft.Page):
             except: pass
 
         dd_partido = ft.Dropdown(label="Partido", options=[ft.dropdown.Option(p) for p in partidos_disp], expand=True)
-        dd_esquema = ft.Dropdown(label="Esquema", options=[ft.dropdown.Option("Doble 5"), ft.dropdown.Option("3-3-1-3"), ft.dropdown.Option("4-3-3")], value="Doble 5", width=120)
+        dd_esquema = ft.Dropdown(label="Esquema", options=[ft.dropdown.Option(x) for x in formacion.ESQUEMAS], value="Doble 5", width=120)
         
-        LINEAS = {
-            "ARCO": ["Arquera (1)"], "DEFENSA": ["Libero (2)", "Stopper (6)", "Half Der. (4)", "Half Izq. (3)"],
-            "MEDIO": ["Volante Central (5)", "Volante Der. (8)", "Volante Izq. (10)"], "ATAQUE": ["Delantera Centro (9)", "Wing Der. (7)", "Wing Izq. (11)"]
-        }
+        LINEAS = formacion.LINEAS
         dropdowns_refs = {}
         lista_ausentes_data = []
+        disp = Disponibilidad(f"{j['nombre']} {j['apellido']}" for j in PLANTEL.actual())
+        enviadas = {}  # desplegable -> últimas opciones mandadas al navegador
+
+        def coincidencias():
+            # Nombres que matchean el filtro (None = sin filtro)
+            q = txt_filtro.value or ""
+            if not q.strip(): return None
+            return {f"{j['nombre']} {j['apellido']}" for j in PLANTEL.indice().buscar(q, limite=None)}
 
-        def obtener_libres():
-            seleccionadas = {dd.value for dd in dropdowns_refs.values() if dd.value}
-            ausentes = {a['nombre'] for a in lista_ausentes_data}
-            return sorted([f"{j['nombre']} {j['apellido']}" for j in lista_jugadoras_raw 
-                    if f"{j['nombre']} {j['apellido']}" not in seleccionadas and f"{j['nombre']} {j['apellido']}" not in ausentes])
+        def sincronizar(forzar=False, actualizar=True):
+            # Solo se reescriben los desplegables cuyas opciones cambiaron, y todo sale en un único page.update()
+            filtro = coincidencias(); cambios = False
+            destinos = [(p, dd, True) for p, dd in dropdowns_refs.items()] + [("_ausente", dd_nueva_ausente, False)]
+            for clave, dd, con_vacio in destinos:
+                nuevas = disp.opciones(filtro, LIMITE_OPCIONES, dd.value or None)
+                if not forzar and enviadas.get(clave) == nuevas: continue
+                enviadas[clave] = nuevas; v = dd.value
+                dd.options = ([ft.dropdown.Option("")] if con_vacio else []) + [ft.dropdown.Option(n) for n in nuevas]
+                dd.value = v; cambios = True
+            suplentes = f"SUPLENTES: {', '.join(disp.libres())}"
+            if txt_suplentes.value != suplentes: txt_suplentes.value = suplentes; cambios = True
+            if cambios and actualizar: page.update()
+
+        def cambio_puesto(puesto, valor):
+            for p in disp.asignar(puesto, valor or None): dropdowns_refs[p].value = None
+            sincronizar()
 
         def refrescar_manual(e=None):
-            for pos, dd in dropdowns_refs.items():
-                if dd.page:
-                    v = dd.value; libres = obtener_libres()
-                    dd.options = [ft.dropdown.Option("")] + [ft.dropdown.Option(n) for n in sorted(list(set(([v] if v else []) + libres)))]
-                    dd.value = v; dd.update()
-            dispo = obtener_libres()
-            if dd_nueva_ausente.page: 
-                dd_nueva_ausente.options = [ft.dropdown.Option(n) for n in dispo]
-                dd_nueva_ausente.update()
-            if txt_suplentes.page:
-                txt_suplentes.value = f"SUPLENTES: {', '.join(dispo)}"
-                txt_suplentes.update()
+            # ACTUALIZAR LISTAS: vuelve a tomar el plantel (puede haber altas) sin perder lo cargado
+            disp.recargar([f"{j['nombre']} {j['apellido']}" for j in PLANTEL.actual()],
+                          {p: dd.value for p, dd in dropdowns_refs.items() if dd.value}, [a['nombre'] for a in lista_ausentes_data])
+            for p, dd in dropdowns_refs.items():
+                if dd.value and disp.asignadas.get(p) != dd.value: dd.value = None
+            sincronizar(forzar=True)
+
+        def actualizar_listas(e=None):
+            # El botón relee la hoja (altas/ediciones hechas a mano en Sheets); los cambios de otras sesiones ya llegan solos
+            try: PLANTEL.recargar(ws_jugadoras)
+            except Exception as ex: txt_estado.value = f"❌ {ex}"
+            refrescar_manual()
+
+        def sugerir_click(e):
+            # Formación óptima para el esquema con las evaluaciones y asistencia recientes; las ausentes no entran
+            try:
+                lectura.precargar(["habilidades", "asistencia"])  # las dos en una sola llamada
+                raw_hab = ws_habilidades.get_all_values(); raw_asist = ws_asistencia.get_all_values()
+            except Exception as ex: txt_estado.value = f"❌ {ex}"; page.update(); return
+            t0 = time.perf_counter()
+            sugerencia = formacion.sugerir(PLANTEL.actual(), dd_esquema.value, raw_hab, raw_asist,
+                                           excluir={a['nombre'] for a in lista_ausentes_data}, n_skills=len(TITULOS_SKILLS))
+            for p, dd in dropdowns_refs.items(): disp.asignar(p, None)
+            for p, dd in dropdowns_refs.items():
+                dd.value = sugerencia.get(p)
+                if dd.value: disp.asignar(p, dd.value)
+            txt_estado.value = f"✨ Sugerencia {dd_esquema.value} ({(time.perf_counter() - t0) * 1000:.0f} ms)"
+            sincronizar(actualizar=False); page.update()
+
+        oyentes["jugadoras"] = lambda c: refrescar_manual()
 
+        txt_filtro = ft.TextField(label="🔍 Filtrar jugadoras (nombre, apellido, DNI, camiseta)", dense=True, on_change=lambda e: sincronizar())
         col_lineas = ft.Column(spacing=15)
-        jugadoras_iniciales = sorted([f"{j['nombre']} {j['apellido']}" for j in lista_jugadoras_raw])
         
         for lin, puestos in LINEAS.items():
             rows_p = ft.Column(spacing=5)
             for p in puestos:
                 dd = ft.Dropdown(label=p, dense=True, text_size=12, expand=True)
-                dd.options = [ft.dropdown.Option("")] + [ft.dropdown.Option(n) for n in jugadoras_iniciales]
-                dd.on_change = refrescar_manual 
+                dd.on_change = lambda e, p=p: cambio_puesto(p, e.control.value)
                 dropdowns_refs[p] = dd
                 rows_p.controls.append(dd)
             col_lineas.controls.append(ft.Container(content=ft.Column([ft.Text(lin, size=11, weight="bold", color=C_GRIS_TXT), rows_p]), padding=10, bgcolor=C_BLANCO, border_radius=8))
 
         dd_nueva_ausente = ft.Dropdown(label="Jugadora Ausente", expand=True)
-        dd_nueva_ausente.options = [ft.dropdown.Option(n) for n in jugadoras_iniciales]
         txt_motivo = ft.TextField(label="Motivo", expand=True)
         col_ausentes = ft.Column()
         txt_suplentes = ft.Text("SUPLENTES: -", color=C_GRIS_TXT, size=11)
-        txt_suplentes.value = f"SUPLENTES: {', '.join(jugadoras_iniciales)}"
+        sincronizar(actualizar=False)
 
         def add_aus(e):
             if dd_nueva_ausente.value:
-                lista_ausentes_data.append({"nombre": dd_nueva_ausente.value, "motivo": txt_motivo.value})
-                dd_nueva_ausente.value = None; txt_motivo.value = ""; render_aus(); refrescar_manual()
+                nombre = dd_nueva_ausente.value
+                lista_ausentes_data.append({"nombre": nombre, "motivo": txt_motivo.value})
+                for p in disp.marcar_ausente(nombre): dropdowns_refs[p].value = None
+                dd_nueva_ausente.value = None; txt_motivo.value = ""; render_aus(); sincronizar(actualizar=False); page.update()
+
+        def quitar_aus(idx):
+            disp.quitar_ausente(lista_ausentes_data.pop(idx)['nombre']); render_aus(); sincronizar(actualizar=False); page.update()
 
         def render_aus():
             col_ausentes.controls.clear()
             for i, a in enumerate(lista_ausentes_data):
-                col_ausentes.controls.append(ft.Row([ft.Text(f"• {a['nombre']}", color=C_ROJO, size=12, expand=True), ft.IconButton(ft.Icons.DELETE, on_click=lambda e, idx=i: (lista_ausentes_data.pop(idx), render_aus(), refrescar_manual()))]))
-            if col_ausentes.page: col_ausentes.update()
+                col_ausentes.controls.append(ft.Row([ft.Text(f"• {a['nombre']}", color=C_ROJO, size=12, expand=True), ft.IconButton(ft.Icons.DELETE, on_click=lambda e, idx=i: quitar_aus(idx))]))
 
         btn_ojo = ft.IconButton(icon=ft.Icons.VISIBILITY, disabled=True, icon_color=C_GRIS_TXT, tooltip="Abrir PDF")
 
@@ -356,7 +418,7 @@ def main(page: ft.Page):
             txt_estado.value = "Generando PDF..."
             page.update()
             tits = {p: dd.value for p, dd in dropdowns_refs.items() if dd.value}
-            ok, res, url_pdf = generar_pdf_formacion(dd_partido.value, dd_esquema.value, tits, lista_ausentes_data, obtener_libres(), categoria_actual[0])
+            ok, res, url_pdf = generar_pdf_formacion(dd_partido.value, dd_esquema.value, tits, lista_ausentes_data, disp.libres(), categoria_actual[0])
             
             if ok:
                 txt_estado.value = "✅ Link Listo. Click en el ojo."
@@ -371,8 +433,9 @@ def main(page: ft.Page):
         return ft.Column([
             ft.Text("Armado de Equipo", size=20, weight="bold", color=C_AZUL),
             ft.Row([dd_partido, dd_esquema]),
-            ft.ElevatedButton("🔄 ACTUALIZAR LISTAS", on_click=refrescar_manual, bgcolor=C_AZUL, color="white"),
-            ft.Divider(), col_lineas, ft.Divider(),
+            ft.Row([ft.ElevatedButton("🔄 ACTUALIZAR LISTAS", on_click=actualizar_listas, bgcolor=C_AZUL, color="white"),
+                    ft.ElevatedButton("✨ SUGERIR", on_click=sugerir_click, bgcolor=C_VIOLETA, color="white")]),
+            txt_filtro, ft.Divider(), col_lineas, ft.Divider(),
             ft.Text("AUSENTES", size=14, weight="bold", color=C_ROJO),
             ft.Row([dd_nueva_ausente, txt_motivo, ft.ElevatedButton("➕", on_click=add_aus, bgcolor=C_AZUL, color="white")]),
             col_ausentes, ft.Divider(),
@@ -384,13 +447,19 @@ def main(page: ft.Page):
     # =========================================================
     # PDF INDIVIDUAL
     # =========================================================
+    @metricas.medir_reporte("ficha")
     def generar_pdf_individual(jug_data, stats_globales):
         if not TIENE_PDF: return False, "Falta fpdf", None
         try:
-            pdf = FPDF(); pdf.add_page()
             dni_jug = str(jug_data['dni'])
             anio_act = datetime.now().year
             cat_actual = categoria_actual[0]
+            # Ya generada con los mismos datos (a pedido o por el programador): se devuelve la misma
+            clave = f"ficha|{dni_jug}|{anio_act}|{cat_actual}"
+            h = huella(tuple(jug_data), ws_habilidades.huella(), ws_asistencia.huella(), ws_partidos.huella())
+            url = PRECALCULADOS.buscar(clave, h)
+            if url: return True, "Listo", url
+            pdf = nuevo_pdf(); pdf.add_page()
             
             pdf.set_font("Arial", 'B', 10); pdf.set_text_color(100, 100, 100)
             pdf.cell(0, 5, f"TEMPORADA {anio_act}  -  CATEGORIA: {cat_actual.upper()}", ln=1, align='R'); pdf.ln(5)
@@ -420,49 +489,26 @@ def main(page: ft.Page):
             for t in TITULOS_SKILLS: pdf.cell(w_col, 8, clean_latin(t[:9]), 1, 0, 'C') 
             pdf.ln()
             pdf.set_font("Arial", '', 9)
-            acumulados_skills = [0] * len(TITULOS_SKILLS); count_skills = 0
-            if len(raw_hab) > 1:
-                datos_hab = []
-                for row in raw_hab[1:]:
-                    if str(row[1]) == dni_jug:
-                        try:
-                            f = datetime.strptime(row[0], "%d/%m/%Y")
-                            if f.year == anio_act: datos_hab.append((f, row))
-                        except: pass
-                datos_hab.sort(key=lambda x: x[0])
-                for f_obj, row in datos_hab:
-                    hay_datos_hab = True; count_skills += 1
-                    mes_nom = LISTA_MESES[f_obj.month - 1]
-                    pdf.cell(w_mes, 8, mes_nom, 1, 0, 'L') 
-                    for i in range(len(TITULOS_SKILLS)):
-                        try: val = safe_int(row[i+2])
-                        except: val = 0
-                        acumulados_skills[i] += val
-                        pdf.cell(w_col, 8, str(val), 1, 0, 'C') 
-                    pdf.ln()
+            # Meses y promedios salen de la serie ya calculada de la jugadora (tendencias.py), no de recorrer la hoja
+            TENDENCIAS.sincronizar(raw_hab); serie = TENDENCIAS.serie(dni_jug)
+            for p, notas in zip(serie.periodos, serie.notas):
+                if p // 12 != anio_act: continue
+                hay_datos_hab = True
+                pdf.cell(w_mes, 8, LISTA_MESES[p % 12], 1, 0, 'L') 
+                for val in notas: pdf.cell(w_col, 8, str(val), 1, 0, 'C') 
+                pdf.ln()
             if hay_datos_hab:
                 pdf.set_font("Arial", 'B', 9); pdf.set_fill_color(230, 240, 255)
                 pdf.cell(w_mes, 8, "GLOBAL", 1, 0, 'L', True)
-                for tot in acumulados_skills:
-                    prom = round(tot / count_skills, 1)
-                    pdf.cell(w_col, 8, str(prom), 1, 0, 'C', True)
+                for _, _, _, prom in tendencias.resumen(serie, anio_act): pdf.cell(w_col, 8, str(prom), 1, 0, 'C', True)
                 pdf.ln()
             else: pdf.cell(0, 8, "Sin evaluaciones registradas este ano.", 1, 1, 'C')
             pdf.ln(8)
             
             pdf.set_font("Arial", 'B', 12); pdf.set_fill_color(240, 240, 240)
             pdf.cell(0, 10, "  RESUMEN DE ASISTENCIA (ENTRENAMIENTOS)", 1, 1, 'L', True); pdf.ln(2)
-            raw_asist = ws_asistencia.get_all_values()
-            asist_mes = {m: {'P': 0, 'A': 0} for m in range(1, 13)}
-            if len(raw_asist) > 1:
-                for row in raw_asist[1:]:
-                    if str(row[1]) == dni_jug:
-                        try:
-                            f = datetime.strptime(row[0], "%d/%m/%Y")
-                            if f.year == anio_act and "Entrenamiento" in row[3]:
-                                if row[2] == "SI": asist_mes[f.month]['P'] += 1
-                                elif row[2] == "NO": asist_mes[f.month]['A'] += 1
-                        except: pass
+            temp = asistencia_bits.de_filas(ws_asistencia.get_all_values()).temporada(anio_act)
+            asist_mes = {m: {'P': p, 'A': a} for m, (p, a) in enumerate(temp.por_mes(dni_jug, "Entrenamiento")) if m}
             pdf.set_font("Arial", 'B', 10)
             pdf.cell(40, 8, "MES", 1, 0, 'C'); pdf.cell(40, 8, "ASISTIO", 1, 0, 'C')
             pdf.cell(40, 8, "FALTO", 1, 0, 'C'); pdf.cell(40, 8, "% EFECTIVIDAD", 1, 1, 'C'); pdf.ln() 
@@ -499,6 +545,13 @@ def main(page: ft.Page):
                     except: pass
             pdf.set_font("Arial", '', 12)
             pdf.cell(0, 10, f"Goles convertidos en la temporada: {goles_totales}", 0, 1, 'L')
+
+            # Gráfico de tendencia: el mismo PNG que muestra la vista de evaluación (caché por versión de la jugadora)
+            if serie.periodos and tendencias.TIENE_PIL:
+                pdf.add_page(); pdf.set_font("Arial", 'B', 12); pdf.set_fill_color(240, 240, 240)
+                pdf.cell(0, 10, "  TENDENCIA TECNICA (MEDIA MOVIL Y PENDIENTE)", 1, 1, 'L', True); pdf.ln(2)
+                png = tendencias.grafico(dni_jug, titulo_tendencia(f"{jug_data['nombre']} {jug_data['apellido']}"))
+                if png: pdf.image(io.BytesIO(png), w=190)
             
             pdf.set_auto_page_break(False) 
             pdf.set_y(-15)
@@ -509,104 +562,191 @@ def main(page: ft.Page):
             nombre_archivo = f"ficha_{dni_jug}_{ts}.pdf"
             ruta_completa = os.path.join("assets", nombre_archivo)
             pdf.output(ruta_completa)
+            PRECALCULADOS.guardar(clave, h, f"/{nombre_archivo}")
             
             return True, "Listo", f"/{nombre_archivo}"
             
         except Exception as e: return False, str(e), None
 
     # =========================================================
-    # PDF MENSUAL
+    # PDF MENSUAL / TEMPORADA
     # =========================================================
+    def agrupar_asistencia_por_mes(raw_asist, desde=None, hasta=None):
+        # Una sola pasada sobre 'asistencia': {(anio, mes): {"dias": {dni: {dia: {...}}}, "obs": {dia: txt}, "susp": {dias}}}
+        meses = {}
+        for row in raw_asist[1:]:
+            try:
+                f = parse_fecha(row[0])
+                if (desde and f < desde) or (hasta and f > hasta): continue
+                b = meses.get((f.year, f.month))
+                if b is None: b = meses[(f.year, f.month)] = {"dias": {}, "obs": {}, "susp": set()}
+                dni = str(row[1]); estado = row[2]; tipo = row[3]; obs = row[4]
+                letra = ""
+                if "Suspendido" in tipo: letra = "S"; b["susp"].add(f.day)
+                elif estado == "SI": letra = "P"
+                elif estado == "NO": letra = "A"
+                b["dias"].setdefault(dni, {})[f.day] = {'l': letra, 'tipo': tipo}
+                if obs and obs.strip(): b["obs"][f.day] = obs
+            except: pass
+        return meses
+
+    def totales_mes(bucket):
+        # {dni: [entrenamientos presentes, partidos presentes, ausencias]}
+        tot = {}
+        for dni, dias in bucket["dias"].items():
+            t = tot[dni] = [0, 0, 0]
+            for dia_data in dias.values():
+                if dia_data['l'] == "P":
+                    if "Entrenamiento" in dia_data['tipo']: t[0] += 1
+                    elif "Partido" in dia_data['tipo']: t[1] += 1
+                elif dia_data['l'] == "A": t[2] += 1
+        return tot
+
+    def pagina_mensual(pdf, mes_num, anio, categoria, bucket, plantel_v):
+        pdf.add_page()
+        dias_suspendidos = bucket["susp"]; observaciones_mes = bucket["obs"]; tot = totales_mes(bucket)
+        nombre_mes = LISTA_MESES[mes_num - 1]
+        cat_str = f"- {categoria.upper()}" if categoria else ""
+        pdf.set_font("Arial", 'B', 18); pdf.set_text_color(33, 150, 243)
+        pdf.cell(0, 12, f"ASISTENCIA - {nombre_mes.upper()} {anio} {cat_str}", ln=1, align='L'); pdf.ln(2)
+        
+        ancho_nombre = 55; ancho_dia = 6.5; alto_fila = 6
+        # GRILLA EN LOTE (pdf_motor.Grilla): mismas celdas de siempre, pero pocos cambios de estilo
+        g = pdf_motor.Grilla(); x_ini = pdf.get_x(); x_dias = x_ini + ancho_nombre; x_res = x_dias + 31 * ancho_dia
+        GRIS = (220, 220, 220); ROSA = (255, 200, 200); NEGRO = (0, 0, 0)
+        ESTILO_LETRA = {"P": ('B', 8, (0, 128, 0)), "A": ('B', 8, (200, 0, 0))}
+        letras_dia = []
+        for d in range(1, 32):
+            try: letras_dia.append(LETRAS_DIAS[datetime(anio, mes_num, d).weekday()])
+            except: letras_dia.append("-")
+
+        def encabezado(y):
+            g.celda(x_ini, y, ancho_nombre, alto_fila*2, "JUGADORA", GRIS, ('B', 7, NEGRO))
+            for d in range(1, 32):
+                fondo = ROSA if d in dias_suspendidos else GRIS; xd = x_dias + (d-1) * ancho_dia
+                g.celda(xd, y, ancho_dia, alto_fila, str(d), fondo, ('B', 7, NEGRO))
+                g.celda(xd, y + alto_fila, ancho_dia, alto_fila, letras_dia[d-1], fondo, ('B', 6, NEGRO))
+            g.celda(x_res, y, 12, alto_fila*2, "ENTR.", (187, 222, 251), ('B', 7, NEGRO))
+            g.celda(x_res + 12, y, 12, alto_fila*2, "PART.", (255, 224, 178), ('B', 7, NEGRO))
+            return y + alto_fila*2
+
+        y = encabezado(pdf.get_y()); count = 0
+        for j in plantel_v:
+            dni = str(j['dni'])
+            if y + alto_fila > pdf.page_break_trigger:
+                g.dibujar(pdf); pdf.add_page(); y = encabezado(pdf.t_margin)
+            count += 1; bg_fila = 245 if count % 2 == 0 else 255; fondo_fila = (bg_fila, bg_fila, bg_fila)
+            g.celda(x_ini, y, ancho_nombre, alto_fila, clean_latin(f"{j['apellido']} {j['nombre']}"), fondo_fila, ('', 8, NEGRO), 'L')
+            dias = bucket["dias"].get(dni, {})
+            for d in range(1, 32):
+                letra = dias[d]['l'] if d in dias else ""
+                fondo = (255, 235, 238) if d in dias_suspendidos else fondo_fila
+                g.celda(x_dias + (d-1) * ancho_dia, y, ancho_dia, alto_fila, letra, fondo, ESTILO_LETRA.get(letra, ('', 8, NEGRO)))
+            count_entrenamientos, count_partidos, _ = tot.get(dni, (0, 0, 0))
+            g.celda(x_res, y, 12, alto_fila, str(count_entrenamientos), (227, 242, 253) if count % 2 == 0 else (187, 222, 251), ('B', 8, NEGRO))
+            g.celda(x_res + 12, y, 12, alto_fila, str(count_partidos), (255, 243, 224) if count % 2 == 0 else (255, 224, 178), ('B', 8, NEGRO))
+            y += alto_fila
+        g.dibujar(pdf)
+        pdf.set_xy(x_ini, y); pdf.set_text_color(0); pdf.set_font("Arial", '', 8)
+        pdf.ln(5); pdf.set_font("Arial", 'B', 10); pdf.cell(0, 6, "REFERENCIAS:", ln=1)
+        pdf.set_font("Arial", size=9)
+        pdf.set_text_color(0, 128, 0); pdf.cell(25, 6, "P = Presente", 0, 0)
+        pdf.set_text_color(200, 0, 0); pdf.cell(25, 6, "A = Ausente", 0, 0)
+        pdf.set_text_color(0, 0, 0); pdf.cell(30, 6, "S = Suspendido", 0, 0)
+        pdf.set_fill_color(187, 222, 251); pdf.cell(5, 5, "", 1, 0, 'C', True); pdf.cell(35, 6, " Tot. Entrenamientos", 0, 0)
+        pdf.set_fill_color(255, 224, 178); pdf.cell(5, 5, "", 1, 0, 'C', True); pdf.cell(35, 6, " Tot. Partidos", 0, 1); pdf.ln(3)
+        if observaciones_mes:
+            pdf.set_font("Arial", 'B', 10); pdf.cell(0, 6, "OBSERVACIONES:", ln=1); pdf.set_font("Arial", size=9)
+            for d, obs in sorted(observaciones_mes.items()): 
+                pdf.cell(0, 5, f"- Dia {d}: {clean_latin(obs)}", ln=1)
+        return tot
+
+    def pagina_resumen(pdf, titulo, categoria, meses_tot, plantel_v):
+        # Una fila por jugadora: presentes por mes + totales del período
+        pdf.add_page()
+        cat_str = f"- {categoria.upper()}" if categoria else ""
+        pdf.set_font("Arial", 'B', 18); pdf.set_text_color(33, 150, 243)
+        pdf.cell(0, 12, f"{titulo} {cat_str}", ln=1, align='L'); pdf.ln(2)
+        ancho_nombre = 55; ancho_col = 13; alto_fila = 6; NEGRO = (0, 0, 0); GRIS = (220, 220, 220)
+        g = pdf_motor.Grilla(); x_ini = pdf.get_x(); claves = sorted(meses_tot)
+        x_tot = x_ini + ancho_nombre + len(claves) * ancho_col
+        cols_tot = [("ENTR.", (187, 222, 251)), ("PART.", (255, 224, 178)), ("AUS.", (255, 205, 210)), ("%", GRIS)]
+
+        def encabezado(y):
+            g.celda(x_ini, y, ancho_nombre, alto_fila, "JUGADORA", GRIS, ('B', 7, NEGRO))
+            for i, (a, m) in enumerate(claves):
+                g.celda(x_ini + ancho_nombre + i * ancho_col, y, ancho_col, alto_fila, f"{LISTA_MESES[m-1][:3].upper()}", GRIS, ('B', 7, NEGRO))
+            for i, (t, fondo) in enumerate(cols_tot): g.celda(x_tot + i * ancho_col, y, ancho_col, alto_fila, t, fondo, ('B', 7, NEGRO))
+            return y + alto_fila
+
+        y = encabezado(pdf.get_y()); count = 0
+        for j in plantel_v:
+            dni = str(j['dni'])
+            if y + alto_fila > pdf.page_break_trigger:
+                g.dibujar(pdf); pdf.add_page(); y = encabezado(pdf.t_margin)
+            count += 1; bg = 245 if count % 2 == 0 else 255; fondo_fila = (bg, bg, bg)
+            g.celda(x_ini, y, ancho_nombre, alto_fila, clean_latin(f"{j['apellido']} {j['nombre']}"), fondo_fila, ('', 8, NEGRO), 'L')
+            ent = part = aus = 0
+            for i, clave in enumerate(claves):
+                e_, p_, a_ = meses_tot[clave].get(dni, (0, 0, 0)); ent += e_; part += p_; aus += a_
+                g.celda(x_ini + ancho_nombre + i * ancho_col, y, ancho_col, alto_fila, str(e_ + p_) if (e_ + p_ + a_) else "", fondo_fila, ('', 8, NEGRO))
+            porc = int((ent + part) / (ent + part + aus) * 100) if (ent + part + aus) else 0
+            for i, v in enumerate([ent, part, aus, f"{porc}%"]):
+                g.celda(x_tot + i * ancho_col, y, ancho_col, alto_fila, str(v), cols_tot[i][1], ('B', 8, NEGRO))
+            y += alto_fila
+        g.dibujar(pdf)
+        pdf.set_xy(x_ini, y + 3); pdf.set_text_color(0); pdf.set_font("Arial", 'I', 8)
+        pdf.cell(0, 5, "Columnas por mes: presencias (entrenamientos + partidos). % = presencias / (presencias + ausencias).", ln=1)
+
+    @metricas.medir_reporte("mensual")
     def generar_pdf_mensual_grafico(mes_num, anio, categoria):
         if not TIENE_PDF: return False, "Falta fpdf", None
         try:
+            clave = f"mensual|{anio}|{mes_num}|{categoria}"
             raw_asist = ws_asistencia.get_all_values()
-            datos = {str(j['dni']): {"nombre": f"{j['apellido']} {j['nombre']}", "dias": {}} for j in lista_jugadoras_raw}
-            observaciones_mes = {}; dias_suspendidos = set()
-            for row in raw_asist[1:]:
-                try:
-                    f = datetime.strptime(row[0], "%d/%m/%Y")
-                    if f.month == mes_num and f.year == anio:
-                        dni = str(row[1]); estado = row[2]; tipo = row[3]; obs = row[4]
-                        letra = ""; es_presente = (estado == "SI")
-                        if "Suspendido" in tipo: letra = "S"; dias_suspendidos.add(f.day)
-                        elif es_presente: letra = "P"
-                        elif estado == "NO": letra = "A"
-                        if dni in datos: datos[dni]["dias"][f.day] = {'l': letra, 'tipo': tipo}
-                        if obs and obs.strip(): observaciones_mes[f.day] = obs
-                except: pass
+            h = huella(PLANTEL.huella(), ws_asistencia.huella())
+            url = PRECALCULADOS.buscar(clave, h)
+            if url: return True, "Listo", url
+            desde = datetime(anio, mes_num, 1); hasta = datetime(anio, mes_num, calendar.monthrange(anio, mes_num)[1])
+            meses = agrupar_asistencia_por_mes(raw_asist, desde, hasta)
+            pdf = nuevo_pdf('L', 'mm', 'A4')
+            pagina_mensual(pdf, mes_num, anio, categoria, meses.get((anio, mes_num), {"dias": {}, "obs": {}, "susp": set()}), PLANTEL.actual())
+            
+            ts = int(time.time())
+            nombre_archivo = f"mensual_{mes_num}_{ts}.pdf"
+            ruta_completa = os.path.join("assets", nombre_archivo)
+            pdf.output(ruta_completa)
+            PRECALCULADOS.guardar(clave, h, f"/{nombre_archivo}")
             
-            pdf = FPDF('L', 'mm', 'A4'); pdf.add_page()
-            nombre_mes = [k for k,v in MAPA_MESES.items() if v==mes_num][0]
-            cat_str = f"- {categoria.upper()}" if categoria else ""
-            pdf.set_font("Arial", 'B', 18); pdf.set_text_color(33, 150, 243)
-            pdf.cell(0, 12, f"ASISTENCIA - {nombre_mes.upper()} {anio} {cat_str}", ln=1, align='L'); pdf.ln(2)
+            return True, "Listo", f"/{nombre_archivo}"
             
-            ancho_nombre = 55; ancho_dia = 6.5; alto_fila = 6
-            pdf.set_font("Arial", 'B', 7); pdf.set_fill_color(220, 220, 220); pdf.set_text_color(0)
-            x_ini = pdf.get_x(); y_ini = pdf.get_y()
-            pdf.cell(ancho_nombre, alto_fila*2, "JUGADORA", 1, 0, 'C', True)
-            pdf.set_xy(x_ini + ancho_nombre, y_ini)
-            for d in range(1, 32):
-                if d in dias_suspendidos: pdf.set_fill_color(255, 200, 200) 
-                else: pdf.set_fill_color(220, 220, 220)
-                pdf.cell(ancho_dia, alto_fila, str(d), 1, 0, 'C', True)
-            x_res = pdf.get_x()
-            pdf.set_fill_color(187, 222, 251); pdf.cell(12, alto_fila*2, "ENTR.", 1, 0, 'C', True)
-            pdf.set_fill_color(255, 224, 178); pdf.cell(12, alto_fila*2, "PART.", 1, 0, 'C', True)
-            pdf.set_xy(x_ini + ancho_nombre, y_ini + alto_fila)
-            pdf.set_text_color(0); pdf.set_font("Arial", 'B', 6)
-            for d in range(1, 32):
-                try: ld = LETRAS_DIAS[datetime(anio, mes_num, d).weekday()]
-                except: ld = "-"
-                if d in dias_suspendidos: pdf.set_fill_color(255, 200, 200) 
-                else: pdf.set_fill_color(220, 220, 220)
-                pdf.cell(ancho_dia, alto_fila, ld, 1, 0, 'C', True)
-            pdf.set_xy(x_ini, y_ini + alto_fila*2)
-            pdf.set_font("Arial", size=8); count = 0
-            for dni, info in datos.items():
-                count += 1; bg_fila = 245 if count % 2 == 0 else 255
-                pdf.set_fill_color(bg_fila, bg_fila, bg_fila)
-                try: n_safe = info['nombre'].encode('latin-1', 'replace').decode('latin-1')
-                except: n_safe = info['nombre']
-                pdf.cell(ancho_nombre, alto_fila, n_safe, 1, 0, 'L', True)
-                count_entrenamientos = 0; count_partidos = 0
-                for d in range(1, 32):
-                    dia_data = info['dias'].get(d, {}); letra = dia_data.get('l', ""); tipo = dia_data.get('tipo', ""); fill = True
-                    if letra == "P":
-                        if "Entrenamiento" in tipo: count_entrenamientos += 1
-                        elif "Partido" in tipo: count_partidos += 1
-                    if d in dias_suspendidos: pdf.set_fill_color(255, 235, 238)
-                    else: pdf.set_fill_color(bg_fila, bg_fila, bg_fila)
-                    if letra == "P": pdf.set_text_color(0, 128, 0); pdf.set_font("Arial",'B',8)
-                    elif letra == "A": pdf.set_text_color(200, 0, 0); pdf.set_font("Arial",'B',8)
-                    elif letra == "S": pdf.set_text_color(0, 0, 0); pdf.set_font("Arial",'',8)
-                    else: pdf.set_text_color(0); pdf.set_font("Arial",'',8)
-                    pdf.cell(ancho_dia, alto_fila, letra, 1, 0, 'C', fill)
-                pdf.set_text_color(0); pdf.set_font("Arial", 'B', 8)
-                pdf.set_fill_color(227, 242, 253) if count % 2 == 0 else pdf.set_fill_color(187, 222, 251)
-                pdf.cell(12, alto_fila, str(count_entrenamientos), 1, 0, 'C', True) 
-                pdf.set_fill_color(255, 243, 224) if count % 2 == 0 else pdf.set_fill_color(255, 224, 178)
-                pdf.cell(12, alto_fila, str(count_partidos), 1, 0, 'C', True) 
-                pdf.set_text_color(0); pdf.set_font("Arial", '', 8); pdf.ln()
-            pdf.ln(5); pdf.set_font("Arial", 'B', 10); pdf.cell(0, 6, "REFERENCIAS:", ln=1)
-            pdf.set_font("Arial", size=9)
-            pdf.set_text_color(0, 128, 0); pdf.cell(25, 6, "P = Presente", 0, 0)
-            pdf.set_text_color(200, 0, 0); pdf.cell(25, 6, "A = Ausente", 0, 0)
-            pdf.set_text_color(0, 0, 0); pdf.cell(30, 6, "S = Suspendido", 0, 0)
-            pdf.set_fill_color(187, 222, 251); pdf.cell(5, 5, "", 1, 0, 'C', True); pdf.cell(35, 6, " Tot. Entrenamientos", 0, 0)
-            pdf.set_fill_color(255, 224, 178); pdf.cell(5, 5, "", 1, 0, 'C', True); pdf.cell(35, 6, " Tot. Partidos", 0, 1); pdf.ln(3)
-            if observaciones_mes:
-                pdf.set_font("Arial", 'B', 10); pdf.cell(0, 6, "OBSERVACIONES:", ln=1); pdf.set_font("Arial", size=9)
-                for d, obs in sorted(observaciones_mes.items()): 
-                    try: obs_safe = obs.encode('latin-1', 'replace').decode('latin-1')
-                    except: obs_safe = obs
-                    pdf.cell(0, 5, f"- Dia {d}: {obs_safe}", ln=1)
+        except Exception as e: return False, str(e), None
+
+    @metricas.medir_reporte("temporada")
+    def generar_pdf_temporada(anio, categoria, desde=None, hasta=None):
+        # Temporada completa (o rango desde/hasta) con una sola lectura de 'asistencia':
+        # una planilla por mes con datos + página de resumen del período
+        if not TIENE_PDF: return False, "Falta fpdf", None
+        try:
+            desde = desde or datetime(anio, 1, 1); hasta = hasta or datetime(anio, 12, 31)
+            clave = f"temporada|{desde:%Y%m%d}|{hasta:%Y%m%d}|{categoria}"
+            raw_asist = ws_asistencia.get_all_values()
+            h = huella(PLANTEL.huella(), ws_asistencia.huella())
+            url = PRECALCULADOS.buscar(clave, h)
+            if url: return True, "Listo", url
+            meses = agrupar_asistencia_por_mes(raw_asist, desde, hasta)
+            plantel_v = PLANTEL.actual()
+            pdf = nuevo_pdf('L', 'mm', 'A4'); meses_tot = {}
+            for (a, m) in sorted(meses): meses_tot[(a, m)] = pagina_mensual(pdf, m, a, categoria, meses[(a, m)], plantel_v)
+            if desde.year == hasta.year and (desde.month, desde.day, hasta.month, hasta.day) == (1, 1, 12, 31): titulo = f"RESUMEN ANUAL {anio}"
+            else: titulo = f"RESUMEN {desde.strftime('%d/%m/%Y')} - {hasta.strftime('%d/%m/%Y')}"
+            pagina_resumen(pdf, titulo, categoria, meses_tot, plantel_v)
             
             ts = int(time.time())
-            nombre_archivo = f"mensual_{mes_num}_{ts}.pdf"
+            nombre_archivo = f"temporada_{desde.strftime('%Y%m%d')}_{hasta.strftime('%Y%m%d')}_{ts}.pdf"
             ruta_completa = os.path.join("assets", nombre_archivo)
             pdf.output(ruta_completa)
+            PRECALCULADOS.guardar(clave, h, f"/{nombre_archivo}")
             
             return True, "Listo", f"/{nombre_archivo}"
             
@@ -652,10 +792,14 @@ def main(page: ft.Page):
         def eliminar_datos_dia(e):
             f_str = txt_fecha_display.value.replace("📅 ", "")
             try:
-                raw = ws_asistencia.get_all_values()
-                filas_ok = [row for row in raw if row[0] != f_str]
-                if not filas_ok: filas_ok = [["Fecha", "DNI", "Presente", "Tipo", "Observaciones"]]
-                ws_asistencia.clear(); ws_asistencia.append_rows(filas_ok); txt_estado.value = "🗑️ Eliminado"; cargar_datos_fecha()
+                # Reescritura completa: nadie más escribe asistencia mientras tanto (escrituras.py)
+                with COORDINADOR.exclusiva("asistencia"):
+                    raw = ws_asistencia.releer()
+                    filas_ok = [row for row in raw if row[0] != f_str]
+                    if not filas_ok: filas_ok = [["Fecha", "DNI", "Presente", "Tipo", "Observaciones"]]
+                    ws_asistencia.clear(); ws_asistencia.append_rows(filas_ok)
+                avisar(Cambio("asistencia", "reemplazar", col=0, valor=f_str))
+                txt_estado.value = "🗑️ Eliminado"; cargar_datos_fecha()
             except Exception as ex: txt_estado.value = str(ex); page.update()
         def mostrar_modo_edicion(): info_completado.visible = False; col_lista.visible = True; btn_guardar.visible = True; page.update()
         def actualizar_visual_fila(dni, estado):
@@ -695,30 +839,48 @@ def main(page: ft.Page):
             try: date_picker.open = True; page.update()
             except: pass
         col_lista.controls.append(ft.Container(content=ft.Row([ft.Text("JUGADORA", weight="bold", color="white", expand=True), ft.Text("ASISTENCIA", weight="bold", color="white", width=100)]), bgcolor="#607D8B", padding=10, border_radius=5))
-        for i, jug in enumerate(lista_jugadoras_raw):
+        # Faltas seguidas en la temporada (asistencia_bits): se marcan al lado del nombre
+        alertas = asistencia_bits.de_filas(ws_asistencia.get_all_values()).temporada(datetime.now().year).alertas()
+        for i, jug in enumerate(PLANTEL.actual()):
             dni = str(jug['dni']); num = jug['camiseta'] or "-"; edad = calcular_edad(jug['nacimiento'])
-            txt_n = ft.Text(f"#{num} - {jug['apellido'].upper()} {jug['nombre']} ({edad})", weight="bold", size=14, color=C_TEXTO, expand=True)
+            aviso = f"  ⚠️ {alertas[dni]} faltas seguidas" if dni in alertas else ""
+            txt_n = ft.Text(f"#{num} - {jug['apellido'].upper()} {jug['nombre']} ({edad}){aviso}", weight="bold", size=14, color=C_TEXTO, expand=True)
             btn_p = ft.ElevatedButton("✅", width=50, on_click=lambda e, d=dni: actualizar_visual_fila(d, "SI"))
             btn_a = ft.ElevatedButton("❌", width=50, on_click=lambda e, d=dni: actualizar_visual_fila(d, "NO"))
-            controles_filas[dni] = {'txt': txt_n, 'btn_p': btn_p, 'btn_a': btn_a, 'estado': None}
-            col_lista.controls.append(ft.Container(content=ft.Row([txt_n, btn_p, btn_a], alignment="spaceBetween"), padding=10, bgcolor=C_BLANCO if i%2==0 else C_GRIS_CLARO, border=ft.border.only(bottom=ft.border.BorderSide(1, "#DDD"))))
+            fila = ft.Container(content=ft.Row([txt_n, btn_p, btn_a], alignment="spaceBetween"), padding=10, bgcolor=C_BLANCO if i%2==0 else C_GRIS_CLARO, border=ft.border.only(bottom=ft.border.BorderSide(1, "#DDD")))
+            controles_filas[dni] = {'txt': txt_n, 'btn_p': btn_p, 'btn_a': btn_a, 'fila': fila, 'estado': None}
+            col_lista.controls.append(fila)
+        def filtrar_lista(e):
+            # Oculta las filas que no matchean; el estado marcado de cada una se conserva
+            q = txt_buscar.value or ""
+            visibles = {str(j['dni']) for j in PLANTEL.indice().buscar(q, limite=None)} if q.strip() else None
+            for dni, ctrls in controles_filas.items(): ctrls['fila'].visible = visibles is None or dni in visibles
+            page.update()
+        txt_buscar = ft.TextField(label="🔍 Buscar jugadora (nombre, DNI, camiseta)", dense=True, bgcolor=C_BLANCO, on_change=filtrar_lista)
+        col_lista.controls.insert(0, txt_buscar)
+        # Otra sesión guardó/borró el día que está en pantalla: se vuelve a pintar desde el memo ya actualizado
+        oyentes["asistencia"] = lambda c: cargar_datos_fecha() if c.valor == txt_fecha_display.value.replace("📅 ", "") else None
         def guardar(e):
             f_str = txt_fecha_display.value.replace("📅 ", ""); susp = "Suspendido" in dd_tipo.value; txt_estado.value = "⏳ Guardando..."; page.update()
             try:
-                raw = ws_asistencia.get_all_values(); filas_ok = [row for row in raw if row[0] != f_str]
-                if not filas_ok or filas_ok[0][0] != "Fecha": filas_ok.insert(0, ["Fecha", "DNI", "Presente", "Tipo", "Observaciones"])
                 filas_nuevas = []
                 for dni, ctrl in controles_filas.items():
                     est = ctrl['estado']
                     if not est and not susp: continue
                     val = "-" if susp else est
                     filas_nuevas.append([f_str, dni, val, dd_tipo.value, txt_obs.value])
-                ws_asistencia.clear(); ws_asistencia.append_rows(filas_ok + filas_nuevas)
+                # La lectura fresca y la reescritura van juntas bajo el cerrojo: no se pisan los días que guardó otra sesión
+                with COORDINADOR.exclusiva("asistencia"):
+                    raw = ws_asistencia.releer(); filas_ok = [row for row in raw if row[0] != f_str]
+                    if not filas_ok or filas_ok[0][0] != "Fecha": filas_ok.insert(0, ["Fecha", "DNI", "Presente", "Tipo", "Observaciones"])
+                    ws_asistencia.clear(); ws_asistencia.append_rows(filas_ok + filas_nuevas)
+                avisar(Cambio("asistencia", "reemplazar", filas=filas_nuevas, col=0, valor=f_str))
                 txt_estado.value = "✅ Guardado"; col_lista.visible = False; btn_guardar.visible = False; info_completado.visible = True; page.update()
             except Exception as ex: txt_estado.value = f"Error: {ex}"; page.update()
         btn_guardar = ft.ElevatedButton("💾 GUARDAR ASISTENCIA", on_click=guardar, bgcolor=C_AZUL, color="white", height=50)
         
         btn_ojo_mensual = ft.IconButton(icon=ft.Icons.VISIBILITY, disabled=True, icon_color=C_GRIS_TXT, tooltip="Abrir PDF")
+        btn_ojo_temporada = ft.IconButton(icon=ft.Icons.VISIBILITY, disabled=True, icon_color=C_GRIS_TXT, tooltip="Abrir PDF")
 
         def pdf_click(e):
             try:
@@ -737,6 +899,23 @@ def main(page: ft.Page):
                     txt_estado.value = f"Error: {res}"
                 page.update()
             except: pass
+
+        def pdf_temporada_click(e):
+            try:
+                txt_estado.value = "Creando PDF de temporada..."
+                page.update()
+                dt = datetime.strptime(txt_fecha_display.value.replace("📅 ", ""), "%d/%m/%Y")
+                ok, res, url_pdf = generar_pdf_temporada(dt.year, categoria_actual[0])
+                if ok:
+                    txt_estado.value = "✅ Temporada Lista. Click en el ojo."
+                    btn_ojo_temporada.disabled = False
+                    btn_ojo_temporada.icon_color = C_VIOLETA
+                    btn_ojo_temporada.url = url_pdf
+                    btn_ojo_temporada.update()
+                else:
+                    txt_estado.value = f"Error: {res}"
+                page.update()
+            except: pass
             
         cargar_datos_fecha() 
         return ft.Column([
@@ -745,6 +924,7 @@ def main(page: ft.Page):
             ft.Row([ft.ElevatedButton("📅 CAMBIAR DÍA", on_click=abrir_calendario, bgcolor=C_AZUL, color="white"), txt_fecha_display]), 
             ft.Row([dd_tipo, txt_obs]), ft.Divider(), 
             ft.Row([ft.ElevatedButton("📊 ESTADÍSTICAS", on_click=lambda e: navegar("stats"), bgcolor="#607D8B", color="white", expand=True), ft.ElevatedButton("📄 GENERAR MES", on_click=pdf_click, bgcolor=C_VIOLETA, color="white"), btn_ojo_mensual]), 
+            ft.Row([ft.ElevatedButton("📅 TEMPORADA", on_click=pdf_temporada_click, bgcolor=C_VIOLETA, color="white", expand=True), btn_ojo_temporada]), 
             ft.Divider(), info_completado, col_lista, ft.Divider(), btn_guardar
         ], scroll="auto")
 
@@ -752,20 +932,12 @@ def main(page: ft.Page):
         txt_estado.value = "⏳ Calculando..."; page.update()
         col_stats = ft.Column(spacing=0, scroll="auto")
         try:
-            raw = ws_asistencia.get_all_values()
-            stats = {str(j['dni']): {m:0 for m in range(1,13)} for j in lista_jugadoras_raw}
-            for j in lista_jugadoras_raw: stats[str(j['dni'])]['nombre'] = f"{j['apellido']} {j['nombre']}"
-            anio_act = datetime.now().year
-            for row in raw[1:]:
-                try:
-                    f = datetime.strptime(row[0], "%d/%m/%Y")
-                    if f.year == anio_act and str(row[1]) in stats and row[2]=="SI":
-                        stats[str(row[1])][f.month] += 1
-                except: pass
-            col_stats.controls.append(ft.Container(content=ft.Row([ft.Text("JUGADORA", width=120, weight="bold"), ft.Text("ENE", width=30, size=10), ft.Text("FEB", width=30, size=10), ft.Text("MAR", width=30, size=10), ft.Text("TOT", width=40, weight="bold", color=C_AZUL)]), bgcolor=C_GRIS, padding=5))
-            for dni, d in stats.items():
-                tot = sum([d[m] for m in range(1,13)])
-                col_stats.controls.append(ft.Container(content=ft.Row([ft.Text(d['nombre'], width=120, size=12, no_wrap=True), ft.Text(str(d[1]), width=30), ft.Text(str(d[2]), width=30), ft.Text(str(d[3]), width=30), ft.Text(str(tot), width=40, weight="bold")]), padding=5, border=ft.Border.all(1, "#EEE")))
+            temp = asistencia_bits.de_filas(ws_asistencia.get_all_values()).temporada(datetime.now().year)
+            col_stats.controls.append(ft.Container(content=ft.Row([ft.Text("JUGADORA", width=120, weight="bold"), ft.Text("ENE", width=30, size=10), ft.Text("FEB", width=30, size=10), ft.Text("MAR", width=30, size=10), ft.Text("TOT", width=40, weight="bold", color=C_AZUL), ft.Text("%", width=40, weight="bold"), ft.Text("RACHA", width=50, size=10)]), bgcolor=C_GRIS, padding=5))
+            for j in PLANTEL.actual():
+                dni = str(j['dni']); d = temp.por_mes(dni); pct = temp.porcentaje(dni); seguidas = temp.faltas_seguidas(dni)
+                racha = f"⚠️ {seguidas}" if seguidas >= asistencia_bits.ALERTA_AUSENCIAS else str(temp.racha_presencias(dni))
+                col_stats.controls.append(ft.Container(content=ft.Row([ft.Text(f"{j['apellido']} {j['nombre']}", width=120, size=12, no_wrap=True), ft.Text(str(d[1][0]), width=30), ft.Text(str(d[2][0]), width=30), ft.Text(str(d[3][0]), width=30), ft.Text(str(temp.presencias(dni)), width=40, weight="bold"), ft.Text("-" if pct is None else f"{pct}%", width=40), ft.Text(racha, width=50, color=C_ROJO if racha.startswith("⚠") else None)]), padding=5, border=ft.Border.all(1, "#EEE")))
             txt_estado.value = "✅ Listado"
         except: pass
         return ft.Column([ft.Text("Estadísticas", size=20, weight="bold"), ft.ElevatedButton("Volver", on_click=lambda e:navegar("asis")), ft.Divider(), ft.Container(content=col_stats, height=600, border=ft.Border.all(1,C_GRIS))])
@@ -780,20 +952,20 @@ def main(page: ft.Page):
             elif v < 8: return C_AMARILLO
             return C_VERDE
         def mostrar_formulario_evaluacion(dni_jugadora, nombre_jugadora, mes_num):
-            area_contenido.controls.clear()
+            area_contenido.controls.clear(); oyentes.pop("habilidades", None)
             raw = ws_habilidades.get_all_values()
             vals = [1]*len(TITULOS_SKILLS); fila_enc = None
             for idx, row in enumerate(raw):
                 if idx==0: continue
                 try:
-                    f = datetime.strptime(row[0], "%d/%m/%Y")
+                    f = parse_fecha(row[0])
                     if str(row[1]) == str(dni_jugadora) and f.month == mes_num and f.year == datetime.now().year:
                         fila_enc = idx + 1; vals = []
                         for i in range(len(TITULOS_SKILLS)): 
                             try: vals.append(safe_int(row[i+2]))
                             except: vals.append(1)
                 except: pass
-            estado_edicion["dni_jugadora"] = dni_jugadora; estado_edicion["fila"] = fila_enc
+            estado_edicion["dni_jugadora"] = dni_jugadora; estado_edicion["fila"] = fila_enc; estado_edicion["original"] = raw[fila_enc - 1] if fila_enc else None
             sliders_refs.clear(); col_sliders = ft.Column()
             for i, tit in enumerate(TITULOS_SKILLS):
                 val_ini = int(vals[i])
@@ -817,26 +989,54 @@ def main(page: ft.Page):
                 anio = datetime.now().year
                 fecha_guardado = datetime(anio, mes_num, 1).strftime("%d/%m/%Y")
                 try:
-                    if estado_edicion["fila"]: 
-                        letra_fin = chr(ord('C') + len(TITULOS_SKILLS) - 1)
-                        ws_habilidades.update(f"C{estado_edicion['fila']}:{letra_fin}{estado_edicion['fila']}", [notas])
-                    else: ws_habilidades.append_row([fecha_guardado, dni_jugadora] + notas + ["Obs"])
+                    # Clave = (mes, jugadora): dos evaluaciones de jugadoras distintas se escriben en paralelo
+                    with COORDINADOR.compartida("habilidades", (fecha_guardado, str(dni_jugadora))):
+                        if estado_edicion["fila"]: fila_n = ubicar_fila(ws_habilidades, estado_edicion["fila"], estado_edicion["original"], columnas=(0, 1))
+                        else: fila_n = buscar_fila(ws_habilidades, (fecha_guardado, str(dni_jugadora)))  # otra sesión pudo cargarla recién
+                        if fila_n:
+                            letra_fin = chr(ord('C') + len(TITULOS_SKILLS) - 1)
+                            ws_habilidades.update(f"C{fila_n}:{letra_fin}{fila_n}", [notas])
+                            cambio = Cambio("habilidades", "actualizar", fila=fila_n, filas=[notas], col=2)
+                        else:
+                            fila = [fecha_guardado, dni_jugadora] + notas + ["Obs"]
+                            ws_habilidades.append_row(fila); cambio = Cambio("habilidades", "agregar", filas=[fila])
+                    TENDENCIAS.aplicar(fecha_guardado, dni_jugadora, notas)  # solo ese punto de la serie
+                    avisar(cambio)
                     txt_estado.value = "✅ Guardado"; mostrar_lista_jugadoras(mes_num)
                 except Exception as ex: txt_estado.value = f"Error: {ex}"; page.update()
             area_contenido.controls.append(ft.Column([ft.Text(f"Evaluando a: {nombre_jugadora}", size=20, weight="bold", color=C_VIOLETA), ft.Divider(), col_sliders, ft.Divider(), ft.Row([ft.ElevatedButton("Cancelar", on_click=lambda e: mostrar_lista_jugadoras(mes_num), bgcolor="grey", color="white"), ft.ElevatedButton("GUARDAR", on_click=guardar_y_volver, bgcolor=C_VERDE, color="white", expand=True)])]))
             page.update()
+        def mostrar_tendencia(dni, nombre, mes_num):
+            # Últimos valores, media móvil y pendiente por habilidad + el gráfico (cacheado por versión)
+            area_contenido.controls.clear(); oyentes.pop("habilidades", None)
+            serie = TENDENCIAS.serie(dni)
+            tabla = ft.DataTable(columns=[ft.DataColumn(ft.Text(x)) for x in ("HABILIDAD", "ÚLTIMA", "MEDIA", "PEND./MES", f"PROM. {datetime.now().year}")], rows=[
+                ft.DataRow(cells=[ft.DataCell(ft.Text(tit)), ft.DataCell(ft.Text(str(ult))), ft.DataCell(ft.Text(f"{media:.1f}")),
+                                  ft.DataCell(ft.Text(f"{pend:+.2f}", color=C_VERDE if pend > 0.05 else C_ROJO if pend < -0.05 else C_GRIS_TXT)),
+                                  ft.DataCell(ft.Text(str(prom)))])
+                for tit, (ult, media, pend, prom) in zip(TITULOS_SKILLS, tendencias.resumen(serie, datetime.now().year))])
+            area_contenido.controls.append(ft.Column([
+                ft.Row([ft.Text(f"📈 {nombre}", size=18, weight="bold", color=C_VIOLETA), ft.ElevatedButton("VOLVER", on_click=lambda e: mostrar_lista_jugadoras(mes_num))], alignment="spaceBetween"),
+                ft.Row([tabla], scroll="always")]))
+            png = tendencias.grafico(dni, titulo_tendencia(nombre))
+            if png: area_contenido.controls.append(ft.Image(src=png, fit="contain"))
+            page.update()
         def mostrar_lista_jugadoras(mes_num):
             area_contenido.controls.clear(); txt_estado.value = "⏳ Calculando..."; page.update()
+            oyentes["habilidades"] = lambda c: mostrar_lista_jugadoras(mes_num)  # notas cargadas desde otra sesión
             for i, btn in enumerate(botones_meses_refs):
                 if (i + 1) == mes_num: btn.bgcolor = C_VERDE; btn.color = "white"
                 else: btn.bgcolor = C_BLANCO; btn.color = "black"
             page.update() 
             raw = ws_habilidades.get_all_values(); anio = datetime.now().year
-            dnis_activos = [str(j['dni']) for j in lista_jugadoras_raw]; notas_validas = {} 
+            TENDENCIAS.sincronizar(raw)  # solo aplica lo que cambió desde la última lectura
+            plantel_v = PLANTEL.actual()
+            TENDENCIAS.activas(j['dni'] for j in plantel_v if j['activo'] != "NO")  # como formacion.sugerir
+            dnis_activos = {str(j['dni']) for j in plantel_v}; notas_validas = {} 
             acumulado_skills = [0]*len(TITULOS_SKILLS); cantidad_evaluadas = 0
             for row in raw[1:]:
                 try:
-                    f = datetime.strptime(row[0], "%d/%m/%Y")
+                    f = parse_fecha(row[0])
                     if f.year == anio and f.month == mes_num:
                         dni_fila = str(row[1])
                         if dni_fila in dnis_activos:
@@ -849,9 +1049,9 @@ def main(page: ft.Page):
                             notas_validas[dni_fila] = notas
                             cantidad_evaluadas += 1
                 except: pass
-            txt_progreso.value = f"Estado {LISTA_MESES[mes_num-1]}: {len(notas_validas)}/{len(lista_jugadoras_raw)} Evaluadas"
+            txt_progreso.value = f"Estado {LISTA_MESES[mes_num-1]}: {len(notas_validas)}/{len(plantel_v)} Evaluadas"
             items_lista = []
-            for j in lista_jugadoras_raw:
+            for j in plantel_v:
                 dni = str(j['dni']); ya_esta = dni in notas_validas
                 icono = "✅" if ya_esta else "⚠️"
                 texto_estado = "Completado" if ya_esta else "Pendiente"
@@ -863,6 +1063,7 @@ def main(page: ft.Page):
                             ft.Text(f"{j['nombre']} {j['apellido']}", weight="bold"),
                             ft.Text(texto_estado, size=12, color="grey")
                         ], expand=True),
+                        ft.IconButton(icon=ft.Icons.SHOW_CHART, icon_color=C_AZUL, tooltip="Tendencia", disabled=not TENDENCIAS.version(dni), on_click=lambda e, d=dni, n=f"{j['nombre']} {j['apellido']}": mostrar_tendencia(d, n, mes_num)),
                         ft.ElevatedButton("EDITAR" if ya_esta else "CARGAR", color="blue", bgcolor=C_BLANCO, on_click=lambda e, d=dni, n=f"{j['nombre']} {j['apellido']}": mostrar_formulario_evaluacion(d, n, mes_num))
                     ]),
                     padding=10, bgcolor=color_bg, border_radius=8
@@ -880,6 +1081,8 @@ def main(page: ft.Page):
                         ft.Row([ft.Text(TITULOS_SKILLS[i], size=10, width=80), ft.Text(str(prom), weight="bold")], alignment="spaceBetween"),
                         ft.Stack([ft.Container(width=300, height=8, bgcolor=C_GRIS, border_radius=4, alignment=ft.Alignment(-1.0, 0.0)), ft.Container(width=prom*30, height=8, bgcolor=c, border_radius=4)])
                     ], spacing=2))
+                png = tendencias.grafico(tendencias.EQUIPO, titulo_tendencia("Equipo"))
+                if png: area_contenido.controls += [ft.Text("📈 Tendencia del equipo", weight="bold", color=C_AZUL), ft.Image(src=png, fit="contain")]
             else:
                 area_contenido.controls.append(ft.Container(content=ft.Text("Ninguna evaluación cargada este mes.", color="orange"), padding=20))
             txt_estado.value = "✅ Lista actualizada"; page.update()
@@ -906,45 +1109,90 @@ def main(page: ft.Page):
             dni_orig = v_dni
             t_nom = ft.TextField(label="Nombre", value=v_nom); t_ape = ft.TextField(label="Apellido", value=v_ape)
             t_dni = ft.TextField(label="DNI", value=v_dni); t_nac = ft.TextField(label="Nacimiento (DD/MM/AAAA)", value=v_nac)
-            t_cami = ft.TextField(label="N° Camiseta", value=v_cam); t_pos = ft.Dropdown(label="Posición", options=[ft.dropdown.Option(x) for x in ["Arquera","Defensora","Volante","Delantera"]], value=v_pos); t_tel = ft.TextField(label="Teléfono", value=v_tel)
+            t_cami = ft.TextField(label="N° Camiseta", value=v_cam); t_pos = ft.Dropdown(label="Posición", options=[ft.dropdown.Option(x) for x in POSICIONES], value=v_pos); t_tel = ft.TextField(label="Teléfono", value=v_tel)
             def save(e):
                 if not t_dni.value: txt_estado.value = "⚠️ Falta DNI"; page.update(); return
                 nd = ["", t_nom.value, t_ape.value, t_dni.value, t_nac.value, t_pos.value, t_tel.value, "SI", t_cami.value]
                 try:
-                    if jug:
-                        rows = ws_jugadoras.get_all_values()
-                        for i, r in enumerate(rows):
-                            if len(r) > 3 and str(r[3]) == str(dni_orig):
-                                ws_jugadoras.update(f"A{i+1}:I{i+1}", [nd]); jug.update({'nombre':t_nom.value, 'apellido':t_ape.value, 'dni':t_dni.value, 'nacimiento':t_nac.value, 'camiseta':t_cami.value}); break
-                    else:
-                        ws_jugadoras.append_row(nd)
-                        lista_jugadoras_raw.append({'id':"", 'nombre':t_nom.value, 'apellido':t_ape.value, 'dni':t_dni.value, 'nacimiento':t_nac.value, 'posicion':t_pos.value, 'telefono':t_tel.value, 'activo':"SI", 'camiseta':t_cami.value})
+                    with COORDINADOR.compartida("jugadoras", str(dni_orig or nd[3])):
+                        if jug:
+                            rows = ws_jugadoras.releer()
+                            for i, r in enumerate(rows):
+                                if len(r) > 3 and str(r[3]) == str(dni_orig):
+                                    ws_jugadoras.update(f"A{i+1}:I{i+1}", [nd]); PLANTEL.reemplazar(dni_orig, Jugadora.desde_fila(nd))
+                                    avisar(Cambio("jugadoras", "actualizar", fila=i+1, filas=[nd], valor=str(dni_orig))); break
+                        else:
+                            ws_jugadoras.append_row(nd)
+                            PLANTEL.agregar(Jugadora.desde_fila(nd)); avisar(Cambio("jugadoras", "agregar", filas=[nd]))
                     txt_estado.value="✅ Guardado"; navegar("plantel")
                 except Exception as ex: txt_estado.value=str(ex); page.update()
             columna_contenido.controls.append(ft.Column([ft.Text("Editar" if jug else "Alta", size=20, weight="bold", color=C_AZUL), t_nom, t_ape, t_dni, t_nac, t_cami, t_pos, t_tel, ft.Row([ft.ElevatedButton("Cancelar", on_click=lambda e:navegar("plantel"), bgcolor="grey", color="white"), ft.ElevatedButton("GUARDAR", on_click=save, bgcolor=C_VERDE, color="white")])])); page.update()
-        items = []
-        for j in lista_jugadoras_raw:
-            btn = ft.ElevatedButton("✏️", bgcolor=C_BLANCO, color=C_AZUL, width=50, on_click=lambda e, x=j: form(x))
-            items.append(ft.Container(content=ft.Row([ft.Text("👤", size=20), ft.Column([ft.Text(f"{j['nombre']} {j['apellido']}", weight="bold"), ft.Text(f"Camiseta: {j.get('camiseta','-')}", size=12, color="grey")], expand=True), btn]), padding=10, border=ft.Border.all(1, "#EEE")))
-        return ft.Column([ft.Row([ft.Text("Mi Plantel", size=20, weight="bold"), ft.ElevatedButton("+ ALTA", on_click=lambda e:form(None), bgcolor=C_AZUL, color="white")], alignment="spaceBetween"), ft.Column(items, spacing=5)])
+        lista = ft.Column(spacing=5); txt_aviso = ft.Text("", size=12, color="grey")
+        def render(e=None):
+            # Con planteles grandes se dibujan solo las primeras LIMITE_LISTA coincidencias
+            indice = PLANTEL.indice(); q = txt_buscar.value or ""
+            encontradas = indice.buscar(q, limite=LIMITE_LISTA + 1)
+            lista.controls.clear()
+            for j in encontradas[:LIMITE_LISTA]:
+                btn = ft.ElevatedButton("✏️", bgcolor=C_BLANCO, color=C_AZUL, width=50, on_click=lambda e, x=j: form(x))
+                lista.controls.append(ft.Container(content=ft.Row([ft.Text("👤", size=20), ft.Column([ft.Text(f"{j['nombre']} {j['apellido']}", weight="bold"), ft.Text(f"Camiseta: {j.get('camiseta','-')}", size=12, color="grey")], expand=True), btn]), padding=10, border=ft.Border.all(1, "#EEE")))
+            if len(encontradas) > LIMITE_LISTA: txt_aviso.value = f"Mostrando {LIMITE_LISTA} de {indice.cuenta(q)}: refiná la búsqueda"
+            elif q.strip() and not encontradas: txt_aviso.value = "Sin coincidencias"
+            else: txt_aviso.value = ""
+            if e is not None: page.update()
+        txt_buscar = ft.TextField(label="🔍 Buscar (nombre, apellido, DNI, camiseta)", dense=True, on_change=render)
+
+        # --- IMPORTACIÓN MASIVA (importar_plantel.py) ---
+        resultado = ft.Column(spacing=2); subida = [None]
+        def importar(ruta):
+            txt_estado.value = "📥 Importando plantel..."; resultado.controls.clear(); page.update()
+            try:
+                registros, errores = importar_plantel.validar(importar_plantel.leer_archivo(ruta))
+                ediciones, altas, sin_nombre = importar_plantel.planificar(registros, PLANTEL.actual())
+                for c in importar_plantel.escribir(ws_jugadoras, ediciones, altas): avisar(c)
+                errores = sorted(errores + sin_nombre)
+                txt_estado.value = f"✅ Importación: {len(altas)} altas, {len(ediciones)} actualizadas, {len(errores)} filas con error"
+                for n, motivo in errores[:LIMITE_LISTA]: resultado.controls.append(ft.Text(f"Línea {n}: {motivo}", size=12, color=C_ROJO))
+                if len(errores) > LIMITE_LISTA: resultado.controls.append(ft.Text(f"... y {len(errores) - LIMITE_LISTA} más", size=12, color="grey"))
+                render()
+            except Exception as ex: txt_estado.value = f"❌ Importación: {ex}"
+            page.update()
+        def al_subir(e):
+            if e.error: txt_estado.value = f"❌ Subida: {e.error}"; page.update(); return
+            if e.progress is None or e.progress < 1 or not subida[0]: return
+            ruta = os.path.join(DIR_SUBIDAS, subida[0]); subida[0] = None
+            try: importar(ruta)
+            finally:
+                try: os.remove(ruta)
+                except OSError: pass
+        selector = ft.FilePicker(on_upload=al_subir)
+        async def elegir_archivo(e):
+            archivos = await selector.pick_files(dialog_title="Importar plantel (CSV o XLSX)", file_type=ft.FilePickerFileType.CUSTOM, allowed_extensions=list(importar_plantel.EXTENSIONES))
+            if not archivos: return
+            f = archivos[0]
+            if f.path: importar(f.path); return  # escritorio: se lee directo del disco
+            # Web: el navegador lo sube a DIR_SUBIDAS y al terminar (al_subir) se importa
+            subida[0] = f"plantel_{int(time.time() * 1000)}_{f.name}"
+            await selector.upload([ft.FilePickerUploadFile(upload_url=page.get_upload_url(subida[0], 600), id=f.id)])
+
+        render()
+        oyentes["jugadoras"] = render  # el plantel compartido ya tiene el cambio: solo se redibuja
+        return ft.Column([ft.Row([ft.Text("Mi Plantel", size=20, weight="bold"), ft.Row([ft.ElevatedButton("📥 IMPORTAR", on_click=elegir_archivo, bgcolor=C_VIOLETA, color="white", tooltip="CSV o XLSX con encabezados: nombre, apellido, dni, nacimiento, posicion, telefono, activo, camiseta"), ft.ElevatedButton("+ ALTA", on_click=lambda e:form(None), bgcolor=C_AZUL, color="white")])], alignment="spaceBetween"), txt_buscar, txt_aviso, resultado, lista])
 
     def vista_reporte_completo():
         txt_estado.value = "📊 Generando reporte general..."; page.update()
         tabla = ft.DataTable(columns=[ft.DataColumn(ft.Text("Jugadora")), ft.DataColumn(ft.Text("Ent.")), ft.DataColumn(ft.Text("Part.")), ft.DataColumn(ft.Text("Hab.")), ft.DataColumn(ft.Text("Fís.")), ft.DataColumn(ft.Text("PDF")), ft.DataColumn(ft.Text("Ver"))], rows=[])
         try:
-            raw_asist = ws_asistencia.get_all_values(); raw_hab = ws_habilidades.get_all_values()
-            stats = {str(j['dni']): {'ent':0, 'part':0, 'hab_sum':0, 'hab_count':0, 'fis_sum':0, 'fis_count':0} for j in lista_jugadoras_raw}
-            for r in raw_asist[1:]:
-                if str(r[1]) in stats and r[2] == "SI":
-                    if "Entrenamiento" in r[3]: stats[str(r[1])]['ent'] += 1
-                    elif "Partido" in r[3]: stats[str(r[1])]['part'] += 1
+            bits = asistencia_bits.de_filas(ws_asistencia.get_all_values()); raw_hab = ws_habilidades.get_all_values()
+            plantel_v = PLANTEL.actual()
+            stats = {str(j['dni']): {'ent': bits.total(str(j['dni']), "Entrenamiento"), 'part': bits.total(str(j['dni']), "Partido"), 'hab_sum':0, 'hab_count':0, 'fis_sum':0, 'fis_count':0} for j in plantel_v}
             for r in raw_hab[1:]:
                 dni = str(r[1])
                 if dni in stats:
                     vals = [safe_int(r[i+2]) for i in range(len(TITULOS_SKILLS))]
                     prom_tec = sum(vals[:5]) / 5
                     stats[dni]['hab_sum'] += prom_tec; stats[dni]['hab_count'] += 1; stats[dni]['fis_sum'] += vals[5]; stats[dni]['fis_count'] += 1
-            for j in lista_jugadoras_raw:
+            for j in plantel_v:
                 d = stats[str(j['dni'])]
                 prom_hab = int(d['hab_sum'] / d['hab_count']) if d['hab_count'] > 0 else 0
                 prom_fis = int(d['fis_sum'] / d['fis_count']) if d['fis_count'] > 0 else 0
@@ -979,16 +1227,23 @@ def main(page: ft.Page):
         nonlocal ws_fixture
         if ws_fixture is None: return ft.Text("Falta hoja fixture")
         hoy = datetime.now(); mes_v = [hoy.month]; anio_v = [hoy.year]; contenedor_cal = ft.Container()
+        # Copia local del fixture: filas[i] es la fila i+2 de la hoja; por_mes[(año, mes)] = {día: color}.
+        # Paginar el calendario no toca la red; solo 🔄 ACTUALIZAR vuelve a leer la hoja.
+        fix = {"filas": [], "por_mes": {}}
+        def indexar():
+            por_mes = {}
+            for r in fix["filas"]:
+                try: dt = parse_fecha(r[0])
+                except (ValueError, IndexError): continue
+                por_mes.setdefault((dt.year, dt.month), {})[dt.day] = C_AZUL if len(r) > 2 and r[2] == "Local" else "#FF9800"
+            fix["por_mes"] = por_mes
+        def leer_fix(fresca=False):
+            # fresca: desde 🔄 ACTUALIZAR, sin el memo de la navegación (filas agregadas a mano en Sheets)
+            try: fix["filas"] = [list(r) for r in (ws_fixture.releer() if fresca else ws_fixture.get_all_values())[1:]]
+            except Exception as ex: txt_estado.value = str(ex)
+            indexar()
         def actualizar_cal():
-            m, a = mes_v[0], anio_v[0]; pe = {}
-            try:
-                raw = ws_fixture.get_all_values()
-                for r in raw[1:]:
-                    try:
-                        dt = datetime.strptime(r[0], "%d/%m/%Y")
-                        if dt.month == m and dt.year == a: pe[dt.day] = C_AZUL if r[2] == "Local" else "#FF9800"
-                    except: pass
-            except: pass
+            m, a = mes_v[0], anio_v[0]; pe = fix["por_mes"].get((a, m), {})
             cal = calendar.monthcalendar(a, m)
             fc = [ft.Row([ft.Container(content=ft.Text(d, size=10, weight="bold"), width=35, height=35, alignment=ft.alignment.Alignment(0,0)) for d in LETRAS_DIAS], alignment="center")]
             for sem in cal:
@@ -1009,7 +1264,7 @@ def main(page: ft.Page):
             else: mes_v[0] += 1
             actualizar_cal()
         
-        edit_idx = [-1]; txt_f = ft.TextField(label="Fecha", width=150); txt_r = ft.TextField(label="Rival", expand=True); dd_c = ft.Dropdown(options=[ft.dropdown.Option("Local"), ft.dropdown.Option("Visitante")], value="Local", width=120); 
+        edit_idx = [-1]; edit_original = [None]; txt_f = ft.TextField(label="Fecha", width=150); txt_r = ft.TextField(label="Rival", expand=True); dd_c = ft.Dropdown(options=[ft.dropdown.Option("Local"), ft.dropdown.Option("Visitante")], value="Local", width=120); 
         # NUEVO CAMPO MAPS
         txt_maps = ft.TextField(label="Link Ubicación (Maps)", expand=True)
         col_partidos = ft.Column(scroll="auto", expand=True); btn_accion = ft.ElevatedButton("AGREGAR PARTIDO", bgcolor=C_VERDE, color="white")
@@ -1017,9 +1272,19 @@ def main(page: ft.Page):
         def procesar(e):
             row_data = [txt_f.value, txt_r.value, dd_c.value, txt_maps.value]
             try:
-                if edit_idx[0] != -1: ws_fixture.delete_rows(edit_idx[0]); ws_fixture.insert_row(row_data, edit_idx[0]); edit_idx[0] = -1; btn_accion.content = ft.Text("AGREGAR PARTIDO")
-                else: ws_fixture.append_row(row_data)
-                txt_r.value=""; txt_maps.value=""; cargar_fix(); actualizar_cal()
+                if edit_idx[0] != -1:
+                    # Una sola escritura en el lugar; antes se confirma que la fila siga siendo la que se editó
+                    with COORDINADOR.compartida("fixture", tuple(edit_original[0][:2])):
+                        idx = ubicar_fila(ws_fixture, edit_idx[0], edit_original[0])
+                        ws_fixture.update(f"A{idx}:D{idx}", [row_data])
+                    if idx == edit_idx[0]: fix["filas"][idx - 2] = row_data
+                    else: leer_fix()  # otra sesión movió filas: la copia local ya no sirve
+                    avisar(Cambio("fixture", "actualizar", fila=idx, filas=[row_data]))
+                    edit_idx[0] = -1; btn_accion.content = ft.Text("AGREGAR PARTIDO")
+                else:
+                    with COORDINADOR.compartida("fixture"): ws_fixture.append_row(row_data)
+                    fix["filas"].append(row_data); avisar(Cambio("fixture", "agregar", filas=[row_data]))
+                indexar(); txt_r.value=""; txt_maps.value=""; cargar_fix(); actualizar_cal()
             except Exception as ex: txt_estado.value = str(ex); page.update()
         
         btn_accion.on_click = procesar
@@ -1027,8 +1292,7 @@ def main(page: ft.Page):
         def cargar_fix():
             col_partidos.controls.clear()
             try:
-                raw = ws_fixture.get_all_values()
-                for i, r in enumerate(raw[1:]):
+                for i, r in enumerate(fix["filas"]):
                     real_idx = i + 2
                     botones = []
                     f_date = r[0]; f_rival = r[1]; f_cond = r[2]
@@ -1038,7 +1302,7 @@ def main(page: ft.Page):
                         botones.append(ft.TextButton("📍 Ver Ubicación", url=f_map_link))
                     
                     btn_edit = ft.TextButton("✏️", on_click=lambda e, idx=real_idx, d=r: preparar(idx, d))
-                    btn_del = ft.TextButton("🗑️", on_click=lambda e, idx=real_idx: borrar(idx))
+                    btn_del = ft.TextButton("🗑️", on_click=lambda e, idx=real_idx, d=r: borrar(idx, d))
 
                     card = ft.Card(
                         content=ft.Container(
@@ -1061,15 +1325,35 @@ def main(page: ft.Page):
             txt_f.value=d[0]; txt_r.value=d[1]; dd_c.value=d[2]; 
             if len(d) > 3: txt_maps.value = d[3]
             else: txt_maps.value = ""
-            edit_idx[0]=idx; btn_accion.content = ft.Text("GUARDAR"); page.update()
+            edit_idx[0]=idx; edit_original[0]=list(d); btn_accion.content = ft.Text("GUARDAR"); page.update()
         
-        def borrar(idx): ws_fixture.delete_rows(idx); cargar_fix(); actualizar_cal()
+        def borrar(idx, original):
+            try:
+                # Borrar corre filas: exclusivo, y se borra la fila que se vio aunque otra sesión la haya movido
+                with COORDINADOR.exclusiva("fixture"):
+                    fila = ubicar_fila(ws_fixture, idx, original); ws_fixture.delete_rows(fila)
+                if fila == idx: del fix["filas"][idx - 2]
+                else: leer_fix()
+                avisar(Cambio("fixture", "borrar", fila=fila))
+            except Exception as ex: txt_estado.value = str(ex)
+            indexar(); cargar_fix(); actualizar_cal()
         
-        cargar_fix(); actualizar_cal()
+        def recargar(e=None, fresca=True): leer_fix(fresca); cargar_fix(); actualizar_cal()
+        
+        def cambio_externo(c):
+            # Otra sesión tocó el fixture: se aplica a la copia local; si borró una fila de arriba, la edición en curso se corre
+            fix["filas"] = cambios.aplicar(fix["filas"], c, primera=2)
+            if c.op == "borrar" and edit_idx[0] != -1:
+                if c.fila < edit_idx[0]: edit_idx[0] -= 1
+                elif c.fila == edit_idx[0]: edit_idx[0] = -1; btn_accion.content = ft.Text("AGREGAR PARTIDO")
+            indexar(); cargar_fix(); actualizar_cal()
+        oyentes["fixture"] = cambio_externo
+        
+        recargar(fresca=False)  # al armar la vista alcanza con la lectura de la navegación
         
         # BOTONES DE NAVEGACION Y ACCION
         btn_volver = ft.ElevatedButton("VOLVER", on_click=lambda e: navegar("part"), bgcolor="grey", color="white")
-        btn_actualizar = ft.ElevatedButton("🔄 ACTUALIZAR", on_click=lambda e: cargar_fix(), bgcolor=C_AZUL, color="white", expand=True)
+        btn_actualizar = ft.ElevatedButton("🔄 ACTUALIZAR", on_click=recargar, bgcolor=C_AZUL, color="white", expand=True)
         # ACÁ ELIMINÉ EL BOTÓN CRONOGRAMA
         
         return ft.Column([
@@ -1125,9 +1409,93 @@ def main(page: ft.Page):
             ft.ElevatedButton("VOLVER", on_click=lambda e: navegar("part"))
         ])
 
+    # --- PARTIDO EN VIVO DE LA SESIÓN (partido_vivo.py) ---
+    # Vive en memoria de la sesión y, copiado en cada toque, en el almacenamiento del dispositivo (SharedPreferences):
+    # si se corta la conexión en pleno partido, al volver a "Resultados" se ofrece retomarlo.
+    vivo = [None]; preferencias = ft.SharedPreferences()
+    def copiar_vivo():
+        if not hasattr(page, "run_task"): return  # sesión sin pantalla (programador/cli/benchmark)
+        try:
+            if vivo[0] is None: page.run_task(preferencias.remove, partido_vivo.CLAVE)
+            else: page.run_task(preferencias.set, partido_vivo.CLAVE, vivo[0].a_texto())
+        except Exception as ex: logging.getLogger("hockeyapp.vivo").warning("no se pudo guardar en el dispositivo: %s", ex)
+
+    def vista_en_vivo():
+        pv = vivo[0]; abierta = [True]
+        txt_marcador = ft.Text("", size=36, weight="bold", color=C_AZUL); txt_reloj = ft.Text("", size=18, weight="bold")
+        txt_corners = ft.Text("", size=12, color="grey"); lista_ev = ft.Column(spacing=2)
+        def opciones(q=""): return [ft.dropdown.Option(f"{j['nombre']} {j['apellido']}") for j in PLANTEL.indice().buscar(q)]
+        dd_jug = ft.Dropdown(label="Jugadora (en un cambio, la que entra)", options=opciones(), expand=True)
+        dd_sale = ft.Dropdown(label="Sale", options=opciones(), expand=True)
+        # Las dos listas muestran hasta LIMITE_OPCIONES: con planteles grandes se llega a cualquiera buscando
+        def filtrar(dd, txt):
+            dd.options = opciones(txt.value or ""); dd.value = None; dd.update()
+        txt_buscar_j = ft.TextField(label="🔍", width=110, dense=True, on_change=lambda e: filtrar(dd_jug, txt_buscar_j))
+        txt_buscar_s = ft.TextField(label="🔍", width=110, dense=True, on_change=lambda e: filtrar(dd_sale, txt_buscar_s))
+        btn_reloj = ft.ElevatedButton("", on_click=lambda e: (pv.alternar_reloj(), copiar_vivo(), refrescar()))
+        def refrescar():
+            gf, gc = pv.marcador(); cf, cc = pv.corners()
+            local = pv.condicion == "Local"
+            txt_marcador.value = f"{club_actual[0] if local else pv.rival} {gf if local else gc} - {gc if local else gf} {pv.rival if local else club_actual[0]}"
+            txt_reloj.value = f"Q{pv.cuarto} · {pv.minuto()}"; btn_reloj.content = "⏸ PAUSA" if pv.corriendo() else "▶ RELOJ"
+            txt_corners.value = f"Corners cortos: {cf} a favor - {cc} en contra"
+            lista_ev.controls.clear()
+            for ev in reversed(pv.eventos[-LIMITE_OPCIONES:]):
+                quien = ev.get("jugadora", "") + (f" ⇄ {ev['sale']}" if ev.get("sale") else "")
+                lista_ev.controls.append(ft.Text(f"Q{ev['cuarto']} {ev['min']}  {partido_vivo.TIPOS[ev['tipo']][0]}  {quien}", size=13))
+            page.update()
+        def anotar(tipo):
+            try: pv.registrar(tipo, dd_jug.value or "", (dd_sale.value or "") if tipo == "cambio" else "")
+            except ValueError as ex: txt_estado.value = f"⚠️ {ex}"; page.update(); return
+            dd_jug.value = None; dd_sale.value = None; txt_estado.value = ""
+            copiar_vivo(); refrescar()
+        def deshacer(e): pv.deshacer(); copiar_vivo(); refrescar()
+        def cuarto(e):
+            if pv.siguiente_cuarto(): copiar_vivo(); refrescar()
+        def final(e):
+            # La única escritura del partido: resultado, corners, goleadoras y eventos en una fila.
+            # Si falla (sin conexión), el partido sigue en el dispositivo y se puede reintentar.
+            fila = pv.fila(); txt_estado.value = "⏳ Guardando partido..."; page.update()
+            try:
+                with COORDINADOR.compartida("partidos"): ws_partidos.append_row(fila)
+            except Exception as ex: txt_estado.value = f"❌ No se guardó, reintentá: {ex}"; page.update(); return
+            avisar(Cambio("partidos", "agregar", filas=[fila]))
+            vivo[0] = None; abierta[0] = False; copiar_vivo()
+            txt_estado.value = "✅ Partido guardado"; navegar("part")
+        def descartar(e):
+            vivo[0] = None; abierta[0] = False; copiar_vivo(); navegar("part")
+        def salir(e): abierta[0] = False; navegar("part")
+        async def tic():
+            # El reloj en pantalla avanza solo mientras esta vista está abierta (sin red: solo la página)
+            while abierta[0] and vivo[0] is pv:
+                if pv.corriendo():
+                    txt_reloj.value = f"Q{pv.cuarto} · {pv.minuto()}"
+                    try: txt_reloj.update()
+                    except Exception: return
+                await asyncio.sleep(1)
+        def boton(tipo, color): return ft.ElevatedButton(partido_vivo.TIPOS[tipo][0], on_click=lambda e: anotar(tipo), bgcolor=color, color="white")
+        refrescar()
+        if hasattr(page, "run_task"): page.run_task(tic)
+        columna_contenido.controls.clear()
+        columna_contenido.controls.append(ft.Column([
+            ft.Row([ft.Text(f"🔴 En vivo · {pv.fecha}", size=16, weight="bold"), ft.ElevatedButton("VOLVER", on_click=salir)], alignment="spaceBetween"),
+            txt_marcador, ft.Row([txt_reloj, btn_reloj, ft.ElevatedButton("Siguiente cuarto", on_click=cuarto)]), txt_corners,
+            ft.Row([txt_buscar_j, dd_jug]), ft.Row([txt_buscar_s, dd_sale]),
+            ft.Row([boton("gol", C_VERDE), boton("gol_rival", C_ROJO)], wrap=True),
+            ft.Row([boton("corner", C_AZUL), boton("corner_rival", C_GRIS_TXT)], wrap=True),
+            ft.Row([boton("verde", "#388E3C"), boton("amarilla", "#F9A825"), boton("roja", "#C62828"), boton("cambio", C_VIOLETA)], wrap=True),
+            ft.Row([ft.ElevatedButton("↩️ DESHACER", on_click=deshacer), ft.ElevatedButton("🏁 FINAL", on_click=final, bgcolor=C_VERDE, color="white"),
+                    ft.ElevatedButton("Descartar", on_click=descartar, bgcolor="grey", color="white")], wrap=True),
+            ft.Divider(), lista_ev], scroll="auto"))
+        page.update()
+
     def vista_partidos():
-        c_jug = len(ws_partidos.get_all_values()); c_tot = len(ws_fixture.get_all_values())-1 if ws_fixture else 0
-        top = ft.Container(content=ft.Text(f"Jugados: {c_jug}/{c_tot}", color="white"), bgcolor="#607D8B", padding=5)
+        txt_jugados = ft.Text("", color="white")
+        def contar():
+            c_jug = len(ws_partidos.get_all_values()); c_tot = len(ws_fixture.get_all_values())-1 if ws_fixture else 0
+            txt_jugados.value = f"Jugados: {c_jug}/{c_tot}"
+        contar()
+        top = ft.Container(content=txt_jugados, bgcolor="#607D8B", padding=5)
         rivales_set = set()
         if ws_fixture:
             try: rivales_set = set(r[1].strip() for r in ws_fixture.get_all_values()[1:] if len(r)>1)
@@ -1138,8 +1506,13 @@ def main(page: ft.Page):
         cf = ft.TextField(label="Corn F", width=80); cc = ft.TextField(label="Corn C", width=80)
         hist = ft.Column()
         goleadoras_dict = {}; lista_goles = ft.Column()
-        opciones_jug = [ft.dropdown.Option(f"{j['nombre']} {j['apellido']}") for j in lista_jugadoras_raw]
-        dd_autora = ft.Dropdown(label="Jugadora", options=opciones_jug, expand=True)
+        def opciones_autora(q=""):
+            # Solo las primeras LIMITE_OPCIONES coincidencias viajan al navegador
+            return [ft.dropdown.Option(f"{j['nombre']} {j['apellido']}") for j in PLANTEL.indice().buscar(q)]
+        dd_autora = ft.Dropdown(label="Jugadora", options=opciones_autora(), expand=True)
+        def filtrar_autora(e):
+            dd_autora.options = opciones_autora(txt_autora.value or ""); dd_autora.value = None; dd_autora.update()
+        txt_autora = ft.TextField(label="🔍 Buscar", width=140, dense=True, on_change=filtrar_autora)
         def act_goles():
             lista_goles.controls.clear()
             for n, c in goleadoras_dict.items():
@@ -1166,27 +1539,88 @@ def main(page: ft.Page):
                         texto_res = f"Res: {data[3]} - {data[4]} (R) | Corn: {data[5]}(f) - {data[6]}(c)"
                         
                         card = ft.Container(content=ft.Column([
-                            ft.Row([ft.Text(f"{data[0]}", weight="bold"), ft.Container(expand=True), ft.TextButton("🗑️", on_click=lambda e, ix=idx_real: borrar(idx_real))]),
+                            ft.Row([ft.Text(f"{data[0]}", weight="bold"), ft.Container(expand=True), ft.TextButton("🗑️", on_click=lambda e, ix=idx_real, d=data: borrar(ix, d))]),
                             ft.Text(titulo_partido),
                             ft.Text(texto_res),
-                            ft.Text(f"Goles: {data[7]}" if len(data)>7 else "")
+                            ft.Text(f"Goles: {data[7]}" if len(data)>7 else ""),
+                            ft.Text(partido_vivo.resumen_eventos(data[8]) if len(data)>8 else "", size=12, color="grey")
                         ]), padding=10, border=ft.Border.all(1, "grey"), border_radius=5)
                         hist.controls.append(card)
             except: pass
             page.update()
-        def borrar(ix): ws_partidos.delete_rows(ix); load_hist()
+        def borrar(ix, original):
+            try:
+                with COORDINADOR.exclusiva("partidos"):
+                    fila = ubicar_fila(ws_partidos, ix, original); ws_partidos.delete_rows(fila)
+                avisar(Cambio("partidos", "borrar", fila=fila))
+            except Exception as ex: txt_estado.value = str(ex)
+            contar(); load_hist()
         def sv(e):
             txt_gol = ", ".join([f"{n} ({c})" for n,c in goleadoras_dict.items()])
-            ws_partidos.append_row([datetime.now().strftime("%d/%m/%Y"), dd_rival.value, dc.value, gf.value, gc.value, cf.value, cc.value, txt_gol])
-            goleadoras_dict.clear(); act_goles(); load_hist()
+            fila = [datetime.now().strftime("%d/%m/%Y"), dd_rival.value, dc.value, gf.value, gc.value, cf.value, cc.value, txt_gol]
+            with COORDINADOR.compartida("partidos"): ws_partidos.append_row(fila)
+            avisar(Cambio("partidos", "agregar", filas=[fila]))
+            goleadoras_dict.clear(); act_goles(); contar(); load_hist()
         load_hist()
+        oyentes["partidos"] = lambda c: (contar(), load_hist())
+        oyentes["fixture"] = lambda c: (contar(), page.update())
+
+        # --- EN VIVO: arranca con el rival/condición elegidos arriba; si hay uno a medias, se retoma ---
+        btn_vivo = ft.ElevatedButton("🔴 EN VIVO", bgcolor=C_ROJO, color="white")
+        def marcar_reanudar():
+            if vivo[0] is not None: btn_vivo.content = f"▶ RETOMAR vs {vivo[0].rival}"
+        def en_vivo(e):
+            if vivo[0] is None:
+                if not dd_rival.value: txt_estado.value = "⚠️ Elegí el rival"; page.update(); return
+                vivo[0] = partido_vivo.PartidoVivo(dd_rival.value, dc.value); copiar_vivo()
+            vista_en_vivo()
+        btn_vivo.on_click = en_vivo
+        async def recuperar():
+            # Tras una reconexión la sesión es nueva: el partido a medias está en el dispositivo
+            pv = partido_vivo.PartidoVivo.desde_texto(await preferencias.get(partido_vivo.CLAVE))
+            if pv is not None and vivo[0] is None: vivo[0] = pv; marcar_reanudar(); page.update()
+        marcar_reanudar()
+        if vivo[0] is None and hasattr(page, "run_task"): page.run_task(recuperar)
         return ft.Column([ft.Text("Resultados", size=20, weight="bold"), top, 
                           ft.Row([ft.ElevatedButton("📅 FIXTURE", on_click=lambda e: navegar("fixture_full")), ft.ElevatedButton("📊 RESUMEN", on_click=lambda e: navegar("resumen_partidos"))]),
-                          ft.Divider(),
+                          btn_vivo, ft.Divider(),
                           ft.Row([dd_rival, dc]), ft.Row([gf, gc]), ft.Row([cf, cc]),
-                          ft.Text("Goleadoras:"), ft.Row([dd_autora, ft.ElevatedButton("+", on_click=add_gol)]), lista_goles,
+                          ft.Text("Goleadoras:"), ft.Row([txt_autora, dd_autora, ft.ElevatedButton("+", on_click=add_gol)]), lista_goles,
                           ft.ElevatedButton("GUARDAR", on_click=sv), ft.Divider(), hist], scroll="auto")
 
+    # Hojas que lee cada vista (al armarse y desde sus botones): bajan juntas en un values_batch_get al entrar
+    HOJAS_VISTA = {
+        "asis": ("asistencia",), "stats": ("asistencia",), "eval": ("habilidades",),
+        "part": ("partidos", "fixture"), "resumen_partidos": ("partidos",), "plantel": (),
+        "ficha": ("asistencia", "habilidades", "partidos"), "fixture_full": ("fixture",), "formacion": ("fixture",),
+    }
+    # A dónde se suele ir desde cada vista (sus botones y el camino de vuelta): anticipar.py baja esas hojas antes
+    SIGUIENTES = {
+        "asis": ("stats",), "stats": ("asis",), "part": ("fixture_full", "resumen_partidos"),
+        "fixture_full": ("part",), "resumen_partidos": ("part",), "formacion": ("part",), "plantel": ("ficha",),
+    }
+    def hojas_de(destino): return [t for t in HOJAS_VISTA.get(destino, ()) if t != "fixture" or ws_fixture is not None]
+    anticipador = Anticipador(lectura, hojas_de, SIGUIENTES)
+    def con_lectura(destino, vista):
+        titulos = hojas_de(destino)
+        def armar():
+            lectura.nueva(titulos); oyentes.clear()
+            PLANTEL.asegurar_cargado(ws_jugadoras)  # vencido: se relee (del memo si la vista trajo 'jugadoras')
+            return vista()
+        return armar
+
+    VISTAS = {k: con_lectura(k, v) for k, v in {
+        "asis": vista_asistencia, "stats": vista_estadisticas_asistencia, "eval": vista_evaluacion,
+        "part": vista_partidos, "resumen_partidos": vista_resumen_partidos, "plantel": vista_plantel,
+        "ficha": vista_reporte_completo, "fixture_full": vista_gestion_fixture, "formacion": vista_formacion,
+    }.items()}
+
+    # Acceso a las vistas y reportes de esta sesión (benchmark.py / prueba_carga.py / programador.py / cli.py)
+    sesion = SimpleNamespace(vistas=VISTAS, navegar=navegar, categoria=categoria_actual, reportes={
+        "formacion": generar_pdf_formacion, "ficha": generar_pdf_individual, "mensual": generar_pdf_mensual_grafico,
+        "temporada": generar_pdf_temporada})
+    if not pantalla: return sesion
+
     # =========================================================
     # MENÚ
     # =========================================================
@@ -1200,18 +1634,27 @@ def main(page: ft.Page):
         ft.ElevatedButton("📄", data="ficha", on_click=navegar, bgcolor=C_VIOLETA, style=btn_s, expand=True),
     ], spacing=0), padding=0)
 
-    columna_contenido.controls.append(vista_asistencia())
+    with metricas.medir("vista", "asis"): columna_contenido.controls.append(vista_asistencia())
     page.add(menu, contenedor_principal, ft.Container(content=txt_estado, padding=5, bgcolor="#EEE"))
+    return sesion
 
 if __name__ == "__main__":
     # --- CONFIGURACIÓN PARA RENDER ---
     port = int(os.environ.get("PORT", 8000))
     
+    # MÉTRICAS: Prometheus en 127.0.0.1:METRICS_PORT/metrics + logs JSON por stderr
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(asctime)s %(name)s %(message)s")
+    puerto_metricas = int(os.environ.get("METRICS_PORT", 9464))
+    if puerto_metricas: metricas.iniciar_servidor(puerto_metricas)
+    # Reportes de fin de semana/mes generados de madrugada (PRECALCULO_HORA, -1 lo apaga)
+    Programador().iniciar()
+    
     # CORRECCIÓN: Usamos ft.AppView.WEB_BROWSER y mantenemos el host="0.0.0.0"
     ft.app(
         target=main, 
         view=ft.AppView.WEB_BROWSER, 
         port=port, 
         host="0.0.0.0", 
-        assets_dir="assets"
+        assets_dir="assets",
+        upload_dir=DIR_SUBIDAS
     )
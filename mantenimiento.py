@@ -0,0 +1,184 @@
+# --- MANTENIMIENTO: COMPACTAR HOJAS ---
+# Con el uso las hojas juntan basura que cada lectura paga: filas (fecha, DNI) de asistencia repetidas,
+# evaluaciones (mes, DNI) duplicadas cuando la búsqueda de fila no acertó, filas vacías y cabeceras viejas
+# pegadas en el medio. Esto compacta el libro contra una sola foto (un values_batch_get):
+#   - por clave lógica queda la última fila escrita (last-write-wins), en el lugar de esa última
+#   - se quitan las filas vacías y las cabeceras repetidas
+#   - las fechas quedan DD/MM/AAAA y los DNI sin puntos ni espacios (también en la clave: "30.123.456" = "30123456")
+# y escribe todo de vuelta en una sola llamada (values_batch_update); las filas que sobran al final se eliminan
+# de la grilla con otra (batch_update con deleteDimension), así las lecturas siguientes no las vuelven a traer.
+# Uso: python mantenimiento.py                     -> solo el informe y las filas que cambiarían (no escribe)
+#      python mantenimiento.py --aplicar           -> respaldo CSV de la foto + escritura
+# Correrlo con la app parada o en horas sin uso: lo que se escriba entre la foto y la escritura se pierde.
+import argparse
+import difflib
+import os
+import re
+from collections import namedtuple
+from datetime import date, datetime
+
+from buscador import normalizar
+from exportar import COLUMNAS_PARTIDOS, escribir_csv
+from hojas import HOJAS, leer_hojas
+
+# columnas con fecha / con DNI; clave(fila) -> clave lógica (None = la fila entera); cabecera si la hoja no tiene
+Regla = namedtuple("Regla", "fechas clave dni cabecera", defaults=(None, None, None))
+REGLAS = {
+    "jugadoras": Regla(fechas=(4,), dni=3, clave=lambda f: f[3] or tuple(f)),
+    "asistencia": Regla(fechas=(0,), dni=1, clave=lambda f: (f[0], f[1])),
+    "habilidades": Regla(fechas=(0,), dni=1, clave=lambda f: (f[0][3:], f[1])),  # una evaluación por mes y jugadora
+    "fixture": Regla(fechas=(0,), clave=lambda f: (f[0], normalizar(f[1]).strip())),
+    # sin cabecera en la planilla: se detectan las que alguien pegó a mano con los nombres de exportar.py
+    "partidos": Regla(fechas=(0,), cabecera=COLUMNAS_PARTIDOS),
+}
+
+Resumen = namedtuple("Resumen", "antes vacias cabeceras duplicadas fechas dnis despues")
+
+
+def normalizar_fecha(txt, hoy=None):
+    # d/m/aaaa, dd-mm-aaaa, d.m.aa, aaaa-mm-dd -> "dd/mm/aaaa"; lo que no es fecha vuelve igual.
+    # Año de dos cifras: hasta el año en curso es 20aa, después 19aa (un nacimiento "12/03/98" es de 1998)
+    t = txt.strip()
+    m = re.fullmatch(r"(\d{1,2})[/.-](\d{1,2})[/.-](\d{2}|\d{4})", t)
+    if m: d, mes, a = m.groups()
+    else:
+        m = re.fullmatch(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T].*)?", t)
+        if not m: return txt
+        a, mes, d = m.groups()
+    if len(a) == 2: a = f"{20 if int(a) <= (hoy or date.today()).year % 100 else 19}{a}"
+    try: return date(int(a), int(mes), int(d)).strftime("%d/%m/%Y")
+    except ValueError: return txt
+
+
+def _es_cabecera(fila, cab):
+    # Coincide con la cabecera en las columnas que trae (al menos dos: "Fecha" sola puede ser un dato raro)
+    n = min(len(fila), len(cab or ()))
+    return n >= 2 and [normalizar(c).strip() for c in fila[:n]] == [normalizar(c).strip() for c in cab[:n]]
+
+
+def compactar(filas, regla):
+    """Devuelve (filas compactadas, Resumen). filas = la hoja como la da la API (cabecera incluida si tiene)."""
+    cab = regla.cabecera
+    if cab is None and filas: cab = filas[0]; cuerpo = filas[1:]; salida = [list(cab)]
+    else: cuerpo = filas; salida = []
+    vacias = cabeceras = fechas = dnis = 0; por_clave = {}
+    for f in cuerpo:
+        f = [str(v).strip() for v in f]
+        while f and f[-1] == "": f.pop()
+        if not f: vacias += 1; continue
+        if _es_cabecera(f, cab): cabeceras += 1; continue
+        for c in regla.fechas:
+            if c < len(f) and f[c]:
+                nueva = normalizar_fecha(f[c])
+                if nueva != f[c]: f[c] = nueva; fechas += 1
+        if regla.dni is not None and regla.dni < len(f):
+            dni = f[regla.dni].replace(".", "").replace(" ", "")
+            if dni != f[regla.dni]: f[regla.dni] = dni; dnis += 1
+        ancho = max(len(cab or ()), len(f))
+        completa = f + [""] * (ancho - len(f))
+        clave = regla.clave(completa) if regla.clave else tuple(f)
+        # last-write-wins: la última ocurrencia reemplaza a las anteriores y toma su lugar
+        por_clave.pop(clave, None); por_clave[clave] = f
+    salida += por_clave.values()
+    duplicadas = len(cuerpo) - vacias - cabeceras - len(por_clave)
+    return salida, Resumen(len(filas), vacias, cabeceras, duplicadas, fechas, dnis, len(salida))
+
+
+def _columna(n):
+    # 1 -> A, 27 -> AA
+    letras = ""
+    while n: n, r = divmod(n - 1, 26); letras = chr(65 + r) + letras
+    return letras
+
+
+def escribir(sh, originales, compactadas):
+    # Una values_batch_update: cada hoja se reescribe desde A1 (las celdas que sobran a la derecha quedan en blanco).
+    # Después, un solo batch_update elimina las filas del final que ya no se usan (la grilla necesita al menos una).
+    datos = []; sobran = {}
+    for t, nuevas in compactadas.items():
+        viejas = originales[t]
+        alto = max(len(nuevas), 1); ancho = max((len(f) for f in viejas + nuevas), default=1)
+        valores = [f + [""] * (ancho - len(f)) for f in nuevas] + [[""] * ancho for _ in range(alto - len(nuevas))]
+        datos.append({"range": f"'{t}'!A1:{_columna(ancho)}{alto}", "values": valores})
+        if len(viejas) > alto: sobran[t] = (alto, len(viejas))
+    if datos: sh.values_batch_update({"valueInputOption": "RAW", "data": datos})
+    if sobran:
+        ids = {ws.title: ws.id for ws in sh.worksheets()}
+        sh.batch_update({"requests": [{"deleteDimension": {"range": {"sheetId": ids[t], "dimension": "ROWS",
+                                                                     "startIndex": desde, "endIndex": hasta}}}
+                                      for t, (desde, hasta) in sobran.items()]})
+    return len(datos)
+
+
+def _recortar(filas):
+    # La API devuelve filas rectangulares: para comparar se sacan las celdas vacías del final
+    res = []
+    for f in filas:
+        f = list(f)
+        while f and f[-1] == "": f.pop()
+        res.append(f)
+    return res
+
+
+def diferencias(viejas, nuevas, limite=None):
+    # Líneas "- fila" / "+ fila" de lo que cambia en una hoja (para revisar antes de escribir)
+    a = [" | ".join(f) for f in _recortar(viejas)]; b = [" | ".join(f) for f in nuevas]
+    lineas = [l[0] + " " + l[1:] for l in difflib.unified_diff(a, b, n=0, lineterm="")
+              if l[:1] in "+-" and not l.startswith(("---", "+++"))]
+    return lineas if limite is None else lineas[:limite]
+
+
+def mantener(sh, titulos=HOJAS, aplicar=False, respaldo=None):
+    """Compacta 'titulos' contra una foto del libro.
+
+    Devuelve ({hoja: Resumen}, {hoja que cambia: líneas de diferencias}); con aplicar=True escribe esas hojas.
+    """
+    titulos = [t for t in titulos if t in REGLAS]
+    foto = leer_hojas(sh, titulos)
+    resumen = {}; compactadas = {}
+    for t in titulos:
+        nuevas, r = compactar(foto[t], REGLAS[t]); resumen[t] = r
+        if nuevas != _recortar(foto[t]): compactadas[t] = nuevas
+    if aplicar and compactadas:
+        if respaldo:
+            os.makedirs(respaldo, exist_ok=True)
+            for t in compactadas: escribir_csv(respaldo, t, foto[t])
+        escribir(sh, foto, compactadas)
+        # Los workers (almacen_local.py) no deben seguir sirviendo la foto vieja
+        from almacen_local import ALMACEN
+        if ALMACEN is not None:
+            for t in compactadas: ALMACEN.invalidar(t)
+        # Ni el plantel compartido si corre dentro de la app (en otro proceso lo toma al vencer plantel.VIGENCIA)
+        if "jugadoras" in compactadas:
+            from plantel import PLANTEL, Jugadora
+            PLANTEL.publicar(j for j in map(Jugadora.desde_fila, compactadas["jugadoras"][1:]) if j.dni)
+    return resumen, {t: diferencias(foto[t], nuevas) for t, nuevas in compactadas.items()}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compacta las hojas de HockeyApp_DB (duplicados, vacías, cabeceras, fechas)")
+    ap.add_argument("--hojas", default=",".join(HOJAS), help="hojas separadas por coma")
+    ap.add_argument("--aplicar", action="store_true", help="escribir el resultado (sin esto solo informa)")
+    ap.add_argument("--respaldo", default=os.path.join("exportacion", "respaldo_" + datetime.now().strftime("%Y%m%d_%H%M")),
+                    help="carpeta para el CSV de cada hoja antes de reescribirla ('' = sin respaldo)")
+    ap.add_argument("--lineas", type=int, default=20, help="filas cambiadas a mostrar por hoja en la simulación (0 = todas)")
+    args = ap.parse_args()
+
+    from conexion import conectar_google_sheets
+    sh = conectar_google_sheets()
+    titulos = [t.strip() for t in args.hojas.split(",") if t.strip()]
+    resumen, cambian = mantener(sh, titulos, args.aplicar, args.respaldo)
+    if not args.aplicar:
+        for t, lineas in cambian.items():
+            print(f"== {t}: {len(lineas)} líneas"); print("\n".join(lineas[:args.lineas or None]))
+            if args.lineas and len(lineas) > args.lineas: print(f"   ... ({len(lineas) - args.lineas} más)")
+        print()
+    print(f"{'hoja':12} {'antes':>7} {'vacías':>7} {'cabec.':>7} {'dupl.':>7} {'fechas':>7} {'DNI':>7} {'después':>8}")
+    for t, r in resumen.items():
+        print(f"{t:12} {r.antes:>7} {r.vacias:>7} {r.cabeceras:>7} {r.duplicadas:>7} {r.fechas:>7} {r.dnis:>7} {r.despues:>8}")
+    if not args.aplicar: print("\nSimulación: no se escribió nada" + (f" (usá --aplicar para compactar {', '.join(cambian)})" if cambian else ""))
+    elif cambian: print(f"\nReescritas en una llamada: {', '.join(cambian)}" + (f" (respaldo en {args.respaldo})" if args.respaldo else ""))
+
+
+if __name__ == "__main__":
+    main()
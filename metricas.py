@@ -0,0 +1,206 @@
+# --- MÉTRICAS DE RENDIMIENTO ---
+# Contadores e histogramas por hoja/operación, vista y reporte.
+# Se exponen en formato Prometheus (http://127.0.0.1:PUERTO/metrics) y como logs JSON.
+import errno
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger("hockeyapp.metricas")
+
+# Segundos. Las llamadas a Sheets rondan 0.2-2 s, las vistas y PDFs pueden tardar más.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# Métodos de gspread que contamos como llamadas a la API
+OPERACIONES_HOJA = {"get_all_values", "get_all_records", "get_values", "row_values", "col_values", "acell", "cell",
+                    "append_row", "append_rows", "update", "batch_update", "batch_get", "delete_rows", "insert_row",
+                    "insert_rows", "clear", "batch_clear"}
+OPERACIONES_LIBRO = {"values_batch_get", "values_batch_update", "values_batch_clear", "batch_update", "worksheets"}
+
+
+class Serie:
+    __slots__ = ("cuenta", "errores", "suma", "buckets", "bytes")
+
+    def __init__(self):
+        self.cuenta = 0; self.errores = 0; self.suma = 0.0; self.bytes = 0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observar(self, segundos, error=False, tamano=0):
+        self.cuenta += 1; self.suma += segundos; self.bytes += tamano
+        if error: self.errores += 1
+        for i, limite in enumerate(BUCKETS):
+            if segundos <= limite: self.buckets[i] += 1; break
+
+
+class Registro:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # familia -> {(etiqueta, ...): Serie}
+        self._series = {"sheets": {}, "vista": {}, "reporte": {}}
+
+    def observar(self, familia, etiquetas, segundos, error=False, tamano=0):
+        with self._lock:
+            serie = self._series[familia].get(etiquetas)
+            if serie is None: serie = self._series[familia][etiquetas] = Serie()
+            serie.observar(segundos, error, tamano)
+        evento = {"familia": familia, "seg": round(segundos, 4), "error": error}
+        if familia == "sheets": evento.update(hoja=etiquetas[0], op=etiquetas[1], bytes=tamano)
+        else: evento["nombre"] = etiquetas[0]
+        log.info(json.dumps(evento, ensure_ascii=False))
+
+    def resumen(self):
+        with self._lock:
+            return {fam: {k: (s.cuenta, s.errores, s.suma, s.bytes) for k, s in series.items()} for fam, series in self._series.items()}
+
+    def texto_prometheus(self):
+        nombres = {"sheets": ("hockeyapp_sheets_llamada", ("hoja", "op")),
+                   "vista": ("hockeyapp_vista_build", ("vista",)),
+                   "reporte": ("hockeyapp_reporte", ("tipo",))}
+        lineas = []
+        with self._lock:
+            for fam, series in self._series.items():
+                base, claves = nombres[fam]
+                lineas.append(f"# TYPE {base}_segundos histogram")
+                for etiquetas, s in sorted(series.items()):
+                    lab = ",".join(f'{k}="{_escapar(v)}"' for k, v in zip(claves, etiquetas))
+                    acumulado = 0
+                    for limite, n in zip(BUCKETS, s.buckets):
+                        acumulado += n
+                        le = "+Inf" if limite == float("inf") else repr(limite)
+                        lineas.append(f'{base}_segundos_bucket{{{lab},le="{le}"}} {acumulado}')
+                    lineas.append(f"{base}_segundos_sum{{{lab}}} {s.suma:.6f}")
+                    lineas.append(f"{base}_segundos_count{{{lab}}} {s.cuenta}")
+                lineas.append(f"# TYPE {base}_errores_total counter")
+                for etiquetas, s in sorted(series.items()):
+                    lab = ",".join(f'{k}="{_escapar(v)}"' for k, v in zip(claves, etiquetas))
+                    lineas.append(f"{base}_errores_total{{{lab}}} {s.errores}")
+                if fam == "sheets":
+                    lineas.append(f"# TYPE {base}_bytes_total counter")
+                    for etiquetas, s in sorted(series.items()):
+                        lab = ",".join(f'{k}="{_escapar(v)}"' for k, v in zip(claves, etiquetas))
+                        lineas.append(f"{base}_bytes_total{{{lab}}} {s.bytes}")
+        return "\n".join(lineas) + "\n"
+
+
+REGISTRO = Registro()
+
+
+def _escapar(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Bytes que pasaron por HTTP en esta hebra (respuestas + cuerpos enviados). Cada llamada medida se queda con
+# la diferencia entre el antes y el después: el tamaño sale de la respuesta, sin recorrer las celdas.
+_bytes_http = threading.local()
+
+
+def bytes_http():
+    return getattr(_bytes_http, "n", 0)
+
+
+def _contar_bytes(request):
+    # Envuelve Client.request de gspread (devuelve el requests.Response ya descargado)
+    def envuelta(*args, **kwargs):
+        resp = request(*args, **kwargs)
+        try: enviados = int(resp.request.headers.get("Content-Length") or 0)
+        except (AttributeError, TypeError, ValueError): enviados = 0
+        _bytes_http.n = bytes_http() + len(getattr(resp, "content", b"") or b"") + enviados
+        return resp
+    envuelta.contando_bytes = True
+    return envuelta
+
+
+@contextmanager
+def medir(familia, nombre):
+    t0 = time.perf_counter(); error = False
+    try: yield
+    except Exception:
+        error = True; raise
+    finally: REGISTRO.observar(familia, (nombre,), time.perf_counter() - t0, error)
+
+
+def medir_reporte(tipo):
+    # Los generar_pdf_* devuelven (ok, msg, url) en vez de lanzar: ok=False cuenta como error
+    def deco(fn):
+        def envuelta(*args, **kwargs):
+            t0 = time.perf_counter(); res = None
+            try:
+                res = fn(*args, **kwargs)
+                return res
+            finally:
+                fallo = not (isinstance(res, tuple) and res and res[0])
+                REGISTRO.observar("reporte", (tipo,), time.perf_counter() - t0, fallo)
+        envuelta.__name__ = fn.__name__; envuelta.__wrapped__ = fn
+        return envuelta
+    return deco
+
+
+def _medir_llamada(hoja, op, fn):
+    def envuelta(*args, **kwargs):
+        t0 = time.perf_counter(); error = False; b0 = bytes_http()
+        try: return fn(*args, **kwargs)
+        except Exception:
+            error = True; raise
+        finally: REGISTRO.observar("sheets", (hoja, op), time.perf_counter() - t0, error, bytes_http() - b0)
+    return envuelta
+
+
+class HojaMedida:
+    """Envuelve un gspread.Worksheet y mide cada llamada a la API."""
+
+    def __init__(self, ws):
+        self._ws = ws
+
+    def __getattr__(self, nombre):
+        attr = getattr(self._ws, nombre)
+        if nombre in OPERACIONES_HOJA and callable(attr): return _medir_llamada(self._ws.title, nombre, attr)
+        return attr
+
+
+class LibroMedido:
+    """Envuelve un gspread.Spreadsheet: sus hojas salen ya medidas."""
+
+    def __init__(self, sh):
+        self._sh = sh
+        cliente = getattr(sh, "client", None)
+        if cliente is not None and not getattr(cliente.request, "contando_bytes", False): cliente.request = _contar_bytes(cliente.request)
+
+    def worksheet(self, titulo):
+        return HojaMedida(_medir_llamada(titulo, "worksheet", self._sh.worksheet)(titulo))
+
+    def __getattr__(self, nombre):
+        attr = getattr(self._sh, nombre)
+        if nombre in OPERACIONES_LIBRO and callable(attr): return _medir_llamada("*", nombre, attr)
+        return attr
+
+
+# --- ENDPOINT LOCAL ---
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404); self.end_headers(); return
+        cuerpo = REGISTRO.texto_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers(); self.wfile.write(cuerpo)
+
+    def log_message(self, *args): pass
+
+
+_servidor = [None]
+
+
+def iniciar_servidor(puerto, host="127.0.0.1", intentos=1):
+    # Con varios workers (servidor.py) cada uno toma el primer puerto libre desde 'puerto' (hasta 'intentos')
+    if _servidor[0] is not None: return _servidor[0]
+    for i in range(intentos):
+        try: srv = ThreadingHTTPServer((host, puerto + i), _Handler); break
+        except OSError as ex:
+            if ex.errno != errno.EADDRINUSE or i == intentos - 1: raise
+    threading.Thread(target=srv.serve_forever, daemon=True, name="metricas").start()
+    _servidor[0] = srv
+    return srv
@@ -0,0 +1,109 @@
+# --- PARTIDO EN VIVO ---
+# Desde el banco se anotan goles, corners cortos, tarjetas y cambios a medida que pasan. Cada toque solo
+# agrega un evento al estado local de la sesión (y a su copia en el dispositivo, ver main.vista_partidos):
+# ninguna llamada a Sheets hasta el final. Al terminar, el partido entra en una sola fila de 'partidos'
+# (un append_row): las columnas de siempre (resultado, corners, goleadoras) + la lista de eventos en JSON.
+# El estado se serializa entero (a_texto/desde_texto): si se corta la conexión, se retoma donde quedó.
+import json
+import time
+import uuid
+from datetime import datetime
+
+CLAVE = "hockeyapp.partido_vivo"  # clave del estado en el almacenamiento del dispositivo
+CUARTOS = 4
+# tipo -> (etiqueta, lleva jugadora)
+TIPOS = {
+    "gol": ("⚽ Gol", True), "gol_rival": ("⚽ Gol rival", False),
+    "corner": ("🚩 Corner corto", False), "corner_rival": ("🚩 Corner rival", False),
+    "verde": ("🟩 Verde", True), "amarilla": ("🟨 Amarilla", True), "roja": ("🟥 Roja", True),
+    "cambio": ("🔁 Cambio", True),
+}
+
+
+class PartidoVivo:
+    def __init__(self, rival, condicion, fecha=None, id=None, eventos=None, cuarto=1, reloj=0.0, desde=None):
+        self.rival = rival; self.condicion = condicion
+        self.fecha = fecha or datetime.now().strftime("%d/%m/%Y"); self.id = id or uuid.uuid4().hex[:12]
+        self.eventos = list(eventos or []); self.cuarto = cuarto
+        # reloj: segundos ya jugados del cuarto; desde: time.time() en que arrancó si está corriendo.
+        # Hora de pared (no monotonic) para que el reloj siga bien después de reconectar a otro proceso.
+        self.reloj = reloj; self.desde = desde
+
+    # --- reloj ---
+    def corriendo(self): return self.desde is not None
+
+    def segundos(self, ahora=None):
+        return self.reloj + ((ahora or time.time()) - self.desde if self.desde is not None else 0)
+
+    def alternar_reloj(self, ahora=None):
+        ahora = ahora or time.time()
+        if self.desde is None: self.desde = ahora
+        else: self.reloj += ahora - self.desde; self.desde = None
+
+    def siguiente_cuarto(self):
+        if self.cuarto >= CUARTOS: return False
+        self.cuarto += 1; self.reloj = 0.0; self.desde = None
+        return True
+
+    def minuto(self, ahora=None):
+        s = int(self.segundos(ahora)); return f"{s // 60:02d}:{s % 60:02d}"
+
+    # --- eventos ---
+    def registrar(self, tipo, jugadora="", sale="", ahora=None):
+        if tipo not in TIPOS: raise ValueError(f"Evento desconocido: {tipo}")
+        if TIPOS[tipo][1] and tipo != "gol" and not jugadora: raise ValueError(f"{TIPOS[tipo][0]}: falta la jugadora")
+        if tipo == "cambio" and not sale: raise ValueError("Cambio: falta quién sale")
+        ahora = ahora or time.time()
+        ev = {"tipo": tipo, "cuarto": self.cuarto, "min": self.minuto(ahora),
+              "hora": datetime.fromtimestamp(ahora).strftime("%H:%M:%S")}
+        if jugadora: ev["jugadora"] = jugadora
+        if sale: ev["sale"] = sale
+        self.eventos.append(ev)
+        return ev
+
+    def deshacer(self):
+        return self.eventos.pop() if self.eventos else None
+
+    def cuenta(self, tipo): return sum(1 for e in self.eventos if e["tipo"] == tipo)
+
+    def marcador(self): return self.cuenta("gol"), self.cuenta("gol_rival")
+
+    def corners(self): return self.cuenta("corner"), self.cuenta("corner_rival")
+
+    def goleadoras(self):
+        res = {}
+        for e in self.eventos:
+            if e["tipo"] == "gol" and e.get("jugadora"): res[e["jugadora"]] = res.get(e["jugadora"], 0) + 1
+        return res
+
+    def fila(self):
+        # Misma forma que la carga manual (columnas 0-7) + eventos; 'id' distingue un reintento de un partido nuevo
+        gf, gc = self.marcador(); cf, cc = self.corners()
+        txt_gol = ", ".join(f"{n} ({c})" for n, c in self.goleadoras().items())
+        eventos = json.dumps({"id": self.id, "eventos": self.eventos}, ensure_ascii=False, separators=(",", ":"))
+        return [self.fecha, self.rival, self.condicion, str(gf), str(gc), str(cf), str(cc), txt_gol, eventos]
+
+    # --- persistencia ---
+    def a_texto(self):
+        return json.dumps({"rival": self.rival, "condicion": self.condicion, "fecha": self.fecha, "id": self.id,
+                           "eventos": self.eventos, "cuarto": self.cuarto, "reloj": self.reloj, "desde": self.desde},
+                          ensure_ascii=False)
+
+    @classmethod
+    def desde_texto(cls, texto):
+        try: d = json.loads(texto)
+        except (TypeError, ValueError): return None
+        if not isinstance(d, dict) or not d.get("rival"): return None
+        return cls(**{k: d.get(k) for k in ("rival", "condicion", "fecha", "id", "eventos")},
+                   cuarto=d.get("cuarto") or 1, reloj=d.get("reloj") or 0.0, desde=d.get("desde"))
+
+
+def resumen_eventos(texto):
+    # Columna de eventos de una fila de 'partidos' -> "🟩 2 · 🟨 1 · 🔁 5" (vacío si no tiene)
+    try: eventos = json.loads(texto)["eventos"]
+    except (TypeError, ValueError, KeyError): return ""
+    partes = []
+    for tipo in ("verde", "amarilla", "roja", "cambio"):
+        n = sum(1 for e in eventos if e.get("tipo") == tipo)
+        if n: partes.append(f"{TIPOS[tipo][0].split()[0]} {n}")
+    return " · ".join(partes)
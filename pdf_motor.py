@@ -0,0 +1,315 @@
+# --- MOTOR DE DIBUJO PDF ---
+# Plantilla: dibujo estático (la cancha) capturado una vez por proceso como operadores PDF y reinsertado tal cual.
+# Grilla: tablas armadas celda por celda pero emitidas en lote (rellenos por color, bordes como líneas únicas,
+# textos agrupados por estilo) en vez de set_fill_color/set_font/set_text_color + cell() por cada celda.
+# renglones: listas largas ("1. Ana | 2. Sol | ...") cortadas entre elementos con un ancho por elemento,
+# en vez del multi_cell de FPDF, que vuelve a medir la línea entera carácter por carácter.
+# Plantilla usa internos de fpdf2 (requirements.txt fija la versión); si no están, la cancha se dibuja de nuevo.
+# FuenteUnicode: la TTF que reemplaza a la Arial core, registrada con la API pública de FPDF en cada documento.
+import functools
+import io
+import os
+import threading
+
+
+class Plantilla:
+    def __init__(self, dibujar):
+        self._dibujar = dibujar; self._cache = {}; self._lock = threading.Lock()
+
+    def aplicar(self, pdf):
+        if not _con_internos(pdf): self._dibujar(pdf); return
+        # Las coordenadas en el stream dependen de la escala y del alto de página
+        clave = (pdf.k, pdf.w, pdf.h)
+        ops = self._cache.get(clave)
+        if ops is not None:
+            pdf._out(b"q\n" + ops + b"Q")
+            return
+        contenido = pdf.pages[pdf.page].contents
+        with pdf.local_context():
+            # Sin estado previo conocido: cada set_* del dibujo queda escrito en el stream
+            pdf.fill_color = None; pdf.draw_color = None; pdf.line_width = None
+            ini = len(contenido)
+            self._dibujar(pdf)
+            ops = bytes(contenido[ini:])
+        with self._lock: self._cache.setdefault(clave, ops)
+
+
+def _con_internos(pdf):
+    # Lo que Plantilla necesita de fpdf2 (probado con la versión de requirements.txt)
+    return callable(getattr(pdf, "_out", None)) and hasattr(getattr(pdf, "pages", {}).get(pdf.page), "contents")
+
+
+# =========================================================
+# CANCHA (planilla de formación)
+# =========================================================
+CANCHA_X, CANCHA_Y, CANCHA_W, CANCHA_H = 15, 30, 267, 130
+
+
+def _dibujar_cancha(pdf):
+    x_c, y_c, w_c, h_c = CANCHA_X, CANCHA_Y, CANCHA_W, CANCHA_H
+    pdf.set_fill_color(255, 152, 0); pdf.rect(x_c + (w_c * 0.55), y_c - 8, 30, 6, 'F')
+    pdf.set_fill_color(33, 150, 243); pdf.rect(x_c + (w_c * 0.35), y_c - 8, 30, 6, 'F')
+    pdf.set_fill_color(67, 160, 71); pdf.rect(x_c, y_c, w_c, h_c, 'F')
+    pdf.set_draw_color(255, 255, 255); pdf.set_line_width(0.6); pdf.rect(x_c, y_c, w_c, h_c)
+    pdf.line(x_c + w_c/2, y_c, x_c + w_c/2, y_c + h_c)
+    pdf.line(x_c + (w_c * 0.25), y_c, x_c + (w_c * 0.25), y_c + h_c)
+    pdf.line(x_c + (w_c * 0.75), y_c, x_c + (w_c * 0.75), y_c + h_c)
+    pdf.set_fill_color(255, 255, 255); pdf.ellipse(x_c + w_c/2 - 1.5, y_c + h_c/2 - 1.5, 3, 3, 'F')
+    # Areas (la de 25 yardas se dibujaba 23 veces idéntica dentro de un for: alcanza con una)
+    r_solid = 45; r_dash = 60
+    pdf.set_line_width(0.7)
+    pdf.ellipse(x_c - r_solid/2, y_c + h_c/2 - r_solid/2, r_solid, r_solid, 'D')
+    pdf.ellipse(x_c + w_c - r_solid/2, y_c + h_c/2 - r_solid/2, r_solid, r_solid, 'D')
+    pdf.set_line_width(0.8)
+    pdf.ellipse(x_c - r_dash/2, y_c + h_c/2 - r_dash/2, r_dash, r_dash, 'D')
+    pdf.ellipse(x_c + w_c - r_dash/2, y_c + h_c/2 - r_dash/2, r_dash, r_dash, 'D')
+    pdf.rect(0, y_c, x_c-0.1, h_c, 'F'); pdf.rect(x_c + w_c + 0.1, y_c, 30, h_c, 'F')
+    pdf.set_line_width(0.6); pdf.rect(x_c, y_c, w_c, h_c, 'D')
+    pdf.set_fill_color(130, 130, 130)
+    pdf.rect(x_c - 3, y_c + h_c/2 - 6, 3, 12, 'F'); pdf.rect(x_c + w_c, y_c + h_c/2 - 6, 3, 12, 'F')
+    pdf.set_draw_color(255, 182, 193); pdf.set_line_width(1.5)
+    pdf.rect(x_c - 0.5, y_c - 0.5, w_c + 1, h_c + 1, 'D')
+
+
+CANCHA = Plantilla(_dibujar_cancha)
+
+
+# =========================================================
+# GRILLA
+# =========================================================
+def _r(v): return round(v, 3)
+
+
+def _unir(intervalos):
+    unidos = []
+    for a, b in sorted(intervalos):
+        if unidos and a <= unidos[-1][1] + 1e-6: unidos[-1][1] = max(unidos[-1][1], b)
+        else: unidos.append([a, b])
+    return unidos
+
+
+class Grilla:
+    def __init__(self, fuente="Arial"):
+        self.fuente = fuente; self._celdas = []
+
+    def celda(self, x, y, w, h, texto="", relleno=None, estilo=("", 8, (0, 0, 0)), alinear="C", borde=True):
+        # relleno: (r, g, b) o None. estilo: (estilo fuente, tamaño, color texto)
+        self._celdas.append((x, y, w, h, str(texto), relleno, estilo, alinear, borde))
+
+    def dibujar(self, pdf, grosor=0.2):
+        # 1) Rellenos: por color, uniendo celdas contiguas de la misma fila en un solo rect
+        por_color = {}
+        for x, y, w, h, _, relleno, _, _, _ in self._celdas:
+            if relleno is None: continue
+            filas = por_color.setdefault(relleno, {})
+            filas.setdefault((_r(y), _r(h)), []).append((_r(x), _r(x + w)))
+        for color, filas in por_color.items():
+            pdf.set_fill_color(*color)
+            for (y, h), tramos in filas.items():
+                for a, b in _unir(tramos): pdf.rect(a, y, b - a, h, 'F')
+        # 2) Bordes: cada arista de celda, unida en líneas continuas
+        horiz = {}; vert = {}
+        for x, y, w, h, _, _, _, _, borde in self._celdas:
+            if not borde: continue
+            x0, x1, y0, y1 = _r(x), _r(x + w), _r(y), _r(y + h)
+            horiz.setdefault(y0, []).append((x0, x1)); horiz.setdefault(y1, []).append((x0, x1))
+            vert.setdefault(x0, []).append((y0, y1)); vert.setdefault(x1, []).append((y0, y1))
+        if horiz:
+            pdf.set_draw_color(0); pdf.set_line_width(grosor)
+            for y, tramos in horiz.items():
+                for a, b in _unir(tramos): pdf.line(a, y, b, y)
+            for x, tramos in vert.items():
+                for a, b in _unir(tramos): pdf.line(x, a, x, b)
+        # 3) Textos: un solo cambio de fuente/color por estilo
+        por_estilo = {}
+        for celda in self._celdas:
+            if celda[4]: por_estilo.setdefault(celda[6], []).append(celda)
+        for (est, tam, color), celdas in por_estilo.items():
+            pdf.set_font(self.fuente, est, tam)
+            # Con relleno == color de texto, fpdf no envuelve cada texto en q/Q para cambiar el color
+            pdf.set_text_color(*color); pdf.set_fill_color(*color)
+            anchos = {}  # las letras P/A/S se repiten cientos de veces
+            for x, y, w, h, texto, _, _, alinear, _ in celdas:
+                ancho = anchos.get(texto)
+                if ancho is None: ancho = anchos[texto] = pdf.get_string_width(texto)
+                if alinear == "L": tx = x + pdf.c_margin
+                elif alinear == "R": tx = x + w - pdf.c_margin - ancho
+                else: tx = x + (w - ancho) / 2
+                pdf.text(tx, y + h / 2 + 0.3 * pdf.font_size, texto)
+        self._celdas = []
+
+
+def renglones(pdf, textos, ancho, sep="   |   "):
+    # Corta 'textos' en renglones de 'ancho' (fuente actual) sin partir ningún elemento
+    w_sep = pdf.get_string_width(sep); res = []; actual = []; usado = 0
+    for t in textos:
+        w = pdf.get_string_width(t)
+        if actual and usado + w_sep + w > ancho: res.append(sep.join(actual)); actual = []; usado = 0
+        usado += (w_sep if actual else 0) + w; actual.append(t)
+    if actual: res.append(sep.join(actual))
+    return res or ["-"]
+
+
+# =========================================================
+# FUENTE UNICODE
+# =========================================================
+# Sin TTF, FPDF usa la Arial "core" (latin-1) y cada texto pasa por clean_latin(), que pierde lo que no entra.
+# Si hay una TTF disponible, FUENTE.documento() arma un FPDF que la registra como "Arial" con add_font (que al
+# guardar embebe solo los glifos usados). A la TTF se le sacan las tablas que FPDF no usa (shaping, hinting,
+# nombres de glifos) pero no caracteres, y de ahí sale una variante con solo RANGOS_COMUNES: las dos quedan en
+# .cache/fuentes (una vez por archivo de fuente). Cada estilo se agrega recién cuando set_font lo pide, con la
+# variante de comunes (más barata de parsear); el primer carácter de otro alfabeto agrega la completa como
+# fuente de respaldo (set_fallback_fonts). Todo por documento y con la API pública de FPDF.
+
+DIR_FUENTES = os.path.join("assets", "fuentes")
+DIRS_SISTEMA = ("/usr/share/fonts/truetype/dejavu", "/usr/share/fonts/dejavu", "/usr/share/fonts/TTF",
+                "/usr/share/fonts/truetype/liberation", "/usr/share/fonts/liberation-sans",
+                "C:/Windows/Fonts", "/Library/Fonts", "/System/Library/Fonts/Supplemental")
+# Por estilo, en orden de preferencia: cada familia tiene que estar completa (regular y negrita) para usarse
+FAMILIAS = (
+    {"": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf", "I": "DejaVuSans-Oblique.ttf", "BI": "DejaVuSans-BoldOblique.ttf"},
+    {"": "LiberationSans-Regular.ttf", "B": "LiberationSans-Bold.ttf", "I": "LiberationSans-Italic.ttf", "BI": "LiberationSans-BoldItalic.ttf"},
+    {"": "arial.ttf", "B": "arialbd.ttf", "I": "ariali.ttf", "BI": "arialbi.ttf"},
+)
+ESTILOS = ("", "B", "I", "BI")
+# Latín con extendidos, puntuación, monedas y símbolos de letras: lo que usa casi todo documento del club
+RANGOS_COMUNES = ((0x20, 0x250), (0x2000, 0x2070), (0x20A0, 0x20C0), (0x2100, 0x2150))
+COMUNES = frozenset(c for a, b in RANGOS_COMUNES for c in range(a, b))
+DIR_CACHE = os.path.join(".cache", "fuentes")
+
+
+def _subconjunto(datos, unicodes=None):
+    from fontTools import subset, ttLib
+    fuente = ttLib.TTFont(io.BytesIO(datos), recalcTimestamp=False)
+    op = subset.Options(); op.layout_features = []; op.glyph_names = False; op.hinting = False
+    op.notdef_outline = True; op.recommended_glyphs = True; op.name_IDs = ["*"]; op.name_languages = ["*"]
+    op.drop_tables += ["GSUB", "GPOS", "GDEF", "kern", "FFTM"]
+    sub = subset.Subsetter(op); sub.populate(unicodes=unicodes or fuente.getBestCmap().keys()); sub.subset(fuente)
+    buf = io.BytesIO(); fuente.save(buf)
+    return buf.getvalue()
+
+
+def _en_cache(nombre, armar):
+    # Ruta del archivo en .cache/fuentes (armado la primera vez); None si no se puede escribir
+    ruta = os.path.join(DIR_CACHE, nombre)
+    if os.path.isfile(ruta): return ruta
+    try:
+        datos = armar()
+        os.makedirs(DIR_CACHE, exist_ok=True)
+        tmp = f"{ruta}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f: f.write(datos)
+        os.replace(tmp, ruta)
+    except OSError: return None
+    return ruta
+
+
+def _leer(ruta):
+    with open(ruta, "rb") as f: return f.read()
+
+
+def _recortar_fuente(ruta):
+    # (completa, comunes) como rutas: la completa tiene todo el cmap de la TTF sin las tablas que FPDF no usa; la
+    # de comunes, solo los glifos de RANGOS_COMUNES. Sin caché escribible, las dos son la TTF original
+    est = os.stat(ruta)
+    base = f"{os.path.splitext(os.path.basename(ruta))[0]}-{int(est.st_mtime)}-{est.st_size}"
+    completa = _en_cache(base + ".ttf", lambda: _subconjunto(_leer(ruta))) or ruta
+    return completa, _en_cache(base + "-comunes.ttf", lambda: _subconjunto(_leer(completa), COMUNES)) or ruta
+
+
+def _estilo(style):
+    # Como lo normaliza FPDF.set_font: "ib" -> "BI"; subrayado y tachado no cambian la fuente
+    return "".join(sorted(c for c in str(getattr(style, "style", style) or "").upper() if c in "BI"))
+
+
+class FuenteUnicode:
+    def __init__(self, dirs=None):
+        self._dirs = dirs; self._rutas = None; self._archivos = {}; self._lock = threading.Lock()
+
+    def rutas(self):
+        # {estilo: ruta}; vacío si no hay ninguna familia completa (o falta fontTools)
+        if self._rutas is None:
+            rutas = {}
+            try:
+                import fontTools  # noqa: F401
+                for d in self._dirs or (DIR_FUENTES,) + DIRS_SISTEMA:
+                    for fam in FAMILIAS:
+                        encontradas = {e: os.path.join(d, n) for e, n in fam.items() if os.path.isfile(os.path.join(d, n))}
+                        if "" in encontradas and "B" in encontradas:
+                            rutas = {e: encontradas.get(e, encontradas["B" if "B" in e else ""]) for e in fam}; break
+                    if rutas: break
+            except ImportError: pass
+            self._rutas = rutas
+        return self._rutas
+
+    def activa(self):
+        return bool(self.rutas())
+
+    def archivos(self, estilo):
+        # (completa, comunes) del estilo, recortadas una vez por proceso
+        ruta = self.rutas()[estilo]
+        if ruta not in self._archivos:
+            with self._lock:
+                if ruta not in self._archivos: self._archivos[ruta] = _recortar_fuente(ruta)
+        return self._archivos[ruta]
+
+    def documento(self, *args, familia="Arial", **kwargs):
+        # Un FPDF nuevo con la TTF como 'familia'; sin TTF, el FPDF de siempre (Arial core)
+        if not self.activa():
+            from fpdf import FPDF
+            return FPDF(*args, **kwargs)
+        return _clase_documento()(self, familia, *args, **kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _clase_documento():
+    from fpdf import FPDF
+
+    class DocumentoUnicode(FPDF):
+        # Solo métodos públicos de FPDF (tests/test_pdf_motor.py verifica que sigan pasando por acá)
+        def __init__(self, fuente, familia, *args, **kwargs):
+            self._fuente = fuente; self._familia = familia; self._respaldo = familia + "Completa"
+            self._estilos = set(); self._completa = False
+            super().__init__(*args, **kwargs)
+
+        def _agregar_completa(self, estilos):
+            for e in estilos: self.add_font(self._respaldo, e, self._fuente.archivos(e)[0])
+            self.set_fallback_fonts([self._respaldo])
+
+        def set_font(self, family=None, style="", size=0):
+            if (family or self.font_family).lower() == self._familia.lower():
+                estilo = _estilo(style)
+                if estilo not in self._estilos:
+                    self._estilos.add(estilo); self.add_font(self._familia, estilo, self._fuente.archivos(estilo)[1])
+                    if self._completa: self._agregar_completa([estilo])
+            return super().set_font(family, style, size)
+
+        def normalize_text(self, text):
+            # FPDF pasa por acá todo texto antes de medirlo o escribirlo (cell, multi_cell, write, text, get_string_width)
+            if not self._completa and self._estilos and any(ord(c) not in COMUNES for c in text):
+                self._completa = True; self._agregar_completa(sorted(self._estilos))
+            return super().normalize_text(text)
+
+        def text(self, x, y, text=""):
+            # text() no usa las fuentes de respaldo: los tramos de otro alfabeto se escriben con la completa
+            if self.font_family != self._familia.lower() or all(ord(c) in COMUNES for c in text): return super().text(x, y, text)
+            self.normalize_text(text)  # agrega la completa, si es el primer carácter de otro alfabeto
+            estilo = self.font_style + "U" * self.underline + "S" * self.strikethrough; tam = self.font_size_pt
+            for respaldo, tramo in _tramos(text):
+                if respaldo: self.set_font(self._respaldo, estilo, tam)
+                super().text(x, y, tramo); x += self.get_string_width(tramo)
+                if respaldo: self.set_font(self._familia, estilo, tam)
+
+    return DocumentoUnicode
+
+
+def _tramos(texto):
+    # [(fuera de COMUNES, tramo), ...] con los caracteres consecutivos del mismo lado
+    res = []
+    for c in texto:
+        fuera = ord(c) not in COMUNES
+        if res and res[-1][0] == fuera: res[-1][1] += c
+        else: res.append([fuera, c])
+    return [tuple(t) for t in res]
+
+
+FUENTE = FuenteUnicode()
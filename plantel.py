@@ -0,0 +1,127 @@
+# --- PLANTEL COMPARTIDO ---
+# Un solo plantel por proceso para todas las sesiones. Es inmutable (tupla de Jugadora):
+# cada alta/edición publica una versión nueva de golpe y las sesiones la ven en su próxima lectura.
+# Lo que se edita a mano en Sheets (o lo que reescribe mantenimiento.py) entra al vencer VIGENCIA segundos,
+# en la navegación siguiente, o enseguida con 🔄 ACTUALIZAR (recargar).
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from buscador import IndiceJugadoras
+from hojas import huella
+
+CAMPOS = ("id", "nombre", "apellido", "dni", "nacimiento", "posicion", "telefono", "activo", "camiseta")
+POSICIONES = ("Arquera", "Defensora", "Volante", "Delantera")
+VIGENCIA = float(os.environ.get("PLANTEL_TTL", 300))  # segundos hasta volver a mirar la hoja
+
+
+class Jugadora(namedtuple("Jugadora", CAMPOS)):
+    # Tupla compacta que además se lee como el dict de antes: j['nombre'], j.get('camiseta', '-')
+    __slots__ = ()
+
+    def __getitem__(self, k):
+        return getattr(self, k) if isinstance(k, str) else tuple.__getitem__(self, k)
+
+    def get(self, k, defecto=None):
+        return getattr(self, k, defecto)
+
+    @classmethod
+    def desde_fila(cls, row):
+        row = [str(v) if v is not None else "" for v in row[:len(CAMPOS)]]
+        row += [""] * (len(CAMPOS) - len(row))
+        # posicion/activo se repiten mucho: los internamos
+        row[5] = sys.intern(row[5]); row[7] = sys.intern(row[7])
+        return cls(*row)
+
+
+class Plantel:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._estado = (0, ())  # (versión, jugadoras). Se reemplaza entero: lectura atómica sin lock.
+        self._indice = (None, None)  # (versión, IndiceJugadoras)
+        self._huella = (None, None)  # (versión, huella del contenido)
+        self._leido = 0.0  # time.monotonic() de la última lectura de la hoja
+
+    def actual(self):
+        return self._estado[1]
+
+    def version(self):
+        return self._estado[0]
+
+    def indice(self):
+        # Índice de búsqueda de la versión actual: se arma una sola vez por versión
+        version, jugadoras = self._estado
+        v_idx, idx = self._indice
+        if v_idx != version:
+            idx = IndiceJugadoras(jugadoras); self._indice = (version, idx)
+        return idx
+
+    def _vigente(self): return self._estado[0] and time.monotonic() - self._leido < VIGENCIA
+
+    def huella(self):
+        # Huella del contenido (estable entre procesos, ver hojas.huella) de la versión actual, una vez por versión
+        version, jugadoras = self._estado
+        v_h, h = self._huella
+        if v_h != version: h = huella(jugadoras); self._huella = (version, h)
+        return h
+
+    def asegurar_cargado(self, ws_jugadoras):
+        # La primera sesión del proceso descarga 'jugadoras'; después, una sola sesión cada VIGENCIA segundos
+        if self._vigente(): return
+        with self._lock:
+            if self._vigente(): return
+            self._cargar(ws_jugadoras.get_all_values())
+
+    def recargar(self, ws_jugadoras):
+        # 🔄 ACTUALIZAR: lectura fresca, sin el memo de la navegación ni la vigencia
+        leer = getattr(ws_jugadoras, "releer", ws_jugadoras.get_all_values)
+        with self._lock: self._cargar(leer())
+
+    def _cargar(self, raw):
+        # Con el lock tomado. Solo hay versión nueva (e índice nuevo) si la hoja cambió
+        jugadoras = tuple(j for j in (Jugadora.desde_fila(r) for r in raw[1:]) if j.dni)
+        if not self._estado[0] or jugadoras != self._estado[1]: self._estado = (self._estado[0] + 1, jugadoras)
+        self._leido = time.monotonic()
+
+    def publicar(self, jugadoras):
+        with self._lock: self._estado = (self._estado[0] + 1, tuple(jugadoras)); self._leido = time.monotonic()
+
+    def agregar(self, jug):
+        with self._lock: self._estado = (self._estado[0] + 1, self._estado[1] + (jug,))
+
+    def reemplazar(self, dni, jug):
+        with self._lock:
+            nuevas = tuple(jug if str(j.dni) == str(dni) else j for j in self._estado[1])
+            self._estado = (self._estado[0] + 1, nuevas)
+
+    def importar(self, ediciones, altas):
+        # Importación masiva (importar_plantel.py): {DNI anterior: jugadora} + altas, todo en una sola versión.
+        # Una edición de alguien que este proceso todavía no tiene (la cargó otro worker) entra al final.
+        with self._lock:
+            dnis = {str(j.dni) for j in self._estado[1]}
+            nuevas = tuple(ediciones.get(str(j.dni), j) for j in self._estado[1])
+            nuevas += tuple(j for d, j in ediciones.items() if d not in dnis) + tuple(altas)
+            self._estado = (self._estado[0] + 1, nuevas)
+
+    def aplicar(self, cambio):
+        # Alta/edición hecha por otro worker (almacen_local.py); en edición 'valor' es el DNI anterior.
+        # Si este proceso todavía no bajó el plantel, lo hará completo en la primera sesión.
+        if not self._estado[0]: return
+        if cambio.op == "agregar":
+            for f in cambio.filas: self.agregar(Jugadora.desde_fila(f))
+        elif cambio.op == "actualizar" and cambio.valor:
+            self.reemplazar(cambio.valor, Jugadora.desde_fila(cambio.filas[0]))
+        elif cambio.op == "reemplazar" and cambio.valor:
+            # Como cambios.aplicar: sale la del DNI 'valor' (si estaba) y entran 'filas' al final
+            with self._lock:
+                quedan = tuple(j for j in self._estado[1] if str(j.dni) != str(cambio.valor))
+                self._estado = (self._estado[0] + 1, quedan + tuple(Jugadora.desde_fila(f) for f in cambio.filas))
+
+    def reiniciar(self):
+        # Para benchmark/prueba de carga: obliga a recargar desde el libro siguiente
+        with self._lock: self._estado = (0, ()); self._leido = 0.0
+
+
+PLANTEL = Plantel()
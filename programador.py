@@ -0,0 +1,139 @@
+# --- REPORTES PRECALCULADOS ---
+# Los PDFs (planilla mensual, temporada, fichas) se generan a pedido y tardan; acá se guardan por huella (hojas.huella):
+# un hash de las filas que leyó el reporte. Si nadie tocó esas hojas (ni desde la app ni a mano en Sheets),
+# el próximo pedido devuelve el mismo archivo al instante. Es el único caché de PDFs: vive en el almacén
+# (almacen_local.ruta()), el mismo para main.py, los workers de servidor.py y cli.py. El Programador los genera en horas de poco uso
+# (fin de semana y fin de mes) con una sesión sin pantalla, así el entrenador ya los encuentra hechos.
+# cli.py usa la misma sesión sin pantalla para generar cualquier reporte desde la terminal.
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from almacen_local import ALMACEN, Almacen, ruta
+from plantel import PLANTEL
+
+log = logging.getLogger("hockeyapp.programador")
+
+HORA_PRECALCULO = int(os.environ.get("PRECALCULO_HORA", 4))  # hora local; -1 lo desactiva
+
+
+class Precalculados:
+    def __init__(self, almacen=None, abrir=None):
+        # abrir: fábrica del almacén, llamada en el primer uso (importar main no crea la base en .cache/)
+        self._almacen = almacen; self._abrir = abrir; self.activo = True; self._datos = {}; self._lock = threading.Lock()
+
+    @property
+    def almacen(self):
+        if self._abrir is not None:
+            with self._lock:
+                if self._abrir is not None: self._almacen = self._abrir(); self._abrir = None
+        return self._almacen
+
+    def buscar(self, clave, h):
+        # url del PDF generado con esa misma huella, si el archivo sigue en assets
+        if not self.activo: return None
+        url = None
+        with self._lock: previo = self._datos.get(clave)
+        if previo and previo[0] == h: url = previo[1]
+        elif self.almacen is not None:
+            guardado = self.almacen.leer_reporte(f"pre|{clave}")
+            if guardado and guardado[0] == h: url = guardado[1]
+        if url and os.path.exists(os.path.join("assets", url.lstrip("/"))): return url
+        return None
+
+    def guardar(self, clave, h, url):
+        if not self.activo: return
+        with self._lock: self._datos[clave] = (h, url)
+        if self.almacen is not None: self.almacen.guardar_reporte(f"pre|{clave}", h, url)
+
+
+def _almacen_reportes():
+    # Sin ALMACEN_DB (un solo proceso) igual se abre el archivo compartido, solo para los reportes
+    if ALMACEN is not None: return ALMACEN
+    try: return Almacen(ruta())
+    except Exception as ex: log.warning("reportes precalculados solo en memoria: %s", ex); return None
+
+
+PRECALCULADOS = Precalculados(abrir=_almacen_reportes)
+
+
+class PaginaSinPantalla:
+    # Lo que main() usa de ft.Page, sin navegador: alcanza para armar la sesión y llamar a sus reportes
+    def __init__(self):
+        self.overlay = []; self.controls = []
+
+    def update(self, *controles): pass
+    def add(self, *controles): self.controls.extend(controles)
+
+
+def abrir_sesion():
+    # Sesión propia (memo de lectura nuevo): cada corrida ve las hojas como están ahora. Sin interfaz:
+    # main() conecta, carga el plantel y devuelve los reportes sin armar ninguna vista
+    from main import main
+    app = main(PaginaSinPantalla(), pantalla=False)
+    if app is None: raise RuntimeError("No se pudo conectar con la planilla")
+    return app
+
+
+class Programador:
+    def __init__(self, abrir=abrir_sesion, hora=HORA_PRECALCULO):
+        self.abrir = abrir; self.hora = hora; self._hebra = None
+
+    def tareas(self, hoy):
+        # Fin de mes (día 1): el mes que cerró y su temporada. Fin de semana (lunes): el mes en curso,
+        # la temporada y la ficha de cada jugadora activa.
+        res = []
+        if hoy.day == 1:
+            cerrado = hoy - timedelta(days=1)
+            res += [("mensual", (cerrado.month, cerrado.year)), ("temporada", (cerrado.year,))]
+        if hoy.weekday() == 0:
+            res += [("mensual", (hoy.month, hoy.year)), ("temporada", (hoy.year,))]
+            res += [("ficha", (j['dni'],)) for j in PLANTEL.actual() if j['activo'] != "NO"]
+        return list(dict.fromkeys(res))
+
+    def correr(self, hoy=None, tareas=None):
+        hoy = hoy or datetime.now()
+        if tareas is None:
+            if hoy.day != 1 and hoy.weekday() != 0: return []
+            # Con varios workers (servidor.py) la corrida programada la hace uno solo
+            if ALMACEN is not None and not ALMACEN.reclamar(f"precalculo|{hoy:%Y-%m-%d}"): return []
+        app = self.abrir(); res = []
+        if tareas is None: tareas = self.tareas(hoy)  # después de abrir: las fichas salen del plantel ya cargado
+        for tipo, args in tareas:
+            t0 = time.perf_counter()
+            try: ok, msg, url = generar(app, tipo, *args)
+            except Exception as ex: ok, msg, url = False, str(ex), None
+            res.append((tipo, args, ok, url or msg))
+            log.info(json.dumps({"evento": "precalculo", "tipo": tipo, "args": list(args), "ok": ok,
+                                 "ms": round((time.perf_counter() - t0) * 1000, 1)}, ensure_ascii=False))
+        return res
+
+    def _proxima(self, ahora):
+        prox = ahora.replace(hour=self.hora, minute=0, second=0, microsecond=0)
+        return prox if prox > ahora else prox + timedelta(days=1)
+
+    def iniciar(self):
+        if self.hora < 0 or self._hebra is not None: return
+        def bucle():
+            while True:
+                ahora = datetime.now(); prox = self._proxima(ahora)
+                time.sleep((prox - ahora).total_seconds())
+                try: self.correr(prox)
+                except Exception as ex: log.warning("precálculo: %s", ex)
+        self._hebra = threading.Thread(target=bucle, name="programador", daemon=True)
+        self._hebra.start()
+
+
+def generar(app, tipo, *args):
+    # Un reporte de una sesión (main() -> reportes) por nombre; la categoría es la guardada de la sesión
+    cat = app.categoria[0]
+    if tipo == "mensual": return app.reportes["mensual"](int(args[0]), int(args[1]), cat)
+    if tipo == "temporada": return app.reportes["temporada"](int(args[0]), cat)
+    if tipo == "ficha":
+        jug = next((j for j in PLANTEL.actual() if str(j['dni']) == str(args[0])), None)
+        if jug is None: return False, f"No hay jugadora con DNI {args[0]}", None
+        return app.reportes["ficha"](jug, {})
+    raise ValueError(f"Reporte desconocido: {tipo}")
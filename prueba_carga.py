@@ -0,0 +1,170 @@
+# --- PRUEBA DE CARGA ---
+# Simula muchas sesiones Flet concurrentes en un solo proceso (como ft.app en WEB_BROWSER) contra hoja_falsa.py.
+# Cada sesión recorre flujos reales: tomar asistencia, evaluar, generar PDFs.
+# Uso: python prueba_carga.py --sesiones 1,5,10,25 --latencia 0.1
+import argparse
+import gc
+import glob
+import os
+import random
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+import flet as ft
+
+import hoja_falsa
+from benchmark import BusFalso, PaginaFalsa, abrir_sesion
+from plantel import PLANTEL
+
+
+class Evento:
+    def __init__(self, control): self.control = control; self.data = None
+
+
+def _hijos(c):
+    for attr in ("controls", "content", "rows", "cells"):
+        try: v = getattr(c, attr, None)
+        except Exception: continue
+        if isinstance(v, list): yield from v
+        elif isinstance(v, ft.Control): yield v
+
+
+def _texto(c):
+    v = getattr(c, "content", None)
+    if isinstance(v, str): return v
+    return getattr(c, "text", None) or ""
+
+
+def buscar_botones(raiz, texto):
+    pila = [raiz]; encontrados = []
+    while pila:
+        c = pila.pop()
+        if getattr(c, "on_click", None) and _texto(c) == texto: encontrados.append(c)
+        pila.extend(reversed(list(_hijos(c))))
+    return encontrados
+
+
+def click(boton): boton.on_click(Evento(boton))
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmRSS:"): return int(linea.split()[1]) / 1024
+    except OSError: pass
+    return tracemalloc.get_traced_memory()[0] / 1024 / 1024
+
+
+# =========================================================
+# FLUJOS
+# =========================================================
+def flujo_asistencia(app, rnd):
+    vista = app.vistas["asis"]()
+    for b in buscar_botones(vista, "✅"):
+        if rnd.random() < 0.85: click(b)
+    for b in buscar_botones(vista, "❌"):
+        if rnd.random() < 0.15: click(b)
+    click(buscar_botones(vista, "💾 GUARDAR ASISTENCIA")[0])
+
+
+def flujo_evaluacion(app, rnd):
+    vista = app.vistas["eval"]()
+    for _ in range(10):  # la lista puede estar redibujándose por un cambio de otra sesión (cambios.py)
+        botones = buscar_botones(vista, "CARGAR") or buscar_botones(vista, "EDITAR")
+        if botones: break
+        time.sleep(0.02)
+    click(rnd.choice(botones))
+    click(buscar_botones(vista, "GUARDAR")[0])
+
+
+def flujo_pdfs(app, rnd):
+    hoy = datetime.now()
+    ok, msg, _ = app.reportes["mensual"](hoy.month, hoy.year, "Primera")
+    if not ok: raise RuntimeError(msg)
+
+
+FLUJOS = {"asistencia": flujo_asistencia, "evaluacion": flujo_evaluacion, "pdf_mensual": flujo_pdfs}
+
+
+def percentil(valores, p):
+    if not valores: return 0.0
+    orden = sorted(valores); k = (len(orden) - 1) * p / 100
+    i = int(k); j = min(i + 1, len(orden) - 1)
+    return orden[i] + (orden[j] - orden[i]) * (k - i)
+
+
+def correr_nivel(n, args):
+    libro = hoja_falsa.generar_libro(args.jugadoras, args.temporadas, latencia=args.latencia, jitter=args.latencia / 2, semilla=args.semilla)
+    PLANTEL.reiniciar()
+    gc.collect(); rss_0 = rss_mb(); heap_0 = tracemalloc.get_traced_memory()[0]
+    sesiones = []; lock = threading.Lock(); bus = BusFalso()
+    latencias = {k: [] for k in FLUJOS}; errores = []; llamadas = []
+
+    def abrir():
+        libro.por_hilo[threading.get_ident()] = 0
+        app = abrir_sesion(libro, PaginaFalsa(bus))
+        with lock: sesiones.append(app)
+        return app
+
+    barrera = threading.Barrier(n)
+
+    def sesion(idx):
+        rnd = random.Random(args.semilla + idx)
+        try:
+            app = abrir(); barrera.wait()
+            for _ in range(args.iteraciones):
+                for nombre, flujo in FLUJOS.items():
+                    t0 = time.perf_counter(); flujo(app, rnd)
+                    with lock: latencias[nombre].append(time.perf_counter() - t0)
+                    time.sleep(rnd.uniform(0, args.pausa))
+        except Exception as ex:
+            with lock: errores.append(repr(ex))
+            try: barrera.abort()
+            except Exception: pass
+        finally:
+            with lock: llamadas.append(libro.por_hilo[threading.get_ident()])
+
+    hilos = [threading.Thread(target=sesion, args=(i,)) for i in range(n)]
+    for h in hilos: h.start()
+    for h in hilos: h.join()
+    # Las sesiones siguen vivas (como pestañas abiertas) al medir memoria
+    gc.collect(); rss_1 = rss_mb(); heap_1 = tracemalloc.get_traced_memory()[0]
+    todas = [x for v in latencias.values() for x in v]
+    res = {"sesiones": n, "p50_ms": percentil(todas, 50) * 1000, "p99_ms": percentil(todas, 99) * 1000,
+           "por_flujo": {k: (percentil(v, 50) * 1000, percentil(v, 99) * 1000) for k, v in latencias.items()},
+           "api_por_sesion": sum(llamadas) / max(len(llamadas), 1),
+           "rss_mb_por_sesion": (rss_1 - rss_0) / n, "heap_kb_por_sesion": (heap_1 - heap_0) / 1024 / n,
+           "errores": errores}
+    sesiones.clear()
+    return res
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Prueba de carga con sesiones Flet simuladas")
+    ap.add_argument("--sesiones", default="1,5,10,25", help="niveles de concurrencia separados por coma")
+    ap.add_argument("--iteraciones", type=int, default=2, help="vueltas de los flujos por sesión")
+    ap.add_argument("--jugadoras", type=int, default=40)
+    ap.add_argument("--temporadas", type=int, default=1)
+    ap.add_argument("--latencia", type=float, default=0.05, help="segundos simulados por llamada a la API")
+    ap.add_argument("--pausa", type=float, default=0.2, help="tiempo máximo de 'pensar' entre acciones")
+    ap.add_argument("--semilla", type=int, default=0)
+    args = ap.parse_args()
+
+    previos = set(glob.glob(os.path.join("assets", "*.pdf")))
+    print(f"{'sesiones':>8} {'p50 ms':>9} {'p99 ms':>9} {'api/ses':>8} {'RSS MB/ses':>11} {'heap KB/ses':>12}  errores")
+    try:
+        for n in [int(x) for x in args.sesiones.split(",") if x.strip()]:
+            r = correr_nivel(n, args)
+            print(f"{n:>8} {r['p50_ms']:>9.1f} {r['p99_ms']:>9.1f} {r['api_por_sesion']:>8.1f} {r['rss_mb_por_sesion']:>11.2f} "
+                  f"{r['heap_kb_por_sesion']:>12.1f}  {len(r['errores'])}")
+            for flujo, (p50, p99) in r["por_flujo"].items(): print(f"{'':>8}   {flujo:<14} p50 {p50:8.1f}  p99 {p99:8.1f}")
+            for err in r["errores"][:3]: print(f"{'':>8}   ! {err}")
+    finally:
+        for ruta in set(glob.glob(os.path.join("assets", "*.pdf"))) - previos: os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# --- DESPLIEGUE MULTI-WORKER ---
+# Varios procesos uvicorn sirviendo la misma app. Comparten por almacen_local.py (SQLite en .cache/):
+# las fotos de cada hoja, los PDFs ya generados y los cambios, que cada worker reenvía a sus sesiones.
+#   python servidor.py                               -> WORKERS procesos (por defecto, uno por CPU)
+#   uvicorn servidor:crear_app --factory --workers 4 -> lo mismo, con las opciones de uvicorn a mano
+# Requiere flet-web y uvicorn (pip install "flet[web]" uvicorn). Para un solo proceso sigue sirviendo main.py.
+# Importar este módulo no arranca nada: cada worker arma su app (crear_app) y, en el arranque de su
+# lifespan, su programador y su endpoint de métricas. El proceso que lanza los workers solo los supervisa.
+import logging
+import os
+
+log = logging.getLogger("hockeyapp.servidor")
+
+RUTA_ALMACEN = os.path.join(".cache", "hockeyapp.db")
+
+
+def _workers():
+    return int(os.environ.get("WORKERS") or os.cpu_count() or 1)
+
+
+class ConArranque:
+    # Envuelve una app ASGI: corre 'arrancar' cuando llega el lifespan.startup de este worker
+    def __init__(self, app, arrancar):
+        self.app = app; self.arrancar = arrancar
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan": return await self.app(scope, receive, send)
+        async def recibir():
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup": self.arrancar()
+            return mensaje
+        return await self.app(scope, recibir, send)
+
+
+def arrancar_worker():
+    import metricas
+    from programador import Programador
+    # Cada worker arranca su programador; la corrida de cada día la toma uno solo (almacen_local.reclamar)
+    Programador().iniciar()
+    # Métricas por worker: METRICS_PORT, METRICS_PORT+1, ... (cada uno toma el primero libre)
+    puerto = int(os.environ.get("METRICS_PORT", 9464))
+    if not puerto: return
+    try: srv = metricas.iniciar_servidor(puerto, intentos=_workers())
+    except OSError as ex: log.warning("sin endpoint de métricas en este worker: %s", ex); return
+    log.info("métricas del worker %s en 127.0.0.1:%s/metrics", os.getpid(), srv.server_address[1])
+
+
+def crear_app():
+    # Fábrica de uvicorn (--factory): se llama una vez en cada worker
+    os.environ.setdefault("ALMACEN_DB", RUTA_ALMACEN)
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(asctime)s %(process)d %(name)s %(message)s")
+    import flet as ft
+    from main import DIR_SUBIDAS, main
+    try: app = ft.app(target=main, export_asgi_app=True, assets_dir="assets", upload_dir=DIR_SUBIDAS)
+    except ImportError as ex:
+        raise SystemExit(f"Falta flet-web para el modo multi-worker ({ex}): pip install \"flet[web]\" uvicorn")
+    return ConArranque(app, arrancar_worker)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    os.environ.setdefault("ALMACEN_DB", RUTA_ALMACEN)
+    from escrituras import CERROJOS_ENTRE_PROCESOS
+    workers = _workers()
+    # Sin flock (Windows) dos workers podrían reescribir la misma hoja a la vez (escrituras.py)
+    if workers > 1 and not CERROJOS_ENTRE_PROCESOS:
+        logging.warning("sin cerrojos entre procesos en esta plataforma: se sirve con un solo worker"); workers = 1
+    os.environ["WORKERS"] = str(workers)  # lo heredan los workers: cuántos puertos de métricas probar
+    uvicorn.run("servidor:crear_app", factory=True, host="0.0.0.0", port=int(os.environ.get("PORT", 8000)), workers=workers)
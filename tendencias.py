@@ -0,0 +1,254 @@
+# --- TENDENCIAS DE EVALUACIÓN ---
+# Serie mes a mes de cada habilidad por jugadora (todas las temporadas seguidas) y la del equipo, con media
+# móvil (VENTANA meses evaluados) y pendiente (notas por mes, mínimos cuadrados sobre los últimos
+# VENTANA_PENDIENTE). Un solo índice por proceso, como el plantel: se arma una vez y después se actualiza
+# de a un punto. Guardar una evaluación (aplicar) recalcula solo las ventanas que tocan ese mes de esa jugadora
+# y suma/resta su nota en el promedio del equipo. Leer la hoja (sincronizar) compara contra lo que ya está
+# y aplica solo las diferencias (cargas desde otra sesión o a mano en Sheets).
+# Cada jugadora tiene una versión que sube solo cuando cambian sus notas: los gráficos (Pillow) se guardan
+# por (jugadora, versión) y los reusan la vista de evaluación y la ficha PDF.
+import io
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+HABILIDADES = ("Push", "Dribbling", "Flick", "Pegada", "Barrida", "Físico", "Quites")
+VENTANA = 3  # meses evaluados en la media móvil
+VENTANA_PENDIENTE = 4  # meses evaluados para la pendiente
+MESES_CORTOS = ("Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic")
+EQUIPO = "equipo"  # clave de la serie del equipo en el caché de gráficos
+
+
+def periodo(fecha):
+    # "dd/mm/aaaa" -> meses desde el año 0 (anio * 12 + mes - 1); None si no es una fecha
+    if len(fecha) != 10: return None
+    try: return int(fecha[6:10]) * 12 + int(fecha[3:5]) - 1
+    except ValueError: return None
+
+
+def texto_periodo(p): return f"{MESES_CORTOS[p % 12]} {p // 12 % 100:02d}"
+
+
+def _notas(fila):
+    res = []
+    for v in fila[2:2 + len(HABILIDADES)]:
+        try: res.append(int(float(v)) if v else 0)
+        except ValueError: res.append(0)
+    return tuple(res + [0] * (len(HABILIDADES) - len(res)))
+
+
+def pendiente(xs, ys):
+    n = len(xs)
+    if n < 2: return 0.0
+    mx = sum(xs) / n; my = sum(ys) / n
+    den = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den if den else 0.0
+
+
+class Serie:
+    # Una jugadora: periodos ordenados y, por posición, sus notas, medias móviles y pendientes (una por habilidad)
+    __slots__ = ("periodos", "notas", "medias", "pendientes")
+
+    def __init__(self):
+        self.periodos = []; self.notas = []; self.medias = []; self.pendientes = []
+
+    def poner(self, p, notas):
+        k = bisect_left(self.periodos, p)
+        if k < len(self.periodos) and self.periodos[k] == p:
+            if self.notas[k] == notas: return False
+            self.notas[k] = notas
+        else:
+            self.periodos.insert(k, p); self.notas.insert(k, notas); self.medias.insert(k, None); self.pendientes.insert(k, None)
+        self._recalcular(k); return True
+
+    def quitar(self, p):
+        k = bisect_left(self.periodos, p)
+        if k == len(self.periodos) or self.periodos[k] != p: return None
+        del self.periodos[k], self.medias[k], self.pendientes[k]; notas = self.notas.pop(k)
+        self._recalcular(k); return notas
+
+    def _recalcular(self, desde, hasta=None):
+        # El punto 'desde' solo entra en las ventanas que terminan en desde .. desde + ventana - 1
+        if hasta is None: hasta = desde + max(VENTANA, VENTANA_PENDIENTE)
+        for k in range(desde, min(len(self.periodos), hasta)):
+            v = self.notas[max(0, k - VENTANA + 1):k + 1]
+            self.medias[k] = tuple(round(sum(c) / len(v), 2) for c in zip(*v))
+            i = max(0, k - VENTANA_PENDIENTE + 1); xs = self.periodos[i:k + 1]
+            self.pendientes[k] = tuple(round(pendiente(xs, c), 3) for c in zip(*self.notas[i:k + 1]))
+
+    def copia(self):
+        s = Serie(); s.periodos = list(self.periodos); s.notas = list(self.notas)
+        s.medias = list(self.medias); s.pendientes = list(self.pendientes)
+        return s
+
+
+class Tendencias:
+    def __init__(self):
+        self._lock = threading.Lock(); self._series = {}; self._equipo = {}  # periodo -> [sumas, cuenta]
+        self._versiones = {}; self._version = 0; self._version_equipo = 0; self._filas = None
+        self._activas = None  # DNIs que cuentan para el equipo (None = todas)
+
+    def version(self, dni): return self._versiones.get(str(dni), 0)
+
+    def version_equipo(self): return self._version_equipo
+
+    def _sumar(self, p, notas, signo):
+        e = self._equipo.get(p)
+        if e is None: e = self._equipo[p] = [[0] * len(HABILIDADES), 0]
+        e[0] = [s + signo * n for s, n in zip(e[0], notas)]; e[1] += signo
+        if not e[1]: del self._equipo[p]
+
+    def _cuenta(self, dni): return self._activas is None or dni in self._activas
+
+    def _tocar(self, dni):
+        self._version += 1; self._versiones[dni] = self._version
+        if self._cuenta(dni): self._version_equipo = self._version
+
+    def activas(self, dnis):
+        # Las inactivas o que ya no están en el plantel no entran al promedio del equipo (sí a su propia serie).
+        # Si el conjunto cambió, las sumas del equipo se rearman desde las series
+        dnis = frozenset(map(str, dnis))
+        with self._lock:
+            if dnis == self._activas: return
+            self._activas = dnis; self._equipo = {}
+            for dni, serie in self._series.items():
+                if dni in dnis:
+                    for p, notas in zip(serie.periodos, serie.notas): self._sumar(p, notas, 1)
+            self._version += 1; self._version_equipo = self._version
+
+    def _poner(self, dni, p, notas):
+        serie = self._series.get(dni)
+        if serie is None: serie = self._series[dni] = Serie()
+        k = bisect_left(serie.periodos, p)
+        previa = serie.notas[k] if k < len(serie.periodos) and serie.periodos[k] == p else None
+        if not serie.poner(p, notas): return False
+        if self._cuenta(dni):
+            if previa is not None: self._sumar(p, previa, -1)
+            self._sumar(p, notas, 1)
+        self._tocar(dni)
+        return True
+
+    def aplicar(self, fecha, dni, notas):
+        # Una evaluación guardada (alta o edición): solo se recalcula lo que toca ese punto
+        p = periodo(fecha)
+        if p is None: return False
+        with self._lock: return self._poner(str(dni), p, tuple(notas))
+
+    def sincronizar(self, filas):
+        # filas = hoja 'habilidades' completa. La misma lista (memo de lectura) no se vuelve a recorrer.
+        if filas is self._filas: return
+        vistos = {}
+        for r in filas[1:]:
+            if len(r) < 3 or not r[1]: continue
+            p = periodo(r[0])
+            if p is not None: vistos[(str(r[1]), p)] = _notas(r)  # repetidas: gana la última, como en la hoja
+        with self._lock:
+            for (dni, p), notas in vistos.items(): self._poner(dni, p, notas)
+            for dni, serie in self._series.items():
+                for p in [p for p in serie.periodos if (dni, p) not in vistos]:
+                    notas = serie.quitar(p); self._tocar(dni)
+                    if self._cuenta(dni): self._sumar(p, notas, -1)
+            self._filas = filas
+
+    def serie(self, dni):
+        with self._lock:
+            s = self._series.get(str(dni))
+            return s.copia() if s is not None else Serie()
+
+    def equipo(self):
+        # Serie del equipo: promedio de las evaluadas activas de cada mes, con las mismas medias y pendientes
+        s = Serie()
+        with self._lock: puntos = sorted((p, tuple(round(x / c, 2) for x in sumas)) for p, (sumas, c) in self._equipo.items())
+        for p, notas in puntos: s.periodos.append(p); s.notas.append(notas); s.medias.append(None); s.pendientes.append(None)
+        s._recalcular(0, len(puntos))
+        return s
+
+    def reiniciar(self):
+        # Para benchmark/prueba: el próximo sincronizar arma todo de nuevo
+        with self._lock:
+            self._series = {}; self._equipo = {}; self._versiones = {}; self._version_equipo = self._version = self._version + 1
+            self._filas = None; self._activas = None
+
+
+def resumen(serie, anio=None):
+    """Por habilidad: (última nota, media móvil, pendiente, promedio de la temporada 'anio' o de todo)."""
+    if not serie.periodos: return [(0, 0.0, 0.0, 0.0)] * len(HABILIDADES)
+    idx = [k for k, p in enumerate(serie.periodos) if anio is None or p // 12 == anio]
+    res = []
+    for h in range(len(HABILIDADES)):
+        prom = round(sum(serie.notas[k][h] for k in idx) / len(idx), 1) if idx else 0.0
+        res.append((serie.notas[-1][h], serie.medias[-1][h], serie.pendientes[-1][h], prom))
+    return res
+
+
+TENDENCIAS = Tendencias()
+
+
+# =========================================================
+# GRÁFICOS (Pillow)
+# =========================================================
+# Pillow viene con fpdf2; sin él no hay gráficos (la vista y la ficha siguen sin la imagen)
+try:
+    import PIL  # noqa: F401
+    TIENE_PIL = True
+except ImportError:
+    TIENE_PIL = False
+_GRAFICOS = OrderedDict(); _GRAFICOS_MAX = 64; _GLOCK = threading.Lock()
+COLOR_NOTA = (176, 190, 197); COLOR_MEDIA = (33, 150, 243); COLOR_TEXTO = (33, 33, 33)
+ULTIMOS = 12  # meses evaluados que entran en el gráfico
+
+
+def _fuente(tam):
+    from PIL import ImageFont
+    try:
+        from pdf_motor import FUENTE
+        ruta = FUENTE.rutas().get("")
+        if ruta: return ImageFont.truetype(ruta, tam)
+    except Exception: pass
+    return ImageFont.load_default()
+
+
+def dibujar(serie, titulo=""):
+    # PNG con un panel por habilidad: notas (gris), media móvil (azul) y la pendiente actual en el título
+    from PIL import Image, ImageDraw
+    ancho, alto, cols = 960, 500, 4; filas = (len(HABILIDADES) + cols - 1) // cols
+    img = Image.new("RGB", (ancho, alto), "white"); d = ImageDraw.Draw(img)
+    f_tit = _fuente(18); f_pan = _fuente(13); f_eje = _fuente(10)
+    d.text((12, 8), titulo, fill=COLOR_TEXTO, font=f_tit)
+    k0 = max(0, len(serie.periodos) - ULTIMOS); ps = serie.periodos[k0:]
+    pw = ancho // cols; ph = (alto - 40) // filas
+    for h, nombre in enumerate(HABILIDADES):
+        x0 = (h % cols) * pw + 30; y0 = 40 + (h // cols) * ph + 22; w = pw - 45; hh = ph - 48
+        if ps:
+            m = serie.pendientes[-1][h]
+            flecha = "↑" if m > 0.05 else "↓" if m < -0.05 else "→"
+            cab = f"{nombre}  {serie.medias[-1][h]:.1f}  {flecha} {m:+.2f}/mes"
+        else: cab = nombre
+        d.text((x0 - 20, y0 - 20), cab, fill=COLOR_TEXTO, font=f_pan)
+        d.rectangle([x0, y0, x0 + w, y0 + hh], outline=(224, 224, 224))
+        for v in (5, 10): yv = y0 + hh - hh * v / 10; d.line([x0, yv, x0 + w, yv], fill=(238, 238, 238)); d.text((x0 - 16, yv - 6), str(v), fill=(117, 117, 117), font=f_eje)
+        if not ps: continue
+        paso = w / max(1, len(ps) - 1)
+        def punto(i, v): return (x0 + (paso * i if len(ps) > 1 else w / 2), y0 + hh - hh * v / 10)
+        notas = [punto(i, serie.notas[k0 + i][h]) for i in range(len(ps))]
+        medias = [punto(i, serie.medias[k0 + i][h]) for i in range(len(ps))]
+        if len(notas) > 1: d.line(notas, fill=COLOR_NOTA, width=2); d.line(medias, fill=COLOR_MEDIA, width=3)
+        for x, y in notas: d.ellipse([x - 3, y - 3, x + 3, y + 3], fill=COLOR_NOTA)
+        for i in {0, len(ps) - 1}: d.text((notas[i][0] - (30 if i else 0), y0 + hh + 3), texto_periodo(ps[i]), fill=(117, 117, 117), font=f_eje)
+    buf = io.BytesIO(); img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def grafico(dni, titulo="", tendencias=TENDENCIAS):
+    """PNG de la jugadora 'dni' (o EQUIPO): se dibuja una vez por versión de sus datos. None sin Pillow."""
+    if not TIENE_PIL: return None
+    version = tendencias.version_equipo() if dni == EQUIPO else tendencias.version(dni)
+    clave = (str(dni), version, titulo)
+    with _GLOCK:
+        png = _GRAFICOS.get(clave)
+        if png is not None: _GRAFICOS.move_to_end(clave); return png
+    png = dibujar(tendencias.equipo() if dni == EQUIPO else tendencias.serie(dni), titulo)
+    with _GLOCK:
+        _GRAFICOS[clave] = png
+        while len(_GRAFICOS) > _GRAFICOS_MAX: _GRAFICOS.popitem(last=False)
+    return png
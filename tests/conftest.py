@@ -0,0 +1,17 @@
+# Los módulos de la app viven en la raíz del repo (no es un paquete): se importan desde ahí
+import glob
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+@pytest.fixture
+def sin_pdfs():
+    # Los reportes se escriben en assets/ (relativo al directorio de trabajo): se borran los que deje el test
+    previos = set(glob.glob(os.path.join("assets", "*.pdf")))
+    yield
+    for ruta in set(glob.glob(os.path.join("assets", "*.pdf"))) - previos: os.remove(ruta)
@@ -0,0 +1,47 @@
+import os
+import threading
+
+import almacen_local
+from almacen_local import Almacen
+from cambios import Cambio
+
+
+def test_la_foto_solo_vale_si_nadie_escribio_mientras_se_leia(tmp_path):
+    alm = Almacen(str(tmp_path / "a.db"))
+    v = alm.versiones(["h"])["h"]
+    alm.guardar_foto("h", [["x"]], v)
+    assert alm.foto("h") == [["x"]]
+    alm.invalidar("h")
+    assert alm.foto("h") is None and alm.versiones(["h", "otra"]) == {"h": v + 1, "otra": 0}
+    alm.guardar_foto("h", [["vieja"]], v)  # leída antes de la escritura: no se guarda
+    assert alm.foto("h") is None
+
+
+def test_la_foto_vence(tmp_path, monkeypatch):
+    alm = Almacen(str(tmp_path / "a.db"), ttl=10)
+    alm.guardar_foto("h", [["x"]], 0)
+    monkeypatch.setattr(almacen_local.time, "time", lambda t=almacen_local.time.time(): t + 11)
+    assert alm.foto("h") is None
+
+
+def test_dos_procesos_ven_lo_mismo(tmp_path):
+    ruta = str(tmp_path / "a.db"); a, b = Almacen(ruta), Almacen(ruta)
+    a.guardar_reporte("pre|mensual", "h1", "/r.pdf")
+    assert b.leer_reporte("pre|mensual") == ("h1", "/r.pdf")
+    assert a.reclamar("precalculo|2026-10-19") and not b.reclamar("precalculo|2026-10-19")
+
+
+class PubSub:
+    def __init__(self): self.recibidos = []; self.listo = threading.Event()
+    def send_all_on_topic(self, topico, mensaje): self.recibidos.append(mensaje); self.listo.set()
+
+
+def test_relevar_reenvia_solo_los_cambios_de_otros_procesos(tmp_path):
+    alm = Almacen(str(tmp_path / "a.db")); pubsub = PubSub(); aplicados = []
+    alm.relevar(pubsub, "hojas", aplicados.append, intervalo=0.01)
+    alm.registrar_cambio(Cambio("h", "borrar", fila=2))  # propio: las sesiones de este proceso ya lo tienen
+    con = alm._con()
+    with con: con.execute("INSERT INTO cambios (pid, datos, creado) VALUES (?, ?, 0)",
+                          (os.getpid() + 1, '["h", "agregar", null, [["1"]], null, null]'))
+    assert pubsub.listo.wait(5)
+    assert pubsub.recibidos == aplicados == [Cambio("h", "agregar", None, [["1"]])]
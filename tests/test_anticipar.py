@@ -0,0 +1,65 @@
+import anticipar
+import hoja_falsa
+from anticipar import Anticipador, Presupuesto
+from hojas import Lectura
+
+
+class Reloj:
+    def __init__(self): self.t = 100.0
+    def monotonic(self): return self.t
+
+
+def _libro():
+    return hoja_falsa.LibroFalso({"a": [["x"], ["1"]], "b": [["y"], ["2"]], "c": [["z"]]})
+
+
+def test_presupuesto_se_repone_de_a_poco(monkeypatch):
+    reloj = Reloj(); monkeypatch.setattr(anticipar, "time", reloj)
+    p = Presupuesto(2, periodo=60.0)
+    assert p.tomar() and p.tomar() and not p.tomar()
+    reloj.t += 30  # 2 fichas por minuto: en 30 s vuelve una
+    assert p.tomar() and not p.tomar()
+    reloj.t += 600  # nunca junta más de 'llamadas'
+    assert p.tomar() and p.tomar() and not p.tomar()
+
+
+def test_presupuesto_en_cero_desactiva():
+    p = Presupuesto(0)
+    assert not p.activo and not p.tomar()
+
+
+def test_la_navegacion_siguiente_usa_lo_anticipado():
+    libro = _libro(); lec = Lectura(libro); lec.nueva(["a"])
+    assert sorted(lec.anticipar(["a", "b"])) == ["a", "b"]
+    assert libro.total_llamadas() == 2  # 'a' ya estaba: solo baja 'b'
+    lec.nueva(["a", "b"])
+    assert libro.total_llamadas() == 2
+    assert lec.hoja(libro.worksheet("b")).get_all_values() == [["y"], ["2"]]
+
+
+def test_sin_presupuesto_no_se_anticipa():
+    libro = _libro(); lec = Lectura(libro)
+    assert lec.anticipar(["b"], Presupuesto(0)) == [] and libro.total_llamadas() == 0
+
+
+def test_una_escritura_durante_la_bajada_la_descarta():
+    libro = _libro(); lec = Lectura(libro)
+
+    class Escribe:
+        # Entre que se decide bajar y que termina, otra hebra escribe 'b'
+        def tomar(self): lec.invalidar("b"); return True
+
+    assert lec.anticipar(["b", "c"], Escribe()) == ["c"]
+    antes = libro.total_llamadas(); lec.nueva(["b", "c"])
+    assert libro.total_llamadas() == antes + 1
+
+
+def test_anticipador_programa_y_cancela():
+    libro = _libro(); lec = Lectura(libro); lec.nueva(["a"])
+    ant = Anticipador(lec, {"va": ["a"], "vb": ["b"]}.get, {"va": ["vb"]}, espera=0.01, presupuesto=Presupuesto(5))
+    ant.programar("va"); ant._timer.join(5)
+    assert libro.total_llamadas() == 2
+    ant.espera = 60; ant.programar("va"); timer = ant._timer; ant.cancelar()
+    assert ant._timer is None and timer.finished.is_set()
+    ant.programar("vb")  # sin siguientes: no programa nada
+    assert ant._timer is None
@@ -0,0 +1,67 @@
+from asistencia_bits import AsistenciaBits, de_filas
+
+CAB = ["Fecha", "DNI", "Presente", "Tipo", "Observaciones"]
+
+
+def _libro(marcas):
+    # marcas: {fecha: (tipo, {dni: "SI"/"NO"})}
+    return [CAB] + [[f, dni, p, tipo, ""] for f, (tipo, ps) in marcas.items() for dni, p in ps.items()]
+
+
+def test_fechas_sin_ceros_son_el_mismo_dia():
+    filas = _libro({"05/03/2024": ("Entrenamiento", {"1": "SI"}), "5/3/2024": ("Entrenamiento", {"2": "NO"})})
+    t = AsistenciaBits(filas).temporada(2024)
+    assert t.total == 1 and t.fechas == [(3, 5)]
+    assert t.presencias("1") == 1 and t.ausencias("2") == 1
+
+
+def test_mascaras_por_tipo_y_mes():
+    t = AsistenciaBits(_libro({
+        "01/03/2024": ("Entrenamiento", {"1": "SI"}),
+        "08/03/2024": ("Partido", {"1": "NO"}),
+        "02/04/2024": ("Partido", {"1": "SI"}),
+    })).temporada(2024)
+    assert t.presencias("1", t.mascara("Partido")) == 1
+    assert t.ausencias("1", t.mascara("Partido", mes=3)) == 1
+    assert t.porcentaje("1") == 67
+    assert t.por_mes("1")[3] == (1, 1) and t.por_mes("1", "Partido")[4] == (1, 0)
+
+
+def test_suspendidos_no_cuentan_ni_cortan_rachas():
+    t = AsistenciaBits(_libro({
+        "01/03/2024": ("Entrenamiento", {"1": "NO"}),
+        "02/03/2024": ("Suspendido", {"1": "-"}),
+        "03/03/2024": ("Entrenamiento", {"1": "NO"}),
+        "04/03/2024": ("Entrenamiento", {"1": "NO"}),
+    })).temporada(2024)
+    assert t.total == 3 and t.suspendidas == [(3, 2)]
+    assert t.racha_faltas("1") == 3 and t.faltas_seguidas("1") == 3
+    assert t.alertas() == {"1": 3}
+
+
+def test_faltas_sin_marca_desde_la_primera_sesion():
+    # La 2 llega en la segunda sesión y no se marca en la tercera: falta; la primera no le cuenta
+    t = AsistenciaBits(_libro({
+        "01/03/2024": ("Entrenamiento", {"1": "SI"}),
+        "02/03/2024": ("Entrenamiento", {"1": "SI", "2": "SI"}),
+        "03/03/2024": ("Entrenamiento", {"1": "SI"}),
+    })).temporada(2024)
+    assert t.faltas("2").bit_count() == 1 and t.faltas_seguidas("2") == 1
+    assert t.racha_presencias("1") == 3 and t.faltas_seguidas("1") == 0
+
+
+def test_temporadas_y_fechas_invalidas():
+    idx = AsistenciaBits(_libro({
+        "10/11/2023": ("Partido", {"1": "SI"}),
+        "10/11/2024": ("Partido", {"1": "SI"}),
+        "31/02/2024": ("Partido", {"1": "SI"}),
+        "sin fecha": ("Partido", {"1": "SI"}),
+    }))
+    assert sorted(idx.temporadas) == [2023, 2024]
+    assert idx.total("1") == 2 and idx.temporada(1999).total == 0
+
+
+def test_de_filas_reusa_el_indice_de_la_misma_lista():
+    filas = _libro({"01/03/2024": ("Entrenamiento", {"1": "SI"})})
+    assert de_filas(filas) is de_filas(filas)
+    assert de_filas(list(filas)) is not de_filas(filas)
@@ -0,0 +1,44 @@
+from buscador import IndiceJugadoras, normalizar
+from plantel import Jugadora, Plantel
+
+
+def _j(nombre, apellido, dni, camiseta=""):
+    return Jugadora.desde_fila(["", nombre, apellido, dni, "", "", "", "SI", camiseta])
+
+
+JUGADORAS = [_j("Martina", "González", "30111222", "7"), _j("María", "Gómez", "30999888", "10"),
+             _j("Lucía", "Martínez", "41222333", "3"), _j("Ana", "Ángeles", "42000111", "")]
+
+
+def test_normalizar_saca_acentos_y_mayusculas():
+    assert normalizar("ÁNGELES #7") == "angeles  7"
+    assert normalizar(None) == ""
+
+
+def test_cada_palabra_debe_ser_prefijo_de_algun_campo():
+    idx = IndiceJugadoras(JUGADORAS)
+    assert [j['apellido'] for j in idx.buscar("mar gon")] == ["González"]
+    assert [j['apellido'] for j in idx.buscar("mar")] == ["Gómez", "González", "Martínez"]
+    assert [j['apellido'] for j in idx.buscar("angel")] == ["Ángeles"]
+    assert idx.buscar("mar zz") == []
+
+
+def test_busca_por_dni_y_camiseta():
+    idx = IndiceJugadoras(JUGADORAS)
+    assert [j['dni'] for j in idx.buscar("412")] == ["41222333"]
+    assert [j['dni'] for j in idx.buscar("#10")] == ["30999888"]
+
+
+def test_consulta_vacia_ordena_por_apellido_y_respeta_el_limite():
+    idx = IndiceJugadoras(JUGADORAS)
+    assert [j['apellido'] for j in idx.buscar("", limite=2)] == ["Ángeles", "Gómez"]
+    assert idx.cuenta("") == 4 and idx.cuenta("mar") == 3
+
+
+def test_plantel_arma_el_indice_una_vez_por_version():
+    p = Plantel()
+    p.publicar(tuple(JUGADORAS))
+    idx = p.indice()
+    assert p.indice() is idx
+    p.agregar(_j("Sofía", "Pérez", "43000000"))
+    assert p.indice() is not idx and p.indice().cuenta("sof") == 1
@@ -0,0 +1,46 @@
+import threading
+
+import hoja_falsa
+from benchmark import BusFalso, PaginaFalsa
+from cambios import TOPICO, Cambio, aplicar, publicar
+from hojas import Lectura
+
+FILAS = [["id", "nombre"], ["1", "Ana"], ["2", "Bea"], ["3", "Ana"]]
+
+
+def test_aplicar_no_toca_la_lista_original():
+    nuevas = aplicar(FILAS, Cambio("h", "agregar", filas=[["4", "Caro"]]))
+    assert nuevas[-1] == ["4", "Caro"] and len(FILAS) == 4
+
+
+def test_actualizar_desde_una_columna_y_con_desplazamiento():
+    nuevas = aplicar(FILAS, Cambio("h", "actualizar", fila=3, filas=[["Beatriz", "x"]], col=1))
+    assert nuevas[2] == ["2", "Beatriz", "x"] and FILAS[2] == ["2", "Bea"]
+    # filas[0] es la fila 2 de la hoja (sin cabecera)
+    assert aplicar(FILAS[1:], Cambio("h", "actualizar", fila=2, filas=[["9"]]), primera=2)[0] == ["9", "Ana"]
+    assert aplicar(FILAS, Cambio("h", "actualizar", fila=40, filas=[["9"]])) == FILAS
+
+
+def test_borrar_y_reemplazar():
+    assert aplicar(FILAS, Cambio("h", "borrar", fila=2)) == [FILAS[0], FILAS[2], FILAS[3]]
+    nuevas = aplicar(FILAS, Cambio("h", "reemplazar", filas=[["5", "Ana"]], col=1, valor="Ana"))
+    assert nuevas == [FILAS[0], FILAS[2], ["5", "Ana"]]
+
+
+def test_la_lectura_aplica_solo_si_tiene_la_hoja():
+    libro = hoja_falsa.LibroFalso({"h": FILAS}); lec = Lectura(libro)
+    lec.aplicar(Cambio("h", "borrar", fila=2))
+    lec.nueva(["h"]); lec.aplicar(Cambio("h", "borrar", fila=2))
+    assert lec.hoja(libro.worksheet("h")).get_all_values() == [FILAS[0], FILAS[2], FILAS[3]]
+    assert libro.total_llamadas() == 1
+
+
+def test_publicar_llega_a_las_otras_sesiones_y_no_falla_sin_pubsub():
+    bus = BusFalso(); a, b = PaginaFalsa(bus), PaginaFalsa(bus)
+    recibidos = []; listo = threading.Event()
+    a.pubsub.subscribe_topic(TOPICO, lambda t, m: recibidos.append(("a", m)))
+    b.pubsub.subscribe_topic(TOPICO, lambda t, m: (recibidos.append(("b", m)), listo.set()))
+    cambio = Cambio("h", "borrar", fila=2)
+    publicar(a, cambio)
+    assert listo.wait(5) and recibidos == [("b", cambio)]
+    publicar(object(), cambio)
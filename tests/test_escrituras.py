@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+import benchmark
+import escrituras
+import hoja_falsa
+from escrituras import Coordinador, FilaDesactualizada, buscar_fila, ubicar_fila
+from plantel import PLANTEL
+from prueba_carga import buscar_botones, click
+
+FILAS = [["fecha", "dni", "nota"], ["01/03/2026", "1", "5"], ["01/03/2026", "2", "7"], ["01/04/2026", "1", "6"]]
+
+
+def _hoja():
+    return hoja_falsa.LibroFalso({"h": FILAS}).worksheet("h")
+
+
+def test_ubicar_fila_sigue_a_la_fila_que_se_movio():
+    ws = _hoja()
+    assert ubicar_fila(ws, 3, ["01/03/2026", "2", "7"]) == 3
+    ws.delete_rows(2)
+    assert ubicar_fila(ws, 3, ["01/03/2026", "2", "7"]) == 2
+    # solo las columnas clave: la nota pudo cambiar
+    assert ubicar_fila(ws, 4, ["01/04/2026", "1", "x"], columnas=(0, 1)) == 3
+
+
+def test_ubicar_fila_falla_si_no_esta_o_esta_repetida():
+    ws = _hoja()
+    with pytest.raises(FilaDesactualizada): ubicar_fila(ws, 2, ["01/05/2026", "9", "1"])
+    ws.append_row(["01/03/2026", "2", "7"])
+    with pytest.raises(FilaDesactualizada): ubicar_fila(ws, 2, ["01/03/2026", "2", "7"])
+
+
+def test_buscar_fila_por_clave():
+    ws = _hoja()
+    assert buscar_fila(ws, ("01/04/2026", "1")) == 4
+    assert buscar_fila(ws, ("01/05/2026", "1")) is None
+
+
+def _en_paralelo(coord, entrar, n=4):
+    # Cuántas hebras llegan a estar a la vez dentro de entrar(coord)
+    adentro = [0]; maximo = [0]; lock = threading.Lock()
+    def correr():
+        with entrar(coord):
+            with lock: adentro[0] += 1; maximo[0] = max(maximo[0], adentro[0])
+            time.sleep(0.05)
+            with lock: adentro[0] -= 1
+    hebras = [threading.Thread(target=correr) for _ in range(n)]
+    for h in hebras: h.start()
+    for h in hebras: h.join(10)
+    return maximo[0]
+
+
+@pytest.fixture(params=["memoria", "archivos"])
+def coord(request, tmp_path):
+    if request.param == "archivos" and not escrituras.CERROJOS_ENTRE_PROCESOS: pytest.skip("sin fcntl")
+    return Coordinador(str(tmp_path / "cerrojos") if request.param == "archivos" else None)
+
+
+def test_compartida_deja_pasar_claves_distintas_y_serializa_la_misma(coord):
+    claves = iter(range(100))
+    assert _en_paralelo(coord, lambda c: c.compartida("h", next(claves))) > 1
+    assert _en_paralelo(coord, lambda c: c.compartida("h", "misma")) == 1
+
+
+def test_exclusiva_espera_a_las_compartidas(coord):
+    orden = []; dentro = threading.Event()
+    def compartida():
+        with coord.compartida("h", "k"): dentro.set(); time.sleep(0.1); orden.append("compartida")
+    h = threading.Thread(target=compartida); h.start(); dentro.wait(5)
+    with coord.exclusiva("h"): orden.append("exclusiva")
+    h.join(5)
+    assert orden == ["compartida", "exclusiva"]
+
+
+def test_los_archivos_excluyen_entre_coordinadores(tmp_path):
+    # Dos Coordinador sobre la misma carpeta se comportan como dos workers
+    if not escrituras.CERROJOS_ENTRE_PROCESOS: pytest.skip("sin fcntl")
+    carpeta = str(tmp_path / "cerrojos"); otros = iter([Coordinador(carpeta) for _ in range(4)])
+    assert _en_paralelo(None, lambda _: next(otros).compartida("h", "misma")) == 1
+    otros = iter([Coordinador(carpeta) for _ in range(4)])
+    assert _en_paralelo(None, lambda _: next(otros).exclusiva("h")) == 1
+
+
+def test_dos_sesiones_que_cargan_la_misma_evaluacion_no_la_duplican():
+    libro = hoja_falsa.generar_libro(4, temporadas=1, semilla=6)
+    ws = libro.worksheet("habilidades"); ws._filas[1:] = []
+    PLANTEL.reiniciar()
+    a, b = benchmark.abrir_sesion(libro), benchmark.abrir_sesion(libro)
+    va, vb = a.vistas["eval"](), b.vistas["eval"]()
+    click(buscar_botones(va, "CARGAR")[0]); click(buscar_botones(vb, "CARGAR")[0])
+    click(buscar_botones(va, "GUARDAR")[0]); click(buscar_botones(vb, "GUARDAR")[0])
+    assert len(ws._filas) == 2
@@ -0,0 +1,47 @@
+import csv
+
+import hoja_falsa
+from exportar import _por_bloques, con_cabecera, exportar, snapshot
+
+
+def test_cabecera_toma_el_ancho_de_la_fila_mas_larga():
+    filas = [["Fecha", "DNI"], ["01/03/2024", "30111222", "SI", "Entrenamiento"], ["02/03/2024", "30111222"]]
+    assert list(con_cabecera("asistencia", filas)) == [
+        ["Fecha", "DNI", "col_3", "col_4"],
+        ["01/03/2024", "30111222", "SI", "Entrenamiento"],
+        ["02/03/2024", "30111222", "", ""],
+    ]
+
+
+def test_cabecera_saltea_vacias_y_recorta_lo_que_pasa_de_la_muestra(caplog):
+    filas = [["A", "B"], ["1", "2"], ["", ""], ["3", "4", "5"]]
+    assert list(con_cabecera("x", filas, muestra=1)) == [["A", "B"], ["1", "2"], ["3", "4"]]
+    assert "1 filas" in caplog.text
+
+
+def test_partidos_usa_la_cabecera_de_exportar():
+    cab = next(con_cabecera("partidos", [["01/03/2024", "Rival"]]))
+    assert cab[:3] == ["Fecha", "Rival", "Condicion"]
+
+
+def test_bloques_siguen_despues_de_un_tramo_en_blanco():
+    libro = hoja_falsa.generar_libro(5, semilla=1)
+    ws = libro.worksheet("fixture")
+    ws._filas += [[""] * 4] * 12 + [["01/12/2024", "Tardío", "Local", ""]]
+    filas = list(_por_bloques(libro, "fixture", 4, ws.row_count))
+    assert ["01/12/2024", "Tardío", "Local", ""] in [f + [""] * (4 - len(f)) for f in filas]
+
+
+def test_snapshot_por_bloques_igual_a_una_sola_lectura():
+    libro = hoja_falsa.generar_libro(8, semilla=2)
+    enteras = {t: list(con_cabecera(t, g)) for t, g in snapshot(libro, bloque=0).items()}
+    por_bloques = {t: list(con_cabecera(t, g)) for t, g in snapshot(libro, bloque=7).items()}
+    assert por_bloques == enteras
+
+
+def test_exportar_csv(tmp_path):
+    libro = hoja_falsa.generar_libro(6, semilla=3)
+    (ruta, n), = exportar(libro, "csv", str(tmp_path), titulos=("jugadoras",)).values()
+    with open(ruta, newline="", encoding="utf-8") as f: filas = list(csv.reader(f))
+    assert filas[0] == hoja_falsa.CABECERAS["jugadoras"]
+    assert n == len(filas) - 1 == 6
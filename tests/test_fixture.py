@@ -0,0 +1,42 @@
+import benchmark
+import hoja_falsa
+from prueba_carga import buscar_botones, click
+
+
+def _abrir():
+    libro = hoja_falsa.generar_libro(4, semilla=3)
+    app = benchmark.abrir_sesion(libro)
+    return libro, app, app.vistas["fixture_full"]()
+
+
+def test_cambiar_de_mes_no_lee_la_hoja():
+    libro, _, vista = _abrir()
+    antes = libro.total_llamadas()
+    for _ in range(3): click(buscar_botones(vista, "<")[0])
+    for _ in range(5): click(buscar_botones(vista, ">")[0])
+    assert libro.total_llamadas() == antes
+
+
+def test_editar_escribe_la_fila_en_el_lugar():
+    libro, _, vista = _abrir()
+    ws = libro.worksheet("fixture"); previas = [list(f) for f in ws._filas]
+    boton = buscar_botones(vista, "AGREGAR PARTIDO")[0]  # pasa a "GUARDAR" al editar
+    click(buscar_botones(vista, "✏️")[1])
+    llamadas = dict(libro.llamadas)
+    click(boton)
+    ops = {k[1] for k, v in libro.llamadas.items() if v != llamadas.get(k, 0)}
+    assert libro.llamadas[("fixture", "update")] == llamadas.get(("fixture", "update"), 0) + 1
+    assert not ops & {"delete_rows", "insert_row", "append_row"}
+    assert ws._filas == previas
+
+
+def test_borrar_y_actualizar():
+    libro, _, vista = _abrir()
+    ws = libro.worksheet("fixture"); n = len(ws._filas); segunda = ws._filas[2]
+    click(buscar_botones(vista, "🗑️")[0])
+    assert len(ws._filas) == n - 1 and ws._filas[1] == segunda
+    ws._filas.append(["01/01/2030", "Nuevo Rival", "Local", ""])
+    antes = libro.total_llamadas()
+    click(buscar_botones(vista, "🔄 ACTUALIZAR")[0])
+    assert libro.total_llamadas() == antes + 1
+    assert len(buscar_botones(vista, "🗑️")) == n - 1  # sin la cabecera
@@ -0,0 +1,91 @@
+import random
+from itertools import permutations
+
+import pytest
+
+import formacion
+from formacion import Disponibilidad, asignar_optimo, sugerir
+
+NOMBRES = ["Ana", "Bea", "Caro", "Dani", "Eva"]
+
+
+def test_asignar_ocupa_y_libera_al_reemplazar():
+    d = Disponibilidad(NOMBRES)
+    assert d.asignar("ARQ", "Caro") == []
+    assert d.libres() == ["Ana", "Bea", "Dani", "Eva"]
+    d.asignar("ARQ", "Ana")
+    assert d.libres() == ["Bea", "Caro", "Dani", "Eva"]
+
+
+def test_mover_a_otro_puesto_vacia_el_anterior():
+    d = Disponibilidad(NOMBRES)
+    d.asignar("ARQ", "Bea")
+    assert d.asignar("DEF1", "Bea") == ["ARQ"]
+    assert d.asignadas == {"DEF1": "Bea"} and "Bea" not in d.libres()
+
+
+def test_ausente_sale_de_su_puesto_y_de_las_libres():
+    d = Disponibilidad(NOMBRES)
+    d.asignar("VOL", "Dani")
+    assert d.marcar_ausente("Dani") == ["VOL"]
+    assert "Dani" not in d.libres()
+    d.quitar_ausente("Dani")
+    assert d.libres() == NOMBRES
+
+
+def test_opciones_filtra_limita_y_suma_el_valor_elegido():
+    d = Disponibilidad(NOMBRES)
+    d.asignar("ARQ", "Bea")
+    assert d.opciones(limite=2) == ("Ana", "Caro")
+    assert d.opciones(filtro={"Dani", "Eva"}, valor="Bea") == ("Bea", "Dani", "Eva")
+
+
+def test_recargar_conserva_lo_que_sigue_existiendo():
+    d = Disponibilidad(NOMBRES)
+    d.asignar("ARQ", "Ana"); d.marcar_ausente("Eva")
+    d.recargar(["Ana", "Bea", "Fer"], d.asignadas, d.ausentes)
+    assert d.asignadas == {"ARQ": "Ana"} and d.ausentes == set()
+    assert d.libres() == ["Bea", "Fer"]
+
+
+
+def _mejor(puntaje):
+    # Fuerza bruta: el mejor total posible asignando cada fila/columna a lo sumo una vez
+    n, m = len(puntaje), len(puntaje[0])
+    if n <= m: return max(sum(puntaje[i][c] for i, c in enumerate(p)) for p in permutations(range(m), n))
+    return max(sum(puntaje[f][j] for j, f in enumerate(p)) for p in permutations(range(n), m))
+
+
+@pytest.fixture(params=["scipy", "propio"])
+def solver(request, monkeypatch):
+    if request.param == "propio": monkeypatch.setattr(formacion, "linear_sum_assignment", None)
+    elif formacion.linear_sum_assignment is None: pytest.skip("sin scipy")
+
+
+@pytest.mark.parametrize("n,m", [(1, 1), (3, 3), (4, 6), (6, 4), (7, 5)])
+def test_asignar_optimo_da_el_maximo(solver, n, m):
+    rnd = random.Random(n * 10 + m)
+    for _ in range(20):
+        puntaje = [[rnd.randint(0, 9) for _ in range(m)] for _ in range(n)]
+        pares = asignar_optimo(puntaje)
+        assert len(pares) == min(n, m)
+        assert len({f for f, _ in pares}) == len({c for _, c in pares}) == len(pares)
+        assert sum(puntaje[f][c] for f, c in pares) == _mejor(puntaje)
+
+
+def test_asignar_optimo_sin_datos(solver):
+    assert asignar_optimo([]) == [] and asignar_optimo([[]]) == []
+
+
+def _jugadora(i, posicion, activo="SI"):
+    return {"dni": str(1000 + i), "nombre": f"J{i}", "apellido": posicion, "posicion": posicion, "activo": activo}
+
+
+def test_sugerir_respeta_arco_excluidas_e_inactivas(solver):
+    plantel = [_jugadora(0, "Arquera")] + [_jugadora(i, p) for i, p in enumerate(["Defensora", "Volante", "Delantera"] * 4, 1)]
+    plantel.append(_jugadora(20, "Arquera", activo="NO"))
+    hab = [["Fecha", "DNI"] + ["x"] * 7]; asist = [["Fecha", "DNI", "Presente"]]
+    res = sugerir(plantel, "4-3-3", hab, asist, excluir=("J1 Defensora",))
+    assert len(res) == 11 and len(set(res.values())) == 11
+    assert res["Arquera (1)"] == "J0 Arquera"
+    assert "J1 Defensora" not in res.values() and "J20 Arquera" not in res.values()
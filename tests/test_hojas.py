@@ -0,0 +1,43 @@
+import hoja_falsa
+from hojas import Lectura, leer_hojas, leer_rangos, rango_hoja
+
+
+def _libro():
+    return hoja_falsa.LibroFalso({"a": [["x", "y", "z"], ["1"], ["2", "3"]], "b": [["h"], ["v"]]})
+
+
+def test_rango_hoja():
+    assert rango_hoja("asistencia") == "'asistencia'"
+    assert rango_hoja("asistencia", 2, 40, "C") == "'asistencia'!A2:C40"
+
+
+def test_leer_rangos_completa_filas_cortas_en_una_llamada():
+    libro = _libro()
+    a, b = leer_rangos(libro, [rango_hoja("a"), rango_hoja("b")])
+    assert a == [["x", "y", "z"], ["1", "", ""], ["2", "3", ""]] and b == [["h"], ["v"]]
+    assert libro.llamadas == {("*", "values_batch_get"): 1}
+    assert leer_hojas(libro, ["b"]) == {"b": [["h"], ["v"]]}
+
+
+def test_la_navegacion_lee_una_vez_y_las_escrituras_invalidan():
+    libro = _libro(); lec = Lectura(libro)
+    ws = lec.hoja(libro.worksheet("a"))
+    lec.nueva(["a", "b"])
+    assert ws.get_all_values()[1] == ["1", "", ""]
+    ws.get_all_values()
+    assert libro.total_llamadas() == 1
+    ws.append_row(["4", "5", "6"])
+    assert ws.get_all_values()[-1] == ["4", "5", "6"]
+    assert libro.total_llamadas() == 3  # lote, escritura y una sola relectura
+
+
+def test_releer_va_a_la_hoja_y_deja_la_copia():
+    libro = _libro(); lec = Lectura(libro)
+    ws = lec.hoja(libro.worksheet("b")); lec.nueva(["b"])
+    libro.worksheet("b")._filas.append(["w"])
+    assert ws.get_all_values() == [["h"], ["v"]]
+    assert ws.releer()[-1] == ["w"] and ws.get_all_values()[-1] == ["w"]
+    antes = libro.total_llamadas()
+    lec.nueva([])
+    ws.get_all_values(); ws.get_all_values()
+    assert libro.total_llamadas() == antes + 1
@@ -0,0 +1,73 @@
+import hoja_falsa
+from cambios import aplicar
+from importar_plantel import COL_DNI, escribir, planificar, validar
+from plantel import CAMPOS, PLANTEL, Jugadora
+
+ENCABEZADOS = ["Nombre", "Apellido", "D.N.I.", "Fecha de nacimiento", "Puesto", "Nro. Camiseta", "Activa"]
+
+
+def test_validar_normaliza_y_junta_errores():
+    registros, errores = validar([ENCABEZADOS,
+        ["Ana", "Pérez", "30.111.222", "2001-03-05", "defensor", "4", "x"],
+        ["Bea", "Gómez", "abc", "31/02/2001", "lateral", "9b", "quizás"],
+        [], ["Caro", "Díaz", "40111222", "", "", "", ""], ["Dani", "Díaz", "40111222", "", "", "", ""]])
+    assert registros == [(2, {"nombre": "Ana", "apellido": "Pérez", "dni": "30111222", "nacimiento": "05/03/2001",
+                              "posicion": "Defensora", "camiseta": "4", "activo": "SI"})]
+    assert [n for n, _ in errores] == [3, 5]
+    assert errores[0][1].count(";") == 4 and "40111222 repetido en las líneas 5, 6" in errores[1][1]
+    assert validar([["Nombre"], ["Ana"]]) == ([], [(1, "Falta la columna DNI")])
+
+
+def _plantel():
+    filas = [list(CAMPOS), ["1", "Ana", "Pérez", "30111222", "05/03/2001", "Volante", "", "SI", "4"],
+             ["2", "Bea", "Gómez", "30999888", "", "Arquera", "", "SI", "1"]]
+    libro = hoja_falsa.LibroFalso({"jugadoras": filas}); ws = libro.worksheet("jugadoras")
+    PLANTEL.reiniciar(); PLANTEL.asegurar_cargado(ws)
+    return libro, ws
+
+
+def test_planificar_edita_por_dni_y_conserva_lo_vacio():
+    _plantel()
+    registros, _ = validar([["DNI", "Camiseta", "Nombre", "Apellido"], ["30111222", "10", "", ""],
+                            ["30999888", "1", "", ""], ["41000000", "", "Eva", "Sosa"], ["42000000", "", "Fer", ""]])
+    ediciones, altas, errores = planificar(registros, PLANTEL.actual())
+    assert [(p.dni, f) for p, f in ediciones] == [("30111222", ["1", "Ana", "Pérez", "30111222", "05/03/2001", "Volante", "", "SI", "10"])]
+    assert altas == [["", "Eva", "Sosa", "41000000", "", "", "", "SI", ""]]
+    assert errores == [(5, "Falta nombre o apellido")]
+
+
+def test_escribir_en_un_solo_lote():
+    libro, ws = _plantel()
+    previa = PLANTEL.actual()[0]; editada = list(previa); editada[8] = "10"
+    alta = ["", "Eva", "Sosa", "41000000", "", "", "", "SI", ""]
+    antes = libro.total_llamadas()
+    cambios = escribir(ws, [(previa, editada)], [alta])
+    assert libro.total_llamadas() - antes == 2  # relectura + batch_update
+    assert ws._filas[1] == editada and ws._filas[3] == alta
+    assert [c.op for c in cambios] == ["actualizar", "agregar"]
+    assert [j.dni for j in PLANTEL.actual()] == ["30111222", "30999888", "41000000"] and PLANTEL.actual()[0].camiseta == "10"
+
+
+def test_alta_que_otra_sesion_ya_cargo_se_edita():
+    libro, ws = _plantel()
+    ws.append_row(["3", "Eva", "Sosa", "41000000", "", "Volante", "", "NO", "7"])  # después de planificar
+    cambios = escribir(ws, [], [["", "Eva", "Sosa", "41000000", "01/01/2005", "", "", "SI", ""]])
+    assert len(ws._filas) == 4 and ws._filas[3] == ["3", "Eva", "Sosa", "41000000", "01/01/2005", "Volante", "", "SI", "7"]
+    assert [(c.op, c.fila, c.valor) for c in cambios] == [("actualizar", 4, "41000000")]
+    assert [j.dni for j in PLANTEL.actual()].count("41000000") == 1
+
+
+def test_edicion_de_una_fila_borrada_se_reemplaza_por_dni():
+    libro, ws = _plantel()
+    copia = ws.get_all_values()  # lo que tiene otra sesión en memoria
+    previa = PLANTEL.actual()[1]; editada = list(previa); editada[8] = "12"
+    ws.delete_rows(3)  # la borraron a mano en Sheets
+    cambios = escribir(ws, [(previa, editada)], [])
+    assert ws._filas[-1] == editada and len(ws._filas) == 3
+    assert [c.op for c in cambios] == ["reemplazar"]
+    for c in cambios: copia = aplicar(copia, c)
+    assert [f[COL_DNI - 1] for f in copia[1:]] == ["30111222", "30999888"] and copia[-1] == editada
+    otro = PLANTEL.actual()
+    PLANTEL.reiniciar(); PLANTEL.publicar(Jugadora.desde_fila(f) for f in ws.get_all_values()[1:2] + [list(previa)])
+    PLANTEL.aplicar(cambios[0])
+    assert PLANTEL.actual() == otro
@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+
+import hoja_falsa
+from mantenimiento import REGLAS, compactar, diferencias, escribir, mantener, normalizar_fecha
+
+HOY = date(2026, 6, 1)
+
+
+@pytest.mark.parametrize("txt,esperado", [
+    ("5/3/2024", "05/03/2024"),
+    ("05-03-2024", "05/03/2024"),
+    ("5.3.24", "05/03/2024"),
+    ("2024-03-05", "05/03/2024"),
+    ("2024-03-05T10:00:00", "05/03/2024"),
+    ("12/03/98", "12/03/1998"),  # nacimiento: dos cifras después del año en curso son del 1900
+    ("12/03/26", "12/03/2026"),
+    ("12/03/27", "12/03/1927"),
+    ("31/02/2024", "31/02/2024"),  # no es fecha: queda igual
+    ("Lesión", "Lesión"),
+])
+def test_normalizar_fecha(txt, esperado):
+    assert normalizar_fecha(txt, hoy=HOY) == esperado
+
+
+def test_compactar_asistencia():
+    filas = [
+        ["Fecha", "DNI", "Presente", "Tipo"],
+        ["5/3/2024", "30.111.222", "NO", "Entrenamiento"],
+        ["", "", "", ""],
+        ["Fecha", "DNI", "Presente", "Tipo"],
+        ["06/03/2024", "30111333", "SI", "Entrenamiento"],
+        ["05/03/2024", "30111222", "SI", "Entrenamiento"],  # misma (fecha, DNI): gana la última
+    ]
+    nuevas, r = compactar(filas, REGLAS["asistencia"])
+    assert nuevas == [
+        ["Fecha", "DNI", "Presente", "Tipo"],
+        ["06/03/2024", "30111333", "SI", "Entrenamiento"],
+        ["05/03/2024", "30111222", "SI", "Entrenamiento"],
+    ]
+    assert (r.antes, r.vacias, r.cabeceras, r.duplicadas, r.fechas, r.dnis, r.despues) == (6, 1, 1, 1, 1, 1, 3)
+
+
+def test_compactar_habilidades_una_por_mes():
+    filas = [["Fecha", "DNI", "Push"], ["01/03/2024", "1", "5"], ["20/03/2024", "1", "7"], ["01/04/2024", "1", "8"]]
+    nuevas, r = compactar(filas, REGLAS["habilidades"])
+    assert nuevas[1:] == [["20/03/2024", "1", "7"], ["01/04/2024", "1", "8"]] and r.duplicadas == 1
+
+
+def test_compactar_partidos_sin_cabecera():
+    filas = [["Fecha", "Rival", "Condicion"], ["1/3/2024", "Club A", "Local", "2", "1"]]
+    nuevas, r = compactar(filas, REGLAS["partidos"])
+    assert nuevas == [["01/03/2024", "Club A", "Local", "2", "1"]] and r.cabeceras == 1
+
+
+def test_diferencias():
+    viejas = [["A", "1", ""], ["B", "2", ""]]
+    assert diferencias(viejas, [["A", "1"], ["B", "3"]]) == ["- B | 2", "+ B | 3"]
+    assert diferencias(viejas, [["A", "1"], ["B", "2"]]) == []
+    assert diferencias(viejas, [["X"], ["Y"]], limite=1) == ["- A | 1"]
+
+
+def test_mantener_simula_y_despues_aplica():
+    libro = hoja_falsa.generar_libro(6, semilla=4)
+    ws = libro.worksheet("asistencia")
+    originales = [list(f) for f in ws._filas]
+    ws._filas.insert(3, [""] * 5); ws._filas.append(list(ws._filas[1]))
+    antes = [list(f) for f in ws._filas]
+    resumen, cambian = mantener(libro, ("asistencia",))
+    assert ws._filas == antes
+    assert resumen["asistencia"].duplicadas == 1 and resumen["asistencia"].vacias == 1
+    assert cambian["asistencia"] and all(l[:2] in ("- ", "+ ") for l in cambian["asistencia"])
+    mantener(libro, ("asistencia",), aplicar=True)
+    # la repetida queda en el lugar de la última escritura y las filas que sobraban ya no están en la grilla
+    assert ws._filas == [originales[0]] + originales[2:] + [originales[1]]
+    assert libro.llamadas[("*", "batch_update")] == 1
+    assert mantener(libro, ("asistencia",))[1] == {}
+
+
+def test_escribir_elimina_solo_las_filas_que_sobran():
+    libro = hoja_falsa.LibroFalso({"a": [["x", "y"], ["1", "2"], ["3"]], "b": [["z"]]})
+    escribir(libro, {"a": libro.worksheet("a").get_all_values(), "b": [["z"]]}, {"a": [["x"]], "b": [["w"]]})
+    assert libro.worksheet("a")._filas == [["x", ""]] and libro.worksheet("b")._filas == [["w"]]
+    assert libro.llamadas[("*", "batch_update")] == 1
+    escribir(libro, {"a": [["x"]]}, {"a": []})  # la grilla se queda con una fila, en blanco
+    filas = libro.worksheet("a")._filas
+    assert len(filas) == 1 and not any(filas[0])
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import metricas
+
+
+class Cliente:
+    # Lo que usa gspread de su Client: request() devuelve el Response ya descargado
+    def __init__(self): self.pedidos = 0
+
+    def request(self, metodo, endpoint, json=None, **kwargs):
+        self.pedidos += 1
+        return SimpleNamespace(content=b"x" * 100, request=SimpleNamespace(headers={"Content-Length": "20"} if json else {}))
+
+
+class Hoja:
+    def __init__(self, cliente): self.title = "h"; self.cliente = cliente
+    def get_all_values(self): self.cliente.request("get", "values"); return [["celda"] * 1000]
+    def update(self, rango, valores): self.cliente.request("put", "values", json={"values": valores})
+
+
+class Libro:
+    def __init__(self): self.client = Cliente()
+    def worksheet(self, titulo): return Hoja(self.client)
+
+
+def _bytes(hoja, op):
+    return metricas.REGISTRO.resumen()["sheets"].get((hoja, op), (0, 0, 0, 0))[3]
+
+
+def test_el_tamano_sale_de_la_respuesta_http():
+    sh = Libro(); ws = metricas.LibroMedido(sh).worksheet("h")
+    antes_leer, antes_escribir = _bytes("h", "get_all_values"), _bytes("h", "update")
+    ws.get_all_values(); ws.update("A1", [["a"]])
+    assert _bytes("h", "get_all_values") - antes_leer == 100
+    assert _bytes("h", "update") - antes_escribir == 120
+
+
+def test_el_cliente_se_envuelve_una_sola_vez():
+    sh = Libro(); metricas.LibroMedido(sh); envuelta = sh.client.request
+    metricas.LibroMedido(sh)
+    assert sh.client.request is envuelta
+    antes = metricas.bytes_http(); sh.client.request("get", "x")
+    assert metricas.bytes_http() - antes == 100
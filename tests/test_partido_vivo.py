@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from partido_vivo import PartidoVivo, resumen_eventos
+
+T0 = 1_700_000_000.0
+
+
+def _partido():
+    p = PartidoVivo("Rival", "Local", fecha="18/10/2026", id="abc")
+    p.alternar_reloj(T0)
+    p.registrar("gol", "Ana", ahora=T0 + 65); p.registrar("gol", "Ana", ahora=T0 + 70)
+    p.registrar("gol_rival", ahora=T0 + 80); p.registrar("corner", ahora=T0 + 90)
+    p.registrar("verde", "Bea", ahora=T0 + 100); p.registrar("cambio", "Caro", sale="Bea", ahora=T0 + 110)
+    return p
+
+
+def test_registrar_valida_tipo_jugadora_y_cambio():
+    p = PartidoVivo("Rival", "Local")
+    with pytest.raises(ValueError): p.registrar("penal")
+    with pytest.raises(ValueError): p.registrar("amarilla")
+    with pytest.raises(ValueError): p.registrar("cambio", "Ana")
+    assert p.registrar("gol")["tipo"] == "gol"  # gol sin goleadora conocida
+
+
+def test_marcador_corners_y_deshacer():
+    p = _partido()
+    assert p.marcador() == (2, 1) and p.corners() == (1, 0) and p.goleadoras() == {"Ana": 2}
+    assert p.eventos[0]["min"] == "01:05"
+    assert p.deshacer()["tipo"] == "cambio" and len(p.eventos) == 5
+    assert PartidoVivo("R", "Local").deshacer() is None
+
+
+def test_reloj_por_cuarto():
+    p = PartidoVivo("Rival", "Local")
+    p.alternar_reloj(T0); p.alternar_reloj(T0 + 30)
+    assert not p.corriendo() and p.minuto(T0 + 500) == "00:30"
+    p.alternar_reloj(T0 + 600)
+    assert p.segundos(T0 + 615) == 45
+    for cuarto in (2, 3, 4): assert p.siguiente_cuarto() and p.cuarto == cuarto and p.segundos() == 0
+    assert not p.siguiente_cuarto()
+
+
+def test_fila_con_eventos():
+    fila = _partido().fila()
+    assert fila[:8] == ["18/10/2026", "Rival", "Local", "2", "1", "1", "0", "Ana (2)"]
+    datos = json.loads(fila[8])
+    assert datos["id"] == "abc" and len(datos["eventos"]) == 6
+    assert resumen_eventos(fila[8]) == "🟩 1 · 🔁 1"
+    assert resumen_eventos("") == "" and resumen_eventos("{}") == ""
+
+
+def test_a_texto_y_vuelta():
+    p = _partido(); p.siguiente_cuarto(); p.alternar_reloj(T0 + 900)
+    q = PartidoVivo.desde_texto(p.a_texto())
+    assert q.fila() == p.fila()
+    assert (q.cuarto, q.reloj, q.desde) == (2, 0.0, T0 + 900)
+    for malo in (None, "", "no json", "[]", '{"rival": ""}'): assert PartidoVivo.desde_texto(malo) is None
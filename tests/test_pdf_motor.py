@@ -0,0 +1,112 @@
+import re
+
+import pytest
+from fpdf import FPDF
+
+import pdf_motor
+from pdf_motor import Grilla, Plantilla
+
+
+def _contenido(pdf):
+    return bytes(pdf.pages[pdf.page].contents)
+
+
+def _pdf():
+    pdf = FPDF(orientation="L"); pdf.compress = False; pdf.add_page(); pdf.set_font("Arial", "", 8)
+    return pdf
+
+
+def test_plantilla_reinserta_lo_mismo_que_dibuja():
+    dibujos = []
+    def dibujar(pdf):
+        dibujos.append(1); pdf.set_fill_color(10, 20, 30); pdf.rect(5, 5, 20, 10, "F"); pdf.line(0, 0, 50, 50)
+    plantilla = Plantilla(dibujar)
+    a = _pdf(); plantilla.aplicar(a)
+    b = _pdf(); plantilla.aplicar(b)
+    directo = _pdf(); dibujar(directo)
+    assert len(dibujos) == 2  # el segundo documento no vuelve a dibujar
+    ops = _contenido(b)
+    for op in (b" re f", b" l S", b" rg"):
+        assert ops.count(op) == _contenido(directo).count(op) == 1
+    assert ops.startswith(b"q\n") or b"\nq\n" in ops
+
+
+def test_plantilla_distingue_tamano_de_pagina():
+    plantilla = Plantilla(lambda pdf: pdf.rect(5, 5, 20, 10))
+    apaisada = _pdf(); plantilla.aplicar(apaisada)
+    vertical = FPDF(); vertical.compress = False; vertical.add_page(); plantilla.aplicar(vertical)
+    assert len(plantilla._cache) == 2
+
+
+def test_unir_tramos():
+    assert pdf_motor._unir([(5, 7), (0, 2), (2, 4)]) == [[0, 4], [5, 7]]
+
+
+def test_grilla_agrupa_rellenos_y_bordes():
+    pdf = _pdf(); g = Grilla()
+    for i in range(10):  # una fila de 10 celdas del mismo color
+        g.celda(10 + i * 5, 20, 5, 6, "P", (200, 200, 200), ("B", 8, (0, 128, 0)))
+    g.dibujar(pdf)
+    ops = _contenido(pdf).decode("latin-1")
+    assert ops.count(" re f") == 1  # un solo rect para toda la fila
+    assert ops.count(" l S") == 2 + 11  # 2 horizontales unidas + 11 verticales
+    assert ops.count("(P) Tj") == 10
+    assert len(re.findall(r"/F\d+ [\d.]+ Tf", ops)) == 1
+    assert g._celdas == []
+
+
+# --- FuenteUnicode: solo API pública de FPDF; si fpdf2 deja de pasar por set_font/normalize_text, fallan ---
+con_ttf = pytest.mark.skipif(not pdf_motor.FUENTE.activa(), reason="sin TTF Unicode en este sistema")
+
+
+def _documento():
+    pdf = pdf_motor.FUENTE.documento(); pdf.add_page(); pdf.set_font("Arial", "", 10)
+    return pdf
+
+
+def _sin_glifos_faltantes(pdf):
+    return all(not f.missing_glyphs for f in pdf.fonts.values())
+
+
+@con_ttf
+def test_documento_con_texto_comun_embebe_solo_la_variante_de_comunes():
+    pdf = _documento()
+    pdf.cell(0, 10, "Ñandú €5 – “Sol”"); pdf.ln()
+    pdf.multi_cell(0, 5, "Pérez " * 40); pdf.text(10, 150, "añejo"); pdf.get_string_width("ü")
+    datos = bytes(pdf.output())
+    assert sorted(pdf.fonts) == ["arial"]  # la negrita no se usó: no se agrega
+    assert datos.count(b"/FontFile2") == 1 and _sin_glifos_faltantes(pdf)
+
+
+@con_ttf
+@pytest.mark.parametrize("escribir", [
+    lambda pdf, t: pdf.cell(0, 10, t),
+    lambda pdf, t: pdf.multi_cell(0, 5, t),
+    lambda pdf, t: pdf.write(5, t),
+    lambda pdf, t: pdf.text(10, 50, "Ana " + t + " Sol"),
+    lambda pdf, t: pdf.get_string_width(t) and pdf.cell(0, 10, t),
+], ids=["cell", "multi_cell", "write", "text", "get_string_width"])
+def test_otro_alfabeto_agrega_la_completa_como_respaldo(escribir):
+    pdf = _documento(); pdf.set_font("Arial", "B", 10); pdf.cell(0, 10, "x"); pdf.ln(); pdf.set_font("Arial", "", 10)
+    escribir(pdf, "Жанна → Ωmega")
+    pdf.set_font("Arial", "I", 10); pdf.ln(); pdf.cell(0, 10, "Ж")  # estilo nuevo después del cambio
+    bytes(pdf.output())
+    assert sorted(pdf.fonts) == ["arial", "arialB", "arialI", "arialcompleta", "arialcompletaB", "arialcompletaI"]
+    assert _sin_glifos_faltantes(pdf)
+
+
+@con_ttf
+def test_text_mide_cada_tramo_con_su_fuente():
+    pdf = _documento()
+    ancho = pdf.get_string_width("Ana Жанна")
+    pdf.text(10, 50, "Ana Жанна")
+    pdf.set_font("ArialCompleta", "", 10)
+    assert ancho == pytest.approx(pdf.get_string_width("Ana Жанна"))
+    assert pdf_motor._tramos("Ana Жанна!") == [(False, "Ana "), (True, "Жанна"), (False, "!")]
+
+
+@con_ttf
+def test_la_completa_es_por_documento():
+    a = _documento(); a.cell(0, 10, "Жанна")
+    b = _documento(); b.cell(0, 10, "Juana")
+    assert "arialcompleta" in a.fonts and "arialcompleta" not in b.fonts
@@ -0,0 +1,34 @@
+import hoja_falsa
+from plantel import Jugadora, Plantel
+
+
+def _fila(i, activo="SI"):
+    return [str(i), f"Nombre{i}", f"Apellido{i}", str(30000000 + i), "01/01/2000", "Volante", "", activo, str(i)]
+
+
+def test_jugadora_se_lee_como_dict():
+    j = Jugadora.desde_fila(["1", "Ana", "Pérez", 30111222])
+    assert j["nombre"] == "Ana" and j["dni"] == "30111222" and j[1] == "Ana"
+    assert j.get("camiseta") == "" and j.get("no_existe", "-") == "-"
+
+
+def test_se_descarga_una_vez_por_proceso():
+    libro = hoja_falsa.generar_libro(5, semilla=1); ws = libro.worksheet("jugadoras")
+    p = Plantel()
+    p.asegurar_cargado(ws); p.asegurar_cargado(ws)
+    assert libro.llamadas[("jugadoras", "get_all_values")] == 1
+    assert p.version() == 1 and len(p.actual()) == 5
+
+
+def test_cada_cambio_publica_una_version_nueva():
+    libro = hoja_falsa.generar_libro(3, semilla=2)
+    p = Plantel(); p.asegurar_cargado(libro.worksheet("jugadoras"))
+    antes = p.actual(); dni = antes[0].dni
+    p.agregar(Jugadora.desde_fila(_fila(9)))
+    assert p.version() == 2 and len(p.actual()) == 4
+    p.reemplazar(dni, Jugadora.desde_fila(["1", "Otra", "Apellido", dni]))
+    assert p.version() == 3 and p.actual()[0].nombre == "Otra"
+    # la tupla que ya tenía una sesión no cambia
+    assert len(antes) == 3 and antes[0].nombre != "Otra"
+    p.publicar([]); assert p.version() == 4 and p.actual() == ()
+    p.reiniciar(); assert p.version() == 0
@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import benchmark
+import hoja_falsa
+import hojas
+import programador
+from cambios import Cambio
+from plantel import PLANTEL
+from hojas import huella
+from programador import Precalculados, Programador
+
+
+def test_huella_cambia_con_cualquier_celda():
+    filas = [["1", "Ana"], ["2", "Bea"]]
+    assert huella(filas) == huella([list(f) for f in filas])
+    assert huella(filas) != huella([["1", "Ana"], ["2", "Beatriz"]])
+
+
+def test_precalculados_exige_misma_huella_y_archivo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path); (tmp_path / "assets").mkdir()
+    pre = Precalculados()
+    pre.guardar("mensual|3|2026", "h1", "/r.pdf")
+    assert pre.buscar("mensual|3|2026", "h1") is None  # el PDF ya no está
+    (tmp_path / "assets" / "r.pdf").write_bytes(b"%PDF")
+    assert pre.buscar("mensual|3|2026", "h1") == "/r.pdf"
+    assert pre.buscar("mensual|3|2026", "h2") is None
+    pre.activo = False
+    assert pre.buscar("mensual|3|2026", "h1") is None
+
+
+def test_tareas_fin_de_mes_y_lunes():
+    PLANTEL.reiniciar()
+    prog = Programador(abrir=None)
+    assert prog.tareas(datetime(2026, 10, 20)) == []
+    assert prog.tareas(datetime(2026, 7, 1)) == [("mensual", (6, 2026)), ("temporada", (2026,))]
+    # 1/6/2026 es lunes: el mes cerrado y además el mes en curso
+    assert prog.tareas(datetime(2026, 6, 1))[:3] == [("mensual", (5, 2026)), ("temporada", (2026,)), ("mensual", (6, 2026))]
+
+
+def test_proxima_corrida():
+    prog = Programador(abrir=None, hora=4)
+    assert prog._proxima(datetime(2026, 10, 19, 3, 0)) == datetime(2026, 10, 19, 4, 0)
+    assert prog._proxima(datetime(2026, 10, 19, 5, 0)) == datetime(2026, 10, 20, 4, 0)
+
+
+def test_correr_genera_y_el_pedido_siguiente_sale_hecho(sin_pdfs):
+    libro = hoja_falsa.generar_libro(5, semilla=4)
+    PLANTEL.reiniciar()
+    sesion = benchmark.abrir_sesion(libro)
+    prog = Programador(abrir=lambda: sesion)
+    hoy = datetime.now()
+    res = prog.correr(hoy, [("mensual", (hoy.month, hoy.year)), ("ficha", ("0",))])
+    assert res[0][2] and os.path.exists(os.path.join("assets", res[0][3].lstrip("/")))
+    assert res[1][2] is False
+    ok, _, url = sesion.reportes["mensual"](hoy.month, hoy.year, sesion.categoria[0])
+    assert ok and url == res[0][3]
+    assert programador.generar(sesion, "temporada", hoy.year)[0]
+
+
+def test_importar_main_no_abre_la_base(tmp_path):
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {k: v for k, v in os.environ.items() if k != "ALMACEN_DB"}; env["PYTHONPATH"] = raiz
+    subprocess.run([sys.executable, "-c", "import main"], cwd=tmp_path, env=env, check=True, capture_output=True)
+    assert not (tmp_path / ".cache").exists()
+
+
+def test_el_almacen_se_abre_en_el_primer_uso():
+    abiertos = []
+    pre = Precalculados(abrir=lambda: abiertos.append(1))
+    assert abiertos == []
+    pre.buscar("k", "h"); pre.guardar("k", "h", "/r.pdf")
+    assert abiertos == [1]
+
+
+def test_la_huella_de_una_hoja_se_calcula_una_vez_por_carga(monkeypatch):
+    calculadas = []
+    monkeypatch.setattr(hojas, "huella", lambda *p: calculadas.append(p) or repr(p))
+    libro = hoja_falsa.LibroFalso({"h": [["a"], ["1"]]}); lec = hojas.Lectura(libro)
+    ws = lec.hoja(libro.worksheet("h")); lec.nueva(["h"])
+    h1 = ws.huella(); ws.huella(); ws.huella()
+    assert len(calculadas) == 1
+    lec.aplicar(Cambio("h", "agregar", filas=[["2"]]))
+    assert ws.huella() != h1 and len(calculadas) == 2
+    lec.nueva(["h"]); ws.huella()
+    assert len(calculadas) == 3
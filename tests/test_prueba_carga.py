@@ -0,0 +1,17 @@
+from types import SimpleNamespace
+
+import prueba_carga
+
+
+def test_percentil_interpola():
+    assert prueba_carga.percentil([], 50) == 0.0
+    assert prueba_carga.percentil([3, 1, 2], 50) == 2
+    assert prueba_carga.percentil([0, 10], 99) == 9.9
+
+
+def test_un_nivel_corto_sin_errores(sin_pdfs):
+    args = SimpleNamespace(jugadoras=8, temporadas=1, latencia=0.0, semilla=0, iteraciones=1, pausa=0.0)
+    r = prueba_carga.correr_nivel(2, args)
+    assert r["errores"] == [] and r["sesiones"] == 2
+    assert set(r["por_flujo"]) == set(prueba_carga.FLUJOS)
+    assert r["api_por_sesion"] > 0 and r["p99_ms"] >= r["p50_ms"] > 0
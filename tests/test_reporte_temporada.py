@@ -0,0 +1,38 @@
+import os
+import re
+from datetime import date
+
+import benchmark
+import hoja_falsa
+from plantel import PLANTEL
+
+ANIO = date.today().year
+
+
+def _paginas(url):
+    with open(os.path.join("assets", url.lstrip("/")), "rb") as f: return len(re.findall(rb"/Type /Page\b", f.read()))
+
+
+def _sesion():
+    libro = hoja_falsa.generar_libro(6, semilla=5, anio_final=ANIO)
+    PLANTEL.reiniciar()
+    return libro, benchmark.abrir_sesion(libro)
+
+
+def test_temporada_lee_asistencia_una_sola_vez(sin_pdfs):
+    libro, app = _sesion()
+    meses = {f[0][3:] for f in libro.worksheet("asistencia")._filas[1:] if f[0].endswith(str(ANIO))}
+    antes = libro.total_llamadas()
+    ok, msg, url = app.reportes["temporada"](ANIO, "Primera")
+    assert ok, msg
+    assert libro.total_llamadas() - antes <= 1  # a lo sumo una lectura (puede venir del memo de la vista)
+    # una planilla por mes con datos + el resumen
+    assert _paginas(url) >= len(meses) + 1
+
+
+def test_rango_de_fechas_deja_solo_esos_meses(sin_pdfs):
+    libro, app = _sesion()
+    ok, _, url_todo = app.reportes["temporada"](ANIO, "Primera")
+    ok_rango, msg, url_rango = app.reportes["temporada"](ANIO, "Primera", desde=date(ANIO, 4, 1), hasta=date(ANIO, 4, 30))
+    assert ok and ok_rango, msg
+    assert _paginas(url_rango) < _paginas(url_todo)
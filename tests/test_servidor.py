@@ -0,0 +1,48 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+import metricas
+import servidor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importar_no_arranca_nada(tmp_path):
+    # Como el proceso que supervisa a los workers: ni app, ni programador, ni almacén, ni métricas
+    codigo = ("import os, sys, threading, servidor; "
+              "print(sorted(h.name for h in threading.enumerate()), 'main' in sys.modules, 'ALMACEN_DB' in os.environ)")
+    env = {k: v for k, v in os.environ.items() if k != "ALMACEN_DB"}; env["PYTHONPATH"] = RAIZ
+    salida = subprocess.run([sys.executable, "-c", codigo], cwd=tmp_path, env=env, capture_output=True, text=True, check=True)
+    assert salida.stdout.split() == ["['MainThread']", "False", "False"]
+    assert not (tmp_path / ".cache").exists()
+
+
+def test_el_arranque_corre_con_el_lifespan_de_cada_worker():
+    llegados = []; arranques = []
+
+    async def app(scope, receive, send):
+        llegados.append((scope["type"], (await receive())["type"]))
+
+    async def recibir(): return {"type": "lifespan.startup"}
+    envuelta = servidor.ConArranque(app, lambda: arranques.append(1))
+    asyncio.run(envuelta({"type": "http"}, recibir, None))
+    assert arranques == []
+    asyncio.run(envuelta({"type": "lifespan"}, recibir, None))
+    assert arranques == [1] and llegados == [("http", "lifespan.startup"), ("lifespan", "lifespan.startup")]
+
+
+def test_cada_worker_toma_el_siguiente_puerto_de_metricas(monkeypatch):
+    monkeypatch.setattr(metricas, "_servidor", [None])
+    ocupado = socket.socket(); ocupado.bind(("127.0.0.1", 0)); ocupado.listen()
+    puerto = ocupado.getsockname()[1]
+    try:
+        with pytest.raises(OSError): metricas.iniciar_servidor(puerto)
+        srv = metricas.iniciar_servidor(puerto, intentos=50)
+        try: assert puerto < srv.server_address[1] < puerto + 50
+        finally: srv.shutdown(); srv.server_close()
+    finally: ocupado.close()
@@ -0,0 +1,43 @@
+from tendencias import HABILIDADES, Tendencias, periodo, resumen
+
+CAB = ["Fecha", "DNI"] + list(HABILIDADES)
+
+
+def _fila(fecha, dni, nota):
+    return [fecha, dni] + [str(nota)] * len(HABILIDADES)
+
+
+def _notas_equipo(t):
+    e = t.equipo()
+    return {p: n[0] for p, n in zip(e.periodos, e.notas)}
+
+
+def test_medias_y_pendiente_de_una_jugadora():
+    t = Tendencias()
+    t.sincronizar([CAB] + [_fila(f"01/{m:02d}/2024", "1", n) for m, n in ((1, 4), (2, 6), (3, 8))])
+    s = t.serie("1")
+    assert s.periodos == [periodo("01/01/2024") + k for k in range(3)]
+    assert s.medias[-1][0] == 6.0 and s.pendientes[-1][0] == 2.0
+    assert resumen(s, 2024)[0] == (8, 6.0, 2.0, 6.0)
+
+
+def test_el_equipo_solo_promedia_las_activas():
+    t = Tendencias()
+    t.sincronizar([CAB, _fila("01/03/2024", "1", 4), _fila("01/03/2024", "2", 8), _fila("01/04/2024", "2", 6)])
+    marzo = periodo("01/03/2024")
+    assert _notas_equipo(t)[marzo] == 6.0
+    t.activas(["1"])
+    assert _notas_equipo(t) == {marzo: 4.0}
+    # una edición de una inactiva cambia su serie pero no el equipo
+    version = t.version_equipo(); t.aplicar("01/03/2024", "2", [2] * len(HABILIDADES))
+    assert t.serie("2").notas[0][0] == 2 and _notas_equipo(t) == {marzo: 4.0} and t.version_equipo() == version
+    t.activas(["1", "2"])
+    assert _notas_equipo(t)[marzo] == 3.0
+
+
+def test_sincronizar_quita_lo_borrado_de_la_hoja():
+    t = Tendencias(); t.activas(["1"])
+    t.sincronizar([CAB, _fila("01/03/2024", "1", 4), _fila("01/04/2024", "1", 6)])
+    t.sincronizar([CAB, _fila("01/04/2024", "1", 6)])
+    assert t.serie("1").periodos == [periodo("01/04/2024")]
+    assert _notas_equipo(t) == {periodo("01/04/2024"): 6.0}